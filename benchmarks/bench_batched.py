@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark — stage 2 throughput per batch size
+
+Runs the clips of a pipeline_state.json (or synthetic 30s clips) through
+whisper_backend sequentially (batch size 1) and in batched mode, and
+reports audio-seconds per wall-second for each batch size.
+
+The model comes from the usual env vars, so this runs on CPU too:
+
+    WHISPER_MODEL=tiny WHISPER_DEVICE=cpu WHISPER_COMPUTE_TYPE=int8 \\
+        python benchmarks/bench_batched.py --batch-sizes 1,2,4 --clips 8
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import whisper_backend  # noqa: E402
+from audio_store import SAMPLE_RATE, open_array  # noqa: E402
+from clip_packer import window_audio  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def load_clips(state_file, limit):
+    from faster_whisper import decode_audio
+
+    state = json.loads(Path(state_file).read_text())
+    clips = state["clips"][:limit]
+
+    if "audio_array" in state:
+        samples = open_array(PROJECT_ROOT / state["audio_array"]["file"])
+
+        def load(c):
+            return np.array(samples[c["start_sample"]:c["end_sample"]])
+    else:
+        def load(c):
+            return decode_audio(str(PROJECT_ROOT / c["file"]))
+
+    # packed windows (PACK_CLIPS=1) are assembled from their pieces
+    return [window_audio(c, load) if "pieces" in c else load(c) for c in clips]
+
+
+def synth_clips(n, seconds=30.0, seed=215):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return [
+        (0.2 * np.sin(2 * np.pi * rng.uniform(120, 300) * t)
+         + rng.normal(0, 0.01, len(t))).astype(np.float32)
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--state", help="pipeline_state.json to take clips from")
+    parser.add_argument("--clips", type=int, default=16)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    audios = load_clips(args.state, args.clips) if args.state else synth_clips(args.clips)
+    audio_sec = sum(len(a) for a in audios) / SAMPLE_RATE
+    logger.info(f"🎧 {len(audios)} clips | {audio_sec:.0f}s audio")
+
+    model = whisper_backend.load_model()
+    pipeline = whisper_backend.batched_pipeline(model)
+
+    results = []
+    for bs in [int(b) for b in args.batch_sizes.split(",")]:
+        t0 = time.perf_counter()
+        if bs == 1:
+            for a in audios:
+                whisper_backend.transcribe_clip(model, a)
+        else:
+            for i in range(0, len(audios), bs):
+                whisper_backend.transcribe_batch(pipeline, audios[i:i + bs], batch_size=bs)
+        elapsed = time.perf_counter() - t0
+
+        results.append({
+            "batch_size": bs,
+            "wall_sec": round(elapsed, 3),
+            "audio_sec": round(audio_sec, 3),
+            "throughput": round(audio_sec / elapsed, 2),
+        })
+        logger.info(
+            f"📦 batch_size={bs:<3} | {elapsed:.1f}s | "
+            f"{audio_sec / elapsed:.1f} audio-s/s"
+        )
+
+    report = {
+        "model": whisper_backend.MODEL_NAME,
+        "device": whisper_backend.DEVICE,
+        "compute_type": whisper_backend.COMPUTE_TYPE,
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        logger.info(f"📄 Saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
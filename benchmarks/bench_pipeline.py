@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Benchmark — whole pipeline offline, stage by stage
+
+Generates deterministic speech-plus-silence audio (same generator as
+bench_segmentation), then runs and times every stage on its own in a
+scratch project directory:
+
+    ingest         (--ingest) input → 16 kHz mono PCM WAV, as stage 1 does
+    segmentation   cut plan from the energy envelope
+    clip_export    clips/*.wav + pipeline_state.json (--pack: 30 s windows)
+    clip_decode    each clip → 16 kHz float32 (what stage 2 feeds the model)
+    transcription  TranscriptionJob with a stub model (default) or a real
+                   faster-whisper model, e.g. --model tiny on CPU
+    postprocess    stage 3 rules → refined_transcript.jsonl + change log
+    bundling       outputs/ → outputs.tar.gz (as 08_compress_outputs.sh)
+
+The stub model returns one segment per clip and, like Whisper, pads every
+input to 30 s windows: it spends --stub-rtf seconds per padded second, so
+runs (and packing) are comparable without a GPU. Reported: wall
+time and real-time factor per stage, peak RSS of each stage, per-clip
+decode/inference latency percentiles. --out writes it all as JSON (with
+the git commit); --baseline prints per-stage change against such a file
+from an earlier commit.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--minutes 10] [--out bench.json]
+    python benchmarks/bench_pipeline.py --baseline bench.json
+    WHISPER_DEVICE=cpu WHISPER_COMPUTE_TYPE=int8 \\
+        python benchmarks/bench_pipeline.py --model tiny --minutes 2
+"""
+
+import sys
+import math
+import json
+import time
+import random
+import argparse
+import logging
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+import bundler  # noqa: E402
+import checkpoint  # noqa: E402
+from clip_packer import WINDOW_MS, pack_state  # noqa: E402
+import whisper_backend  # noqa: E402
+from audio_store import SAMPLE_RATE, load_audio  # noqa: E402
+from ingest import ingest  # noqa: E402
+from bench_segmentation import synth_audio  # noqa: E402
+from postprocess import postprocess  # noqa: E402
+from segmenter import (  # noqa: E402
+    MAX_MS, MIN_CLIP_MS, MIN_SILENCE, THRESH, KEEP_SILENCE_MS, iter_clips
+)
+from silence_engine import plan_clips  # noqa: E402
+from transcriber import TranscriptionJob  # noqa: E402
+from transcript_cache import TranscriptCache  # noqa: E402
+from wav_reader import MappedWav, StreamingEnvelope  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+WINDOW_SEC = WINDOW_MS / 1000
+
+# Stub transcripts include words the stage 3 rules correct
+STUB_TEXTS = ["दर्पन में देखो", "जैप करते रहो", "सहारनपूर का कारिक्रियम", "नमस्ते"]
+
+
+# ------------------------------------------------------------
+# MODELS
+# ------------------------------------------------------------
+class StubModel:
+    """
+    Stand-in for WhisperModel / BatchedInferencePipeline .transcribe():
+    one deterministic segment per clip (per clip_timestamps entry when
+    batched), `rtf` seconds of (sleeping) compute per second of input
+    padded to 30 s windows.
+    """
+
+    class Info:
+        language = "hi"
+
+    def __init__(self, rtf: float = 0.0, seed: int = 215):
+        self.rtf = rtf
+        self.rng = random.Random(seed)
+
+    def transcribe(self, audio, clip_timestamps=None, **kwargs):
+        from faster_whisper.transcribe import Segment
+
+        duration = len(audio) / SAMPLE_RATE
+        spans = clip_timestamps or [{"start": 0.0, "end": duration}]
+        padded = sum(WINDOW_SEC * math.ceil((s["end"] - s["start"]) / WINDOW_SEC) for s in spans)
+        time.sleep(padded * self.rtf)
+        segments = [
+            Segment(
+                id=i, seek=0, start=round(s["start"], 3), end=round(s["end"], 3),
+                text=" " + self.rng.choice(STUB_TEXTS), tokens=[],
+                avg_logprob=-self.rng.uniform(0.05, 0.6), compression_ratio=1.2,
+                no_speech_prob=self.rng.uniform(0.0, 0.2), words=None, temperature=0.0
+            )
+            for i, s in enumerate(spans)
+        ]
+        return iter(segments), self.Info()
+
+
+class TimedModel:
+    """
+    Wraps a model (or batched pipeline) and records the latency of every
+    transcribe() call, including draining the lazy segment generator.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.latencies = []
+
+    def transcribe(self, audio, **kwargs):
+        t0 = time.perf_counter()
+        segments, info = self.model.transcribe(audio, **kwargs)
+        segments = list(segments)
+        self.latencies.append(time.perf_counter() - t0)
+        return segments, info
+
+
+# ------------------------------------------------------------
+# MEASUREMENT
+# ------------------------------------------------------------
+def reset_peak_rss() -> bool:
+    """
+    Linux: reset the kernel's RSS high-water mark so the next reading is
+    the peak of one stage, not of the process so far.
+    """
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux (whole process lifetime)
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {}
+    ms = np.asarray(values) * 1000
+    return {
+        "count": len(values),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p90_ms": round(float(np.percentile(ms, 90)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Stages:
+    def __init__(self, audio_sec: float):
+        self.audio_sec = audio_sec
+        self.results = {}
+
+    def run(self, name: str, fn, *args, **kwargs):
+        reset_peak_rss()
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        wall = time.perf_counter() - t0
+
+        self.results[name] = {
+            "wall_sec": round(wall, 4),
+            "rtf": round(wall / self.audio_sec, 6),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        logger.info(
+            f"⏱️ {name:<14}: {wall:8.3f}s | RTF {wall / self.audio_sec:.5f} | "
+            f"peak RSS {peak_rss_mb():.0f} MB"
+        )
+        return out
+
+
+# ------------------------------------------------------------
+# STAGES
+# ------------------------------------------------------------
+def segment(wav_path: Path) -> list:
+    with MappedWav(wav_path) as audio:
+        return list(plan_clips(
+            StreamingEnvelope(audio), len(audio), audio.channels, audio.sample_width,
+            max_ms=MAX_MS, min_clip_ms=MIN_CLIP_MS, min_silence_ms=MIN_SILENCE,
+            thresh=THRESH, keep_silence_ms=KEEP_SILENCE_MS
+        ))
+
+
+def export_clips(wav_path: Path, root: Path, state_file: Path, pack: bool = False) -> list:
+    clips_dir = root / "clips"
+    clips_dir.mkdir(parents=True, exist_ok=True)
+    with MappedWav(wav_path) as audio:
+        clips = list(iter_clips(audio, clips_dir, root))
+        total_ms = len(audio)
+
+    state = {
+        "input_audio": str(wav_path.relative_to(root)),
+        "total_duration_ms": total_ms,
+        "total_clips": len(clips),
+        "clips": clips,
+        "clips_processed": []
+    }
+    if pack:
+        pack_state(state)
+    checkpoint.reset(state_file, state)
+    return clips
+
+
+def decode_clips(root: Path, clips: list) -> list:
+    latencies = []
+    for clip in clips:
+        t0 = time.perf_counter()
+        load_audio(root / clip["file"])
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def bundle(outputs: Path, archive: Path):
+    return bundler.bundle(archive, [outputs], base=outputs.parent)
+
+
+def compare(report: dict, baseline: dict):
+    logger.info(f"📐 vs baseline {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    if baseline.get("config") != report["config"]:
+        logger.warning("⚠️ Baseline was run with a different config")
+
+    rows = [(name, stage["wall_sec"], baseline.get("stages", {}).get(name, {}).get("wall_sec"))
+            for name, stage in report["stages"].items()]
+    rows.append(("total", report["total_wall_sec"], baseline.get("total_wall_sec")))
+    for name, now, before in rows:
+        if before:
+            logger.info(f"   {name:<14}: {before:8.3f}s → {now:8.3f}s ({(now / before - 1) * 100:+.1f}%)")
+
+
+# ------------------------------------------------------------
+# MAIN
+# ------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--rate", type=int, default=44100, help="input sample rate")
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=215)
+    parser.add_argument("--model", default="stub",
+                        help="'stub' or a faster-whisper model name (e.g. tiny)")
+    parser.add_argument("--stub-rtf", type=float, default=0.0,
+                        help="stub compute seconds per audio second")
+    parser.add_argument("--batch-size", type=int, default=0)
+    parser.add_argument("--pack", action="store_true", help="pack clips into 30 s windows")
+    parser.add_argument("--ingest", action="store_true",
+                        help="decode the input to 16 kHz mono first (stage 1 INGEST=1)")
+    parser.add_argument("--workdir", help="keep the scratch project here")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="earlier --out JSON to compare against")
+    args = parser.parse_args()
+
+    scratch = None
+    if args.workdir:
+        root = Path(args.workdir).resolve()
+        root.mkdir(parents=True, exist_ok=True)
+    else:
+        scratch = tempfile.TemporaryDirectory(prefix="bench_pipeline_")
+        root = Path(scratch.name)
+
+    wav_path = root / "audio" / "bench.wav"
+    wav_path.parent.mkdir(parents=True, exist_ok=True)
+    state_file = root / "pipeline_state.json"
+    outputs = root / "outputs"
+    outputs.mkdir(exist_ok=True)
+
+    # --------------------------------------------------------
+    # INPUT
+    # --------------------------------------------------------
+    t0 = time.perf_counter()
+    synth_audio(args.minutes, args.rate, args.channels, seed=args.seed).export(
+        wav_path, format="wav"
+    )
+    audio_sec = args.minutes * 60
+    logger.info(
+        f"🎧 {args.minutes:.1f} min synthetic audio ({args.rate} Hz, {args.channels} ch) "
+        f"in {time.perf_counter() - t0:.1f}s → {wav_path}"
+    )
+
+    if args.model == "stub":
+        model = StubModel(rtf=args.stub_rtf, seed=args.seed)
+    else:
+        model = whisper_backend.load_model(args.model)
+    if args.batch_size > 0 and args.model != "stub":
+        timed = TimedModel(whisper_backend.batched_pipeline(model))
+    else:
+        timed = TimedModel(model)
+
+    # --------------------------------------------------------
+    # STAGES
+    # --------------------------------------------------------
+    stages = Stages(audio_sec)
+
+    if args.ingest:
+        wav_path = stages.run("ingest", ingest, wav_path, root / "input_16k.wav")["path"]
+
+    bounds = stages.run("segmentation", segment, wav_path)
+    clips = stages.run("clip_export", export_clips, wav_path, root, state_file, args.pack)
+    decode_latencies = stages.run("clip_decode", decode_clips, root, clips)
+
+    cache = TranscriptCache(root / "cache" / "transcripts.db")
+    job = TranscriptionJob(
+        timed, root, state_file, outputs, batch_size=args.batch_size,
+        pipeline=timed if args.batch_size > 0 else None, cache=cache
+    )
+    summary = stages.run("transcription", job.run)
+    cache.close()
+
+    refined = stages.run(
+        "postprocess", postprocess,
+        outputs / "raw_transcript.jsonl",
+        outputs / "refined_transcript.jsonl",
+        outputs / "refined_changes.jsonl"
+    )
+    stages.run("bundling", bundle, outputs, root / "outputs.tar.gz")
+
+    # --------------------------------------------------------
+    # REPORT
+    # --------------------------------------------------------
+    total = sum(s["wall_sec"] for s in stages.results.values())
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "minutes": args.minutes,
+            "rate": args.rate,
+            "channels": args.channels,
+            "seed": args.seed,
+            "model": args.model,
+            "stub_rtf": args.stub_rtf if args.model == "stub" else None,
+            "batch_size": args.batch_size,
+            "pack": args.pack,
+            "ingest": args.ingest,
+        },
+        "audio_sec": audio_sec,
+        "clips": len(bounds),
+        "model_inputs": summary["clips"],
+        "segments": summary["segments"],
+        "rule_changes": refined["changes"],
+        "stages": stages.results,
+        "total_wall_sec": round(total, 4),
+        "total_rtf": round(total / audio_sec, 6),
+        "peak_rss_mb": max(s["peak_rss_mb"] for s in stages.results.values()),
+        "latency": {
+            "clip_decode": percentiles(decode_latencies),
+            # batched runs record one latency per batch
+            "transcribe_call": percentiles(timed.latencies),
+        },
+        "bundle_bytes": (root / "outputs.tar.gz").stat().st_size,
+    }
+
+    logger.info("=" * 80)
+    logger.info(
+        f"✅ {len(bounds)} clips | total {total:.2f}s | RTF {total / audio_sec:.5f} | "
+        f"peak RSS {report['peak_rss_mb']:.0f} MB"
+    )
+    for name, p in report["latency"].items():
+        if p:
+            logger.info(
+                f"📊 {name:<15}: p50 {p['p50_ms']:.1f} ms | p90 {p['p90_ms']:.1f} ms | "
+                f"p99 {p['p99_ms']:.1f} ms"
+            )
+    if args.baseline:
+        compare(report, json.loads(Path(args.baseline).read_text()))
+    logger.info("=" * 80)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        logger.info(f"📄 Saved: {args.out}")
+
+    if scratch:
+        scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark — pydub window loop vs vectorized silence engine
+
+Generates deterministic synthetic audio (tone bursts separated by
+silences of random length), runs both segmenters with the stage 1
+config and checks that the cut plans are identical.
+
+Usage:
+    python benchmarks/bench_segmentation.py [--minutes 5] [--rate 16000]
+"""
+
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment, silence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from silence_engine import plan_audio_segment  # noqa: E402
+from segmenter import (  # noqa: E402
+    MAX_MS, MIN_CLIP_MS, MIN_SILENCE, THRESH, KEEP_SILENCE_MS
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def synth_audio(minutes: float, frame_rate: int, channels: int, seed: int = 215):
+    """
+    Speech-like bursts (2–9s) alternating with pauses (0.1–1.5s).
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * frame_rate)
+    out = np.zeros(total, dtype=np.float64)
+
+    pos = 0
+    while pos < total:
+        burst = int(rng.uniform(2.0, 9.0) * frame_rate)
+        t = np.arange(min(burst, total - pos)) / frame_rate
+        tone = np.sin(2 * np.pi * rng.uniform(120, 300) * t)
+        out[pos:pos + len(t)] = 0.3 * tone * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+        pos += burst + int(rng.uniform(0.1, 1.5) * frame_rate)
+
+    out += rng.normal(0, 0.001, total)
+    pcm = (np.clip(out, -1, 1) * 32767).astype(np.int16)
+    pcm = np.repeat(pcm[:, None], channels, axis=1)
+
+    return AudioSegment(
+        pcm.tobytes(), frame_rate=frame_rate, sample_width=2, channels=channels
+    )
+
+
+def pydub_plan(audio: AudioSegment):
+    """
+    Reference: the original per-window detect_silence() loop.
+    """
+    bounds = []
+    cursor = 0
+    total_ms = len(audio)
+
+    while cursor < total_ms:
+        window = audio[cursor: cursor + MAX_MS]
+        sils = silence.detect_silence(
+            window, min_silence_len=MIN_SILENCE, silence_thresh=THRESH
+        )
+
+        cut = None
+        if sils and sils[-1][0] >= MIN_CLIP_MS:
+            cut = sils[-1][0]
+
+        if cut:
+            bounds.append((cursor, min(cursor + cut + KEEP_SILENCE_MS, total_ms)))
+            cursor += cut
+        else:
+            bounds.append((cursor, cursor + len(window)))
+            cursor += len(window)
+
+    return bounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=float, default=5.0)
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--channels", type=int, default=1)
+    args = parser.parse_args()
+
+    audio = synth_audio(args.minutes, args.rate, args.channels)
+    logger.info(
+        f"🎧 Synthetic audio: {len(audio)/1000:.1f}s | "
+        f"{args.rate} Hz | {args.channels} ch"
+    )
+
+    t0 = time.perf_counter()
+    ref = pydub_plan(audio)
+    t_ref = time.perf_counter() - t0
+    logger.info(f"🐢 pydub loop     : {t_ref:.2f}s ({len(ref)} clips)")
+
+    t0 = time.perf_counter()
+    fast = plan_audio_segment(
+        audio, MAX_MS, MIN_CLIP_MS, MIN_SILENCE, THRESH, KEEP_SILENCE_MS
+    )
+    t_fast = time.perf_counter() - t0
+    logger.info(f"⚡ numpy engine   : {t_fast:.3f}s ({len(fast)} clips)")
+
+    logger.info(f"📊 Speedup        : {t_ref / max(t_fast, 1e-9):.0f}x")
+
+    if ref != fast:
+        mismatch = next(i for i, (a, b) in enumerate(zip(ref, fast)) if a != b) \
+            if len(ref) == len(fast) else min(len(ref), len(fast))
+        logger.error(f"❌ Cut plans differ (first at clip {mismatch})")
+        sys.exit(1)
+
+    logger.info("✅ Cut plans identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark — energy segmenter vs Silero VAD segmenter (GPU seconds saved)
+
+Segments the same input with both stage 1 modes and compares how much
+audio each one sends to the model. GPU seconds saved = audio not sent ×
+--gpu-rtf (GPU seconds per audio second of the transcription model;
+measure it with bench_batched.py or take "rtf" from
+outputs/metrics/transcribe.json).
+
+Without --input a deterministic synthetic lecture is generated: voiced
+pseudo-speech passages (harmonics shaped by vowel formants, syllable
+envelope) separated by short pauses, long silences, crowd noise and
+music. Its speech regions are known, so speech recall of both
+segmenters is reported too.
+
+Usage:
+    python benchmarks/bench_vad.py [--minutes 20] [--gpu-rtf 0.05] [--out vad.json]
+    python benchmarks/bench_vad.py --input audio/215.wav
+"""
+
+import sys
+import json
+import time
+import wave
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from bench_pipeline import segment as energy_plan  # noqa: E402
+from audio_store import SAMPLE_RATE  # noqa: E402
+from segmenter import MAX_MS  # noqa: E402
+from vad_segmenter import plan_speech  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# (F1, F2, F3) Hz of a, i, u, e, o
+VOWELS = np.array([(730, 1090, 2440), (270, 2290, 3010), (300, 870, 2240),
+                   (530, 1840, 2480), (570, 840, 2410)])
+SYLLABLE_SEC = 0.2
+
+
+# ------------------------------------------------------------
+# SYNTHETIC LECTURE
+# ------------------------------------------------------------
+def pseudo_speech(rng, sec: float) -> np.ndarray:
+    n = int(sec * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = rng.uniform(110, 160) + 25 * np.sin(2 * np.pi * 0.5 * t + rng.uniform(0, 6))
+    phase = np.cumsum(2 * np.pi * f0 / SAMPLE_RATE)
+
+    syllable = (t / SYLLABLE_SEC).astype(int)
+    formants = VOWELS[rng.integers(0, len(VOWELS), syllable[-1] + 1)[syllable]]
+
+    y = np.zeros(n)
+    for k in range(1, 40):
+        fk = k * f0
+        amp = sum(1 / (1 + ((fk - formants[:, j]) / (80 + 40 * j)) ** 2) for j in range(3))
+        y += amp / k ** 0.5 * np.sin(k * phase)
+    y *= np.abs(np.sin(np.pi * t / SYLLABLE_SEC)) ** 0.6
+    return 0.3 * y / np.abs(y).max()
+
+
+def crowd_noise(rng, sec: float) -> np.ndarray:
+    # brown-ish noise around -25 dBFS: far above the -40 dBFS silence threshold
+    y = np.cumsum(rng.normal(0, 1, int(sec * SAMPLE_RATE)))
+    y -= np.convolve(y, np.ones(400) / 400, mode="same")
+    return 0.056 * y / (np.sqrt(np.mean(y ** 2)) + 1e-9)
+
+
+def music(rng, sec: float) -> np.ndarray:
+    t = np.arange(int(sec * SAMPLE_RATE)) / SAMPLE_RATE
+    root = rng.choice([220.0, 246.9, 261.6, 293.7])
+    chord = sum(np.sin(2 * np.pi * root * r * t) for r in (1, 1.26, 1.5, 2))
+    return 0.08 * chord * (0.7 + 0.3 * np.sin(2 * np.pi * 2 * t))
+
+
+def synth_lecture(minutes: float, seed: int = 215):
+    """
+    (int16 samples at 16 kHz, [(start_sample, end_sample)] of speech)
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    parts, speech, pos = [], [], 0
+
+    while pos < total:
+        sec = rng.uniform(3, 20)
+        parts.append(pseudo_speech(rng, sec))
+        speech.append((pos, pos + len(parts[-1])))
+        pos += len(parts[-1])
+
+        kind = rng.choice(["pause", "pause", "pause", "silence", "noise", "music"])
+        if kind == "pause":
+            gap = np.zeros(int(rng.uniform(0.2, 1.2) * SAMPLE_RATE))
+        elif kind == "silence":
+            gap = np.zeros(int(rng.uniform(5, 30) * SAMPLE_RATE))
+        elif kind == "noise":
+            gap = crowd_noise(rng, rng.uniform(5, 30))
+        else:
+            gap = music(rng, rng.uniform(5, 30))
+        parts.append(gap)
+        pos += len(gap)
+
+    y = np.concatenate(parts)[:total] + rng.normal(0, 0.0005, total)
+    pcm = (np.clip(y, -1, 1) * 32767).astype(np.int16)
+    return pcm, [(s, min(e, total)) for s, e in speech if s < total]
+
+
+def write_wav(path: Path, pcm: np.ndarray):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm.tobytes())
+
+
+# ------------------------------------------------------------
+# COMPARISON
+# ------------------------------------------------------------
+def covered_ms(bounds, truth) -> float:
+    """
+    Milliseconds of true speech inside the clip bounds.
+    """
+    mask = np.zeros(max(e for _, e in truth) * 1000 // SAMPLE_RATE + 1, dtype=bool)
+    for s, e in truth:
+        mask[s * 1000 // SAMPLE_RATE:e * 1000 // SAMPLE_RATE] = True
+    hit = np.zeros_like(mask)
+    for s, e in bounds:
+        hit[s:e] = True
+    return float((mask & hit).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--input", help="audio file (default: synthetic lecture)")
+    parser.add_argument("--minutes", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=215)
+    parser.add_argument("--gpu-rtf", type=float, default=0.05,
+                        help="GPU seconds per audio second of the transcription model")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_vad_") as tmp:
+        tmp = Path(tmp)
+        truth = None
+        if args.input:
+            wav_path = Path(args.input)
+        else:
+            pcm, truth = synth_lecture(args.minutes, args.seed)
+            wav_path = tmp / "lecture.wav"
+            write_wav(wav_path, pcm)
+            logger.info(
+                f"🎧 Synthetic lecture: {args.minutes:.1f} min, "
+                f"{sum(e - s for s, e in truth) / SAMPLE_RATE:.0f}s speech"
+            )
+
+        t0 = time.perf_counter()
+        energy = energy_plan(wav_path)
+        t_energy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        vad, _, report = plan_speech(wav_path, tmp / "vad_16k.f32", MAX_MS)
+        t_vad = time.perf_counter() - t0
+
+    audio_sec = report["audio_ms"] / 1000
+    results = {}
+    for name, bounds, elapsed in (("energy", energy, t_energy), ("vad", vad, t_vad)):
+        sent = sum(e - s for s, e in bounds) / 1000
+        results[name] = {
+            "clips": len(bounds),
+            "segment_sec": round(elapsed, 3),
+            "audio_to_model_sec": round(sent, 3),
+            "skipped_sec": round(audio_sec - sent, 3),
+            "gpu_sec_est": round(sent * args.gpu_rtf, 3),
+        }
+        if truth:
+            true_ms = sum(e - s for s, e in truth) * 1000 / SAMPLE_RATE
+            results[name]["speech_recall"] = round(covered_ms(bounds, truth) / true_ms, 4)
+
+    saved = results["energy"]["gpu_sec_est"] - results["vad"]["gpu_sec_est"]
+    report_out = {
+        "input": str(args.input or f"synthetic:{args.minutes}min:seed{args.seed}"),
+        "audio_sec": audio_sec,
+        "gpu_rtf": args.gpu_rtf,
+        "segmenters": results,
+        "gpu_sec_saved_est": round(saved, 3),
+        "gpu_saved_pct": round(100 * saved / max(results["energy"]["gpu_sec_est"], 1e-9), 2),
+        "vad": report["vad"],
+    }
+
+    logger.info("=" * 80)
+    for name, r in results.items():
+        recall = f" | speech recall {r['speech_recall']:.1%}" if "speech_recall" in r else ""
+        logger.info(
+            f"✂️ {name:<6}: {r['clips']:4d} clips | {r['audio_to_model_sec']:8.1f}s to model | "
+            f"skipped {r['skipped_sec']:7.1f}s | segmenting {r['segment_sec']:.2f}s{recall}"
+        )
+    logger.info(
+        f"🚀 GPU seconds saved ≈ {saved:.1f}s ({report_out['gpu_saved_pct']}%) "
+        f"at RTF {args.gpu_rtf}"
+    )
+    logger.info("=" * 80)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report_out, indent=2))
+        logger.info(f"📄 Saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
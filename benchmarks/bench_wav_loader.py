@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark — peak RSS of stage 1 segmentation: AudioSegment vs MappedWav
+
+Writes a deterministic synthetic WAV, then segments it in a fresh child
+process per loader and reports ru_maxrss. The mapped loader should stay
+flat as --minutes grows; the pydub loader grows with the input.
+
+Usage:
+    python benchmarks/bench_wav_loader.py [--minutes 30] [--rate 44100] [--channels 2]
+"""
+
+import sys
+import time
+import wave
+import argparse
+import logging
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+CHILD = """
+import sys, tempfile
+sys.path.insert(0, {src!r})
+from silence_engine import plan_clips, plan_audio_segment
+from wav_reader import MappedWav, StreamingEnvelope
+
+cfg = dict(max_ms=30_000, min_clip_ms=12_000, min_silence_ms=600,
+           thresh=-40, keep_silence_ms=300)
+out = tempfile.mkdtemp()
+
+if {loader!r} == "mapped":
+    audio = MappedWav({path!r})
+    bounds = plan_clips(StreamingEnvelope(audio), len(audio), audio.channels,
+                        audio.sample_width, **cfg)
+    for i, (a, b) in enumerate(bounds):
+        audio.write_clip(f"{{out}}/clip_{{i:03d}}.wav", a, b)
+        audio.release(a)
+else:
+    from pydub import AudioSegment
+    audio = AudioSegment.from_wav({path!r})
+    for i, (a, b) in enumerate(plan_audio_segment(audio, **cfg)):
+        audio[a:b].export(f"{{out}}/clip_{{i:03d}}.wav", format="wav")
+"""
+
+
+def write_synth_wav(path: Path, minutes: float, rate: int, channels: int):
+    """
+    Tone bursts and pauses, written in 1-minute blocks.
+    """
+    rng = np.random.default_rng(215)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        for _ in range(int(np.ceil(minutes))):
+            t = np.arange(60 * rate) / rate
+            gate = (np.sin(2 * np.pi * rng.uniform(0.05, 0.2) * t) > -0.3)
+            pcm = (0.3 * np.sin(2 * np.pi * 180 * t) * gate * 32767).astype(np.int16)
+            w.writeframes(np.repeat(pcm[:, None], channels, axis=1).tobytes())
+
+
+def run_child(loader: str, path: Path):
+    code = CHILD.format(src=str(SRC_DIR), loader=loader, path=str(path))
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    # ru_maxrss of the largest child so far (KiB on Linux)
+    peak_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return elapsed, peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=float, default=30.0)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.wav"
+        write_synth_wav(path, args.minutes, args.rate, args.channels)
+        logger.info(
+            f"🎧 Synthetic WAV: {args.minutes:.0f} min | "
+            f"{path.stat().st_size / 1e6:.0f} MB"
+        )
+
+        # mapped first: RUSAGE_CHILDREN reports the max over all children
+        t, rss = run_child("mapped", path)
+        logger.info(f"⚡ MappedWav    : {t:.1f}s | peak RSS {rss:.0f} MB")
+
+        t, rss = run_child("pydub", path)
+        logger.info(f"🐢 AudioSegment : {t:.1f}s | peak RSS {rss:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
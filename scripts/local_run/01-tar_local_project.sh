@@ -23,6 +23,7 @@ EXCLUDES=(
   "outputs"
   "*.wav"
   "*.tar.gz"
+  ".sync"
 )
 
 # -------------------------------
@@ -0,0 +1,76 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# ============================================================
+# Incremental alternative to 01-tar + 02_upload + 04_untar:
+# only chunks the pod does not have yet are sent (src/project_sync.py)
+#   ./02_sync_to_pod.sh           push the project
+#   ./02_sync_to_pod.sh pull      pull new/changed outputs/ back
+# ============================================================
+
+# ============================================================
+# TIMESTAMP
+# ============================================================
+ts() { date +"%Y-%m-%d %H:%M:%S"; }
+
+# ============================================================
+# RESOLVE PATHS
+# ============================================================
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
+PROJECT_NAME="$(basename "$PROJECT_ROOT")"
+
+MODE="${1:-push}"
+
+# ============================================================
+# LOAD POD CONFIG
+# ============================================================
+ENV_FILE="${PROJECT_ROOT}/config/pod.env"
+
+if [[ ! -f "$ENV_FILE" ]]; then
+  echo "❌ pod.env not found → $ENV_FILE"
+  exit 1
+fi
+
+# shellcheck disable=SC1090
+source "$ENV_FILE"
+
+# ============================================================
+# VALIDATION
+# ============================================================
+for var in POD_HOST POD_PORT POD_USER SSH_KEY REMOTE_WORKDIR; do
+  if [[ -z "${!var:-}" ]]; then
+    echo "❌ $var not set in pod.env"
+    exit 1
+  fi
+done
+
+SSH_KEY_EXPANDED="$(eval echo "$SSH_KEY")"
+
+if [[ ! -f "$SSH_KEY_EXPANDED" ]]; then
+  echo "❌ SSH key not found → $SSH_KEY_EXPANDED"
+  exit 1
+fi
+
+REMOTE="$POD_USER@$POD_HOST:$REMOTE_WORKDIR/$PROJECT_NAME"
+
+# ============================================================
+# SYNC
+# ============================================================
+echo "============================================================"
+echo "🔁 [$(ts)] Sync ($MODE)"
+echo "Local  : $PROJECT_ROOT"
+echo "Remote : $REMOTE (port $POD_PORT)"
+echo "============================================================"
+
+if [[ "$MODE" == "pull" ]]; then
+  python3 "$PROJECT_ROOT/src/project_sync.py" pull "$REMOTE/outputs" \
+    --to "$PROJECT_ROOT/outputs" --port "$POD_PORT" --key "$SSH_KEY_EXPANDED"
+else
+  python3 "$PROJECT_ROOT/src/project_sync.py" push "$REMOTE" \
+    --from "$PROJECT_ROOT" --port "$POD_PORT" --key "$SSH_KEY_EXPANDED"
+fi
+
+echo "============================================================"
+echo "✅ [$(ts)] Sync complete"
+echo "============================================================"
@@ -52,6 +52,18 @@ echo "Project    : $PROJECT_ROOT"
 echo "Pod        : $POD_USER@$POD_HOST:$POD_PORT"
 echo "============================================================"
 
+if [[ "${SYNC:-0}" == "1" ]]; then
+# ============================================================
+# STEPS 1+2 — INCREMENTAL SYNC (only changed chunks are sent)
+# ============================================================
+echo ""
+echo "[$(ts)] ▶ STEPS 1+2: Syncing project to pod"
+cd "$SCRIPT_DIR"
+./02_sync_to_pod.sh
+echo "[$(ts)] ✅ Sync completed"
+UNTAR_CMD="echo '🔁 Project synced — nothing to untar'"
+
+else
 # ============================================================
 # STEP 1 — TAR LOCAL PROJECT
 # ============================================================
@@ -69,6 +81,9 @@ echo "[$(ts)] ▶ STEP 2: Uploading archive to pod"
 ./02_upload_to_pod.sh
 echo "[$(ts)] ✅ Upload completed"
 
+UNTAR_CMD="./03_untar_pod_project.sh"
+fi
+
 # ============================================================
 # STEP 3 — SSH INTO POD & RUN PIPELINE
 # ============================================================
@@ -87,7 +102,7 @@ echo "============================================================"
 cd "$REMOTE_WORKDIR"
 
 echo "📦 Untarring project..."
-./03_untar_pod_project.sh
+$UNTAR_CMD
 
 cd transcribe-whisper-cloud-gpu/scripts/pod_run
 
@@ -106,7 +121,11 @@ echo "[$(ts)] ✅ Pod execution complete"
 # ============================================================
 echo ""
 echo "[$(ts)] ▶ STEP 4: Downloading outputs from pod"
-./09_download_output.sh
+if [[ "${SYNC:-0}" == "1" ]]; then
+  ./02_sync_to_pod.sh pull
+else
+  ./09_download_output.sh
+fi
 echo "[$(ts)] ✅ Outputs downloaded"
 
 # ============================================================
@@ -43,9 +43,20 @@ assert torch.backends.cudnn.is_available()
 EOF
 
 # ---------------- Whisper load ----------------
-python - << 'EOF'
-from faster_whisper import WhisperModel
-WhisperModel("large-v3", device="cuda", compute_type="float16")
+# Bundled model store (models/, src/model_store.py): checksum-verified,
+# loaded offline; otherwise large-v3 is downloaded from Hugging Face.
+PROJECT_DIR="$WORKDIR/transcribe-whisper-cloud-gpu"
+python "$PROJECT_DIR/src/model_store.py" verify large-v3 \
+  || echo "ℹ️ large-v3 not in the bundled model store — downloading"
+
+WHISPER_MODEL=large-v3 METRICS_DIR="$WORKDIR/metrics" python - << EOF
+import sys
+sys.path.insert(0, "$PROJECT_DIR/src")
+import logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+import metrics, whisper_backend
+whisper_backend.load_model("large-v3", device="cuda", compute_type="float16")
+metrics.export("model_load")
 print("✅ Whisper model loaded on GPU")
 EOF
 
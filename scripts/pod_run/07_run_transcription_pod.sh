@@ -19,7 +19,9 @@ POD_SCRIPTS_DIR="$PROJECT_ROOT/scripts/pod_run"
 
 SEGMENT_SCRIPT="$SRC_DIR/01_segment_audio.py"
 TRANSCRIBE_SCRIPT="$SRC_DIR/02_transcribe_clips.py"
+STREAM_SCRIPT="$SRC_DIR/stream_pipeline.py"
 POSTPROCESS_SCRIPT="$SRC_DIR/03_postprocess_rules.py"
+INDEX_SCRIPT="$SRC_DIR/04_index_transcripts.py"
 COMPRESS_SCRIPT="$POD_SCRIPTS_DIR/08_compress_output_pod.sh"
 
 echo "============================================================"
@@ -28,11 +30,25 @@ echo "Started at : $(ts)"
 echo "Project    : $PROJECT_ROOT"
 echo "============================================================"
 
+if [[ "${STREAMING:-0}" == "1" ]]; then
+# ------------------------------------------------------------
+# STEPS 1+2 — STREAMING (segmentation ∥ transcription)
+# ------------------------------------------------------------
+echo ""
+echo "[$(ts)] ▶ STEPS 1+2/5: Streaming segmentation + transcription started"
+START=$(date +%s)
+
+python "$STREAM_SCRIPT"
+
+END=$(date +%s)
+echo "[$(ts)] ✅ STEPS 1+2 completed in $((END - START)) sec"
+
+else
 # ------------------------------------------------------------
 # STEP 1 — SEGMENTATION
 # ------------------------------------------------------------
 echo ""
-echo "[$(ts)] ▶ STEP 1/4: Audio segmentation started"
+echo "[$(ts)] ▶ STEP 1/5: Audio segmentation started"
 START=$(date +%s)
 
 python "$SEGMENT_SCRIPT"
@@ -44,19 +60,20 @@ echo "[$(ts)] ✅ STEP 1 completed in $((END - START)) sec"
 # STEP 2 — TRANSCRIPTION
 # ------------------------------------------------------------
 echo ""
-echo "[$(ts)] ▶ STEP 2/4: Transcription started (this can take time)"
+echo "[$(ts)] ▶ STEP 2/5: Transcription started (this can take time)"
 START=$(date +%s)
 
 python "$TRANSCRIBE_SCRIPT"
 
 END=$(date +%s)
 echo "[$(ts)] ✅ STEP 2 completed in $((END - START)) sec"
+fi
 
 # ------------------------------------------------------------
 # STEP 3 — POST-PROCESSING
 # ------------------------------------------------------------
 echo ""
-echo "[$(ts)] ▶ STEP 3/4: Rule-based post-processing started"
+echo "[$(ts)] ▶ STEP 3/5: Rule-based post-processing started"
 START=$(date +%s)
 
 python "$POSTPROCESS_SCRIPT"
@@ -65,17 +82,29 @@ END=$(date +%s)
 echo "[$(ts)] ✅ STEP 3 completed in $((END - START)) sec"
 
 # ------------------------------------------------------------
-# STEP 4 — COMPRESS OUTPUTS
+# STEP 4 — SEARCH INDEX
+# ------------------------------------------------------------
+echo ""
+echo "[$(ts)] ▶ STEP 4/5: Indexing transcripts for search"
+START=$(date +%s)
+
+python "$INDEX_SCRIPT"
+
+END=$(date +%s)
+echo "[$(ts)] ✅ STEP 4 completed in $((END - START)) sec"
+
+# ------------------------------------------------------------
+# STEP 5 — COMPRESS OUTPUTS
 # ------------------------------------------------------------
 echo ""
-echo "[$(ts)] ▶ STEP 4/4: Compressing outputs"
+echo "[$(ts)] ▶ STEP 5/5: Compressing outputs"
 START=$(date +%s)
 
 chmod +x "$COMPRESS_SCRIPT"
 "$COMPRESS_SCRIPT"
 
 END=$(date +%s)
-echo "[$(ts)] ✅ STEP 4 completed in $((END - START)) sec"
+echo "[$(ts)] ✅ STEP 5 completed in $((END - START)) sec"
 echo "[$(ts)] 📦 outputs.tar.gz created"
 
 
@@ -88,9 +117,16 @@ echo "✅ PIPELINE COMPLETE"
 echo "Finished at : $(ts)"
 echo ""
 echo "📁 outputs/"
-echo "   - raw_transcript.json"
-echo "   - refined_transcript.json"
+echo "   - raw_transcript.jsonl"
+echo "   - refined_transcript.jsonl"
+if [[ "${EXPORT_JSON:-0}" == "1" ]]; then
+echo "   - raw_transcript.json, refined_transcript.json"
+fi
+echo "   - refined_changes.jsonl"
+echo "   - metrics/ (per-stage .json + .prom)"
+if [[ "${RENDER_DIFF:-0}" == "1" ]]; then
 echo "   - raw_vs_refined.diff.txt"
+fi
 echo "📦 Archive:"
 echo "   - outputs.tar.gz"
 echo "============================================================"
@@ -36,9 +36,24 @@ fi
 
 # ============================================================
 # COMPRESS
+# Parallel gzip members (src/bundler.py); same layout as
+# tar -czf "$ARCHIVE" -C "$PROJECT_ROOT" outputs. Unchanged files are
+# copied from the previous archive; BUNDLE_INCREMENTAL=1 bundles only
+# files new / changed since then into outputs.<time>.delta.tar.gz
+# (outputs.tar.gz is left as is).
 # ============================================================
-tar -czf "$ARCHIVE" -C "$PROJECT_ROOT" outputs
+BUNDLE_ARGS=()
+if [[ "${BUNDLE_INCREMENTAL:-0}" == "1" ]]; then
+  BUNDLE_ARGS+=( --incremental )
+fi
+
+python3 "$PROJECT_ROOT/src/bundler.py" "$ARCHIVE" "$OUTPUTS_DIR" \
+  --base "$PROJECT_ROOT" "${BUNDLE_ARGS[@]}"
 
 echo "============================================================"
-echo "✅ [$(ts)] outputs.tar.gz created successfully"
+if [[ "${BUNDLE_INCREMENTAL:-0}" == "1" ]]; then
+  echo "✅ [$(ts)] delta bundle created (outputs.*.delta.tar.gz)"
+else
+  echo "✅ [$(ts)] outputs.tar.gz created successfully"
+fi
 echo "============================================================"
@@ -8,20 +8,25 @@ Features:
 - Resumable with state + cache
 - GPU accelerated (faster-whisper, FP16)
 - Pure Whisper output (NO LLM post-processing)
+- Partial transcript (txt / srt / vtt + ETA) republished after every clip
 - Output bundling
 - Graceful auto-pod shutdown AFTER download window
 """
 
 import os
-import json
 import time
-import pickle
-import tarfile
 import logging
 from datetime import datetime
 
-from pydub import AudioSegment, silence
-from faster_whisper import WhisperModel
+from faster_whisper import decode_audio
+
+import bundler
+import checkpoint
+import whisper_backend
+from partial_transcript import PARTIAL_NAME, PARTIAL_TRANSCRIPT, PartialTranscript
+from silence_engine import plan_clips
+from transcript_cache import TranscriptCache, cache_key
+from wav_reader import MappedWav, StreamingEnvelope
 
 
 # ================= CONFIG =================
@@ -36,6 +41,9 @@ SILENCE_THRESH = -40
 MIN_SILENCE_MS = 600
 KEEP_SILENCE_MS = 300
 
+# Transcript cache key (same params as stage 2 defaults → shared entries)
+DECODE_PARAMS = whisper_backend.decode_params(batched=False)
+
 # Shutdown behavior
 AUTO_SHUTDOWN = True
 SHUTDOWN_DELAY_SEC = 300   # 5 minutes to download bundle
@@ -68,65 +76,64 @@ def format_ms(ms: int) -> str:
 
 def load_state():
     if os.path.exists(STATE_FILE):
-        with open(STATE_FILE) as f:
-            logger.info("📂 Loaded pipeline state")
-            return json.load(f)
+        logger.info("📂 Loaded pipeline state")
+        return checkpoint.load_state(STATE_FILE)
     logger.info("🆕 No state found, starting fresh")
     return {"clips_processed": []}
 
 
+def clips_done(state) -> int:
+    return len(set(state["clips_processed"]))
+
+
 def save_state(state):
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+    checkpoint.reset(STATE_FILE, state)
     logger.info(
         f"💾 State saved → "
-        f"{len(state['clips_processed'])}/{state.get('total_clips', '?')} clips done"
+        f"{clips_done(state)}/{state.get('total_clips', '?')} clips done"
     )
 
 
-def smart_split(audio: AudioSegment):
-    logger.info("✂️ Performing silence-aware segmentation")
-    clips = []
-    cursor = 0
-
-    while cursor < len(audio):
-        window = audio[cursor: cursor + MAX_CLIP_MS]
-
-        silences = silence.detect_silence(
-            window,
-            min_silence_len=MIN_SILENCE_MS,
-            silence_thresh=SILENCE_THRESH
-        )
-
-        cut = None
-        if silences:
-            last_silence_start = silences[-1][0]
-            if last_silence_start >= MIN_CLIP_MS:
-                cut = last_silence_start
-
-        if cut:
-            clip = audio[cursor: cursor + cut + KEEP_SILENCE_MS]
-            cursor += cut
-        else:
-            clip = audio[cursor: cursor + MAX_CLIP_MS]
-            cursor += MAX_CLIP_MS
+def record_clip(state, idx, key):
+    # a processed clip missing from the cache is transcribed again: journal
+    # its new cache key, but count it once
+    if idx not in state["clips_processed"]:
+        state["clips_processed"].append(idx)
+    checkpoint.append(STATE_FILE, idx, key=key)
+    logger.info(
+        f"💾 Checkpoint → "
+        f"{clips_done(state)}/{state.get('total_clips', '?')} clips done"
+    )
 
-        clips.append(clip)
 
-    logger.info(f"✅ Segmented into {len(clips)} logical clips")
-    return clips
+def smart_split(audio: MappedWav):
+    """
+    Yields (start_ms, end_ms) clip bounds from one pass over the
+    energy envelope of the mapped audio.
+    """
+    logger.info("✂️ Performing silence-aware segmentation")
+    return plan_clips(
+        StreamingEnvelope(audio),
+        len(audio),
+        audio.channels,
+        audio.sample_width,
+        max_ms=MAX_CLIP_MS,
+        min_clip_ms=MIN_CLIP_MS,
+        min_silence_ms=MIN_SILENCE_MS,
+        thresh=SILENCE_THRESH,
+        keep_silence_ms=KEEP_SILENCE_MS
+    )
 
 
 def bundle_outputs(bundle_name="outputs_bundle.tar.gz"):
     logger.info("📦 Bundling outputs for download")
 
-    with tarfile.open(bundle_name, "w:gz") as tar:
-        if os.path.exists("pipeline.log"):
-            tar.add("pipeline.log")
-        for f in os.listdir(".."):
-            if f.startswith("hindi_pipeline_") and f.endswith(".txt"):
-                tar.add(f)
+    files = [f for f in sorted(os.listdir("."))
+             if f == "pipeline.log" or f.startswith(PARTIAL_NAME + ".")
+             or (f.startswith("hindi_pipeline_") and f.endswith(".txt"))]
+    report = bundler.bundle(bundle_name, files)
 
+    bundler.log_report(bundle_name, report)
     logger.info(f"📦 Bundle created → {bundle_name}")
     return bundle_name
 
@@ -140,23 +147,18 @@ def shutdown_pod_with_delay(delay_sec):
 
 
 # ================= LOAD MODEL =================
-t0 = time.time()
-logger.info("🧠 Loading faster-whisper large-v3 on GPU (FP16)")
-model = WhisperModel(
-    "large-v3",
-    device="cuda",
-    compute_type="float16"
-)
-logger.info(f"🧠 Model ready in {time.time() - t0:.1f}s")
+# device / compute type from WHISPER_* env or config/backend.env
+model = whisper_backend.load_model()
 
 
 # ================= LOAD STATE =================
 state = load_state()
+cache = TranscriptCache()
 
 
 # ================= CREATE CLIPS =================
 if "clips" not in state:
-    audio = AudioSegment.from_wav(INPUT_FILE)
+    audio = MappedWav(INPUT_FILE)
     total_audio_ms = len(audio)
     state["total_duration"] = total_audio_ms / 1000
 
@@ -166,29 +168,29 @@ if "clips" not in state:
     )
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    audio_clips = smart_split(audio)
 
     clips = []
-    cursor_ms = 0
 
-    for idx, clip in enumerate(audio_clips):
-        clip_len = len(clip)
+    for idx, (start_ms, end_ms) in enumerate(smart_split(audio)):
         clip_file = f"{OUTPUT_DIR}/clip_{idx:03d}.wav"
-        clip.export(clip_file, format="wav")
+        clip_len = audio.write_clip(clip_file, start_ms, end_ms)
 
         logger.info(
             f"✂️ Clip {idx + 1:03d} | "
-            f"start={format_time(cursor_ms / 1000)} | "
+            f"start={format_time(start_ms / 1000)} | "
             f"duration={format_ms(clip_len)}"
         )
 
         clips.append({
             "file": clip_file,
-            "start_ms": cursor_ms,
+            "start_ms": start_ms,
             "duration_ms": clip_len
         })
 
-        cursor_ms += clip_len
+        audio.release(start_ms)
+
+    audio.close()
+    logger.info(f"✅ Segmented into {len(clips)} logical clips")
 
     state["clips"] = clips
     state["total_clips"] = len(clips)
@@ -203,10 +205,20 @@ else:
 logger.info("🎙️ Starting transcription (resumable)")
 all_segments = []
 
+processed_before = set(state["clips_processed"])
+partial = None
+if PARTIAL_TRANSCRIPT:
+    partial = PartialTranscript(
+        ".",
+        state.get("total_duration", sum(c["duration_ms"] for c in clips) / 1000),
+        total_clips=len(clips),
+        done_audio_sec=sum(clips[i]["duration_ms"] for i in processed_before) / 1000,
+        done_clips=len(processed_before),
+    )
+
 for i, clip in enumerate(clips):
     clip_file = clip["file"]
     start_offset_sec = clip["start_ms"] / 1000
-    cache_file = f"{clip_file}.cache.pkl"
 
     logger.info(
         f"▶ Clip {i + 1}/{len(clips)} | "
@@ -215,19 +227,23 @@ for i, clip in enumerate(clips):
         f"dur={format_ms(clip['duration_ms'])}"
     )
 
-    if i in state["clips_processed"]:
-        with open(cache_file, "rb") as f:
-            segments = pickle.load(f)
+    samples = decode_audio(clip_file)
+    key = cache_key(samples, DECODE_PARAMS)
+    segments = cache.get(key)
+
+    if segments is not None:
         logger.info("   ⚡ Loaded cached transcription")
+        if i not in state["clips_processed"]:
+            record_clip(state, i, key)
     else:
         try:
             t0 = time.time()
-            logger.info("   🧠 GPU inference started")
+            logger.info(f"   🧠 {whisper_backend.DEVICE.upper()} inference started")
 
             segments, _ = model.transcribe(
-                clip_file,
-                language="hi",
-                beam_size=5,
+                samples,
+                language=whisper_backend.LANGUAGE,
+                beam_size=whisper_backend.BEAM_SIZE,
                 vad_filter=False
             )
 
@@ -238,11 +254,8 @@ for i, clip in enumerate(clips):
                 f"({len(segments)} segments)"
             )
 
-            with open(cache_file, "wb") as f:
-                pickle.dump(segments, f)
-
-            state["clips_processed"].append(i)
-            save_state(state)
+            cache.put(key, segments)
+            record_clip(state, i, key)
 
         except KeyboardInterrupt:
             logger.warning("⏸️ Interrupted — state saved, resume safe")
@@ -251,18 +264,27 @@ for i, clip in enumerate(clips):
             logger.error(f"❌ Clip failed: {e}")
             continue
 
-    for seg in segments:
-        all_segments.append({
-            "start": seg.start + start_offset_sec,
-            "end": seg.end + start_offset_sec,
-            "text": seg.text.strip()
-        })
+    records = [{
+        "start": seg.start + start_offset_sec,
+        "end": seg.end + start_offset_sec,
+        "text": seg.text.strip()
+    } for seg in segments]
+    all_segments.extend(records)
+
+    if partial is not None:
+        partial.add(records)
+        if i not in processed_before:
+            partial.progress(partial.done_audio + clip["duration_ms"] / 1000, partial.done_clips + 1)
+        partial.publish()
 
 logger.info(f"🧩 Collected {len(all_segments)} total segments")
+if partial is not None:
+    partial.close(complete=clips_done(state) == state["total_clips"])
+cache.report()
 
 
 # ================= FINAL MERGE =================
-if len(state["clips_processed"]) == state["total_clips"]:
+if clips_done(state) == state["total_clips"]:
     logger.info("🧵 All clips complete — merging transcript")
 
     all_segments.sort(key=lambda x: x["start"])
@@ -272,8 +294,7 @@ if len(state["clips_processed"]) == state["total_clips"]:
     with open(out_file, "w", encoding="utf-8") as f:
         f.write(final_text)
 
-    state["complete"] = True
-    save_state(state)
+    state = checkpoint.compact(STATE_FILE, complete=True)
 
     logger.info("=" * 90)
     logger.info("🇮🇳 PIPELINE COMPLETE SUCCESSFULLY")
@@ -295,5 +316,5 @@ if len(state["clips_processed"]) == state["total_clips"]:
         shutdown_pod_with_delay(SHUTDOWN_DELAY_SEC)
 
 else:
-    pending = state["total_clips"] - len(state["clips_processed"])
+    pending = state["total_clips"] - clips_done(state)
     logger.warning(f"⏳ {pending} clips remaining — resume anytime")
@@ -3,33 +3,51 @@
 Stage 1 — Silence-aware audio segmentation
 
 Outputs:
-- clips/*.wav
+- clips/*.wav                      (CLIP_MODE=wav, default)
+- clips/audio_16k.f32 + cut points (CLIP_MODE=array)
 - pipeline_state.json
+
+The input (INPUT_AUDIO, any ffmpeg-readable format) is first decoded once
+to clips/input_16k.wav (16 kHz mono, see ingest.py); segmentation and the
+clips work on that.
+
+SEGMENTER=vad cuts speech regions only (Silero VAD, see vad_segmenter.py)
+instead of -40 dBFS silence windows. PACK_CLIPS=1 packs the clips into
+30 s model windows (clip_packer.py).
 """
 
-from pydub import AudioSegment, silence
 from pathlib import Path
-import json
+import os
+import time
 import logging
 
+import checkpoint
+import metrics
+from clip_packer import PACK_CLIPS, pack_state
+from segmenter import (
+    CLIP_MODES, MAX_MS, SEGMENTER, SEGMENTERS, iter_clips, write_audio_array
+)
+from ingest import INGEST, INGEST_NAME, ingest, state_entry
+from vad_segmenter import plan_speech
+from wav_reader import MappedWav
+
 # ------------------------------------------------------------
 # PATH RESOLUTION (ROBUST)
 # ------------------------------------------------------------
 # src/01_segment_audio.py → project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-INPUT = PROJECT_ROOT / "audio" / "215.wav"
+INPUT = Path(os.environ.get("INPUT_AUDIO", str(PROJECT_ROOT / "audio" / "215.wav"))).resolve()
 OUT_DIR = PROJECT_ROOT / "clips"
 STATE = PROJECT_ROOT / "pipeline_state.json"
+AUDIO_ARRAY = OUT_DIR / "audio_16k.f32"
 
 # ------------------------------------------------------------
-# CONFIG
+# CONFIG (cut parameters: MAX_MS, MIN_CLIP_MS, ... in segmenter.py)
 # ------------------------------------------------------------
-MAX_MS = 30_000
-MIN_CLIP_MS = 12_000
-MIN_SILENCE = 600
-THRESH = -40
-KEEP_SILENCE_MS = 300
+# wav   → one clips/clip_NNN.wav per cut (decoded again by stage 2)
+# array → one 16 kHz float32 array + cut manifest, sliced in memory
+CLIP_MODE = os.environ.get("CLIP_MODE", "wav")
 
 # ------------------------------------------------------------
 # LOGGING
@@ -46,87 +64,119 @@ logger = logging.getLogger(__name__)
 if not INPUT.exists():
     raise FileNotFoundError(f"Input audio not found: {INPUT}")
 
+if CLIP_MODE not in CLIP_MODES:
+    raise ValueError(f"CLIP_MODE must be 'wav' or 'array', got: {CLIP_MODE}")
+
+if SEGMENTER not in SEGMENTERS:
+    raise ValueError(f"SEGMENTER must be 'energy' or 'vad', got: {SEGMENTER}")
+
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 logger.info(f"🎧 Using input audio → {INPUT}")
 logger.info(f"📁 Clips output dir → {OUT_DIR}")
 logger.info(f"📄 State file → {STATE}")
+logger.info(f"🧩 Clip mode → {CLIP_MODE}")
+logger.info(f"🧩 Segmenter → {SEGMENTER}")
 
 # ------------------------------------------------------------
-# LOAD AUDIO
+# INGEST — single decode to 16 kHz mono PCM (any input format)
 # ------------------------------------------------------------
-logger.info("🎧 Loading input audio")
-audio = AudioSegment.from_wav(INPUT)
+source = INPUT
+ingested = None
+
+if INGEST:
+    ingested = ingest(INPUT, OUT_DIR / INGEST_NAME)
+    source = ingested["path"]
+
+# ------------------------------------------------------------
+# OPEN AUDIO (memory-mapped, nothing loaded up front)
+# ------------------------------------------------------------
+logger.info("🎧 Mapping input audio")
+audio = MappedWav(source)
 total_ms = len(audio)
 
 logger.info(
     f"🎧 Audio duration: {total_ms/1000:.1f}s "
-    f"({total_ms/60000:.1f} min)"
+    f"({total_ms/60000:.1f} min) | "
+    f"{audio.frame_rate} Hz | {audio.channels} ch"
 )
 
-clips = []
-cursor = 0
-clip_idx = 0
+t_seg = time.time()
 
-logger.info("✂️ Starting silence-aware segmentation")
+# ------------------------------------------------------------
+# VAD MODE — speech regions from the 16 kHz decode
+# (array mode keeps the decode as the clip source)
+# ------------------------------------------------------------
+bounds = None
+n_samples = None
+segmentation = {"mode": "energy"}
+vad_array = AUDIO_ARRAY if CLIP_MODE == "array" else OUT_DIR / "vad_16k.f32"
+
+if SEGMENTER == "vad":
+    logger.info("🗣️ Detecting speech (Silero VAD)")
+    bounds, n_samples, segmentation = plan_speech(source, vad_array, MAX_MS)
+    if CLIP_MODE != "array":
+        vad_array.unlink()
+else:
+    logger.info("✂️ Starting silence-aware segmentation")
 
 # ------------------------------------------------------------
 # SEGMENT LOOP
+# Cuts come from a single pass over the energy envelope (or the VAD
+# regions); in wav mode each clip is written from the mapped buffer as
+# soon as its cut is known.
 # ------------------------------------------------------------
-while cursor < total_ms:
-    window = audio[cursor: cursor + MAX_MS]
-
-    sils = silence.detect_silence(
-        window,
-        min_silence_len=MIN_SILENCE,
-        silence_thresh=THRESH
-    )
+with metrics.span("segmentation", clip_mode=CLIP_MODE), metrics.profiled("segmentation"):
+    clips = list(iter_clips(audio, OUT_DIR, PROJECT_ROOT, CLIP_MODE, bounds=bounds))
+audio.close()
 
-    cut = None
-    if sils:
-        last_silence_start = sils[-1][0]
-        if last_silence_start >= MIN_CLIP_MS:
-            cut = last_silence_start
-
-    if cut:
-        clip = audio[cursor: cursor + cut + KEEP_SILENCE_MS]
-        advance = cut
-    else:
-        clip = window
-        advance = len(window)
-
-    fname = OUT_DIR / f"clip_{clip_idx:03d}.wav"
-    clip.export(fname, format="wav")
-
-    clips.append({
-        "file": str(fname.relative_to(PROJECT_ROOT)),
-        "start_ms": cursor,
-        "duration_ms": len(clip)
-    })
-
-    logger.info(
-        f"✂️ Clip {clip_idx+1:03d} | "
-        f"start={cursor/1000:.1f}s | "
-        f"dur={len(clip)/1000:.1f}s"
-    )
+# ------------------------------------------------------------
+# ARRAY MODE — single decode to 16 kHz mono float32
+# ------------------------------------------------------------
+audio_array = None
 
-    cursor += advance
-    clip_idx += 1
+if CLIP_MODE == "array":
+    with metrics.span("array_decode"):
+        audio_array = write_audio_array(
+            source, AUDIO_ARRAY, PROJECT_ROOT, clips, n_samples=n_samples
+        )
 
 # ------------------------------------------------------------
 # WRITE PIPELINE STATE
 # ------------------------------------------------------------
 state = {
-    "input_audio": str(INPUT.relative_to(PROJECT_ROOT)),
+    "input_audio": os.path.relpath(INPUT, PROJECT_ROOT),
     "total_duration_ms": total_ms,
     "total_clips": len(clips),
     "clips": clips,
-    "clips_processed": []
+    "clips_processed": [],
+    "segmentation": segmentation
 }
 
-STATE.write_text(json.dumps(state, indent=2), encoding="utf-8")
+if audio_array:
+    state["audio_array"] = audio_array
+
+if ingested:
+    state["ingest"] = state_entry(ingested, PROJECT_ROOT)
+
+# ------------------------------------------------------------
+# PACKING — clips → 30 s windows with an offset map
+# ------------------------------------------------------------
+if PACK_CLIPS:
+    pack_state(state)
+    metrics.gauge("window_fill_pct", state["packing"]["fill_pct"])
+
+# New clip list → stale checkpoint journal from an earlier run is dropped
+checkpoint.reset(STATE, state)
+
+metrics.gauge("audio_seconds", total_ms / 1000)
+metrics.gauge("clips", len(clips))
+metrics.gauge("rtf", round((time.time() - t_seg) / max(total_ms / 1000, 1e-9), 6))
+metrics.export("segment")
 
 logger.info("=" * 80)
 logger.info(f"✅ Segmentation complete — {len(clips)} clips created")
+if PACK_CLIPS:
+    logger.info(f"📦 Packed into {state['total_clips']} windows")
 logger.info(f"📄 State written → {STATE}")
 logger.info("=" * 80)
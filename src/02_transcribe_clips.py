@@ -1,19 +1,37 @@
 #!/usr/bin/env python3
 """
-Stage 2 — Transcribe audio clips with faster-whisper (GPU)
+Stage 2 — Transcribe audio clips with faster-whisper (GPU, or CPU replicas)
+
+Inputs (from stage 1 pipeline_state.json):
+- clips/*.wav, or
+- clips/audio_16k.f32 + per-clip sample ranges (array mode)
 
 Outputs:
-- outputs/raw_transcript.json
+- outputs/raw_transcript.jsonl   (raw_transcript.json with EXPORT_JSON=1)
+
+Modes:
+- BATCH_SIZE=0 (default) → one clip per model.transcribe() call
+- BATCH_SIZE=N           → N clips per batched forward pass
+                           (faster-whisper BatchedInferencePipeline)
+- SHARDS=N               → N worker processes, one model each, pulling
+                           clips from a shared queue (see sharded.py);
+                           with WHISPER_DEVICE=cpu these are CPU replicas
+- CASCADE=1              → draft model on every clip, WHISPER_MODEL only
+                           on low-confidence spans (see cascade.py)
+
+Device, compute type and SHARDS default to config/backend.env when set
+(python src/calibrate_backend.py measures and writes it).
 """
 
 import os
-import json
-import math
-import pickle
-import time
 import logging
 from pathlib import Path
-from faster_whisper import WhisperModel
+
+import metrics
+import whisper_backend
+from cascade import CASCADE, Cascade
+from sharded import SHARD_DEVICES, run_sharded
+from transcriber import TranscriptionJob
 
 # ------------------------------------------------------------
 # PATH RESOLUTION (ROBUST)
@@ -26,6 +44,12 @@ STATE_FILE = PROJECT_ROOT / "pipeline_state.json"
 
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "0"))
+SHARDS = int(whisper_backend.setting("SHARDS", "1"))  # env or config/backend.env
+
 # ------------------------------------------------------------
 # LOGGING
 # ------------------------------------------------------------
@@ -36,151 +60,69 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def fmt(sec: float) -> str:
-    return f"{sec:.1f}s"
-
-
-def compute_confidence(avg_logprob, no_speech_prob):
-    """
-    Deterministic confidence score ∈ [0,1]
-    """
-    try:
-        return max(
-            0.0,
-            min(1.0, math.exp(avg_logprob) * (1.0 - no_speech_prob))
+def main():
+    # --------------------------------------------------------
+    # VALIDATION
+    # --------------------------------------------------------
+    if not STATE_FILE.exists():
+        raise FileNotFoundError(f"pipeline_state.json not found: {STATE_FILE}")
+
+    logger.info(f"📄 State file  → {STATE_FILE}")
+    logger.info(f"📁 Output dir → {OUTPUT_DIR}")
+
+    # --------------------------------------------------------
+    # SHARDED (N processes, one model each)
+    # --------------------------------------------------------
+    if SHARDS > 1:
+        logger.info("=" * 80)
+        logger.info(
+            f"🔀 Sharded mode → {SHARDS} workers on "
+            + ("CPU" if whisper_backend.DEVICE == "cpu" else f"devices {SHARD_DEVICES}")
         )
-    except Exception:
-        return 0.0
-
-
-# ------------------------------------------------------------
-# VALIDATION
-# ------------------------------------------------------------
-if not STATE_FILE.exists():
-    raise FileNotFoundError(f"pipeline_state.json not found: {STATE_FILE}")
-
-logger.info(f"📄 State file  → {STATE_FILE}")
-logger.info(f"📁 Output dir → {OUTPUT_DIR}")
-
-# ------------------------------------------------------------
-# LOAD MODEL
-# ------------------------------------------------------------
-logger.info("=" * 80)
-logger.info("🧠 Loading faster-whisper large-v3 (GPU, FP16)")
-t0 = time.time()
-
-model = WhisperModel(
-    "large-v3",
-    device="cuda",
-    compute_type="float16"
-)
-
-logger.info(f"🧠 Model loaded in {fmt(time.time() - t0)}")
-logger.info("=" * 80)
-
-# ------------------------------------------------------------
-# LOAD STATE
-# ------------------------------------------------------------
-with STATE_FILE.open() as f:
-    state = json.load(f)
-
-clips = state["clips"]
-processed = set(state.get("clips_processed", []))
-
-logger.info(f"📁 Total clips      : {len(clips)}")
-logger.info(f"⚡ Already processed: {len(processed)}")
-
-all_segments = []
-
-# ------------------------------------------------------------
-# TRANSCRIPTION LOOP
-# ------------------------------------------------------------
-logger.info("🎙️ Starting transcription loop")
-overall_start = time.time()
-
-for idx, clip in enumerate(clips):
-    if idx in processed:
-        logger.info(f"⏭️  Skipping clip {idx+1}/{len(clips)} (cached)")
-        continue
-
-    clip_path = PROJECT_ROOT / clip["file"]
-    start_offset = clip["start_ms"] / 1000
-    cache_file = clip_path.with_suffix(clip_path.suffix + ".cache.pkl")
-
-    logger.info("-" * 80)
-    logger.info(
-        f"▶ Clip {idx+1}/{len(clips)} | "
-        f"{clip_path.name} | "
-        f"start={start_offset:.1f}s | "
-        f"dur={clip['duration_ms']/1000:.1f}s"
-    )
-
-    t_clip = time.time()
-    logger.info("   🧠 GPU inference started")
-
-    segments, info = model.transcribe(
-        str(clip_path),
-        language="hi",
-        beam_size=5
-    )
-
-    segments = list(segments)
-
-    logger.info(
-        f"   ✅ Inference done in {fmt(time.time() - t_clip)} | "
-        f"segments={len(segments)} | "
-        f"language={info.language}"
-    )
-
-    # Cache raw segments
-    with cache_file.open("wb") as f:
-        pickle.dump(segments, f)
-    logger.info("   💾 Cached raw segments")
-
-    for seg in segments:
-        conf = compute_confidence(
-            seg.avg_logprob,
-            seg.no_speech_prob
+        logger.info("=" * 80)
+        run_sharded(
+            PROJECT_ROOT, STATE_FILE, OUTPUT_DIR,
+            workers=SHARDS, batch_size=BATCH_SIZE, use_cascade=CASCADE
         )
-
-        all_segments.append({
-            "start": round(seg.start + start_offset, 3),
-            "end": round(seg.end + start_offset, 3),
-            "text": seg.text.strip(),
-            "confidence": round(conf, 4)
-        })
-
-    processed.add(idx)
-    state["clips_processed"] = sorted(processed)
-
-    with STATE_FILE.open("w") as f:
-        json.dump(state, f, indent=2)
-
-    logger.info(
-        f"   📊 Progress: {len(processed)}/{len(clips)} clips done"
-    )
-
-# ------------------------------------------------------------
-# FINAL OUTPUT
-# ------------------------------------------------------------
-logger.info("=" * 80)
-logger.info("🧩 Transcription loop complete")
-logger.info(f"⏱️ Total time: {fmt(time.time() - overall_start)}")
-
-avg_conf = round(
-    sum(s["confidence"] for s in all_segments) / max(len(all_segments), 1),
-    4
-)
-
-raw_output = {
-    "avg_confidence": avg_conf,
-    "segments": all_segments
-}
-
-out_path = OUTPUT_DIR / "raw_transcript.json"
-with out_path.open("w", encoding="utf-8") as f:
-    json.dump(raw_output, f, ensure_ascii=False, indent=2)
-
-logger.info(f"📄 Saved: {out_path}")
-logger.info(f"📊 Avg confidence: {avg_conf}")
-logger.info("=" * 80)
+        metrics.export("transcribe")
+        logger.info("=" * 80)
+        return
+
+    # --------------------------------------------------------
+    # LOAD MODEL
+    # --------------------------------------------------------
+    logger.info("=" * 80)
+    cascade = None
+    if CASCADE:
+        cascade = Cascade.load()
+        model = cascade.large
+        logger.info(
+            f"🪜 Cascade → {cascade.draft_name} (beam {cascade.draft_beam}) first, "
+            f"{whisper_backend.MODEL_NAME} below confidence {cascade.threshold}"
+        )
+    else:
+        model = whisper_backend.load_model()
+
+    if BATCH_SIZE > 0 and not CASCADE:
+        logger.info(f"📦 Batched inference → batch_size={BATCH_SIZE}")
+    logger.info("=" * 80)
+
+    # --------------------------------------------------------
+    # TRANSCRIPTION
+    # --------------------------------------------------------
+    TranscriptionJob(
+        model,
+        root=PROJECT_ROOT,
+        state_file=STATE_FILE,
+        output_dir=OUTPUT_DIR,
+        batch_size=BATCH_SIZE,
+        cascade=cascade
+    ).run()
+
+    metrics.export("transcribe")
+    logger.info("=" * 80)
+
+
+# Guarded: sharded workers are spawned processes that re-import this file
+if __name__ == "__main__":
+    main()
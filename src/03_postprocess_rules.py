@@ -3,30 +3,37 @@
 Stage 3 — Rule-based post-processing with detailed logs
 
 Outputs:
-- outputs/refined_transcript.json
-- outputs/raw_vs_refined.diff.txt
+- outputs/refined_transcript.jsonl   (refined_transcript.json with EXPORT_JSON=1)
+- outputs/refined_changes.jsonl    (one record per replacement)
+- outputs/raw_vs_refined.diff.txt  (only with RENDER_DIFF=1)
 """
 
-import json
-import difflib
+import os
 import logging
-import time
-from collections import Counter
 from pathlib import Path
 
+import metrics
+from postprocess import postprocess
+
 # ------------------------------------------------------------
 # PATH RESOLUTION (ROBUST)
 # src/03_postprocess_rules.py → project root
 # ------------------------------------------------------------
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-INPUT_FILE = PROJECT_ROOT / "outputs" / "raw_transcript.json"
-OUTPUT_REFINED = PROJECT_ROOT / "outputs" / "refined_transcript.json"
+INPUT_FILE = PROJECT_ROOT / "outputs" / "raw_transcript.jsonl"
+OUTPUT_REFINED = PROJECT_ROOT / "outputs" / "refined_transcript.jsonl"
+OUTPUT_CHANGES = PROJECT_ROOT / "outputs" / "refined_changes.jsonl"
 OUTPUT_DIFF = PROJECT_ROOT / "outputs" / "raw_vs_refined.diff.txt"
 
 # Ensure outputs directory exists
 OUTPUT_REFINED.parent.mkdir(parents=True, exist_ok=True)
 
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+RENDER_DIFF = os.environ.get("RENDER_DIFF", "0") == "1"
+
 # ------------------------------------------------------------
 # LOGGING
 # ------------------------------------------------------------
@@ -37,131 +44,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------
-# RULES (extend safely here)
-# ------------------------------------------------------------
-REPLACEMENTS = {
-    "कारिक्रियम": "कार्यक्रम",
-    "दर्पन": "दर्पण",
-    "कशायक": "कषायक",
-    "जैप": "जय",
-    "बीगमगंच": "बीगमगंज",
-    "सहारनपूर": "सहारनपुर",
-}
-
-# ------------------------------------------------------------
-# HELPERS
-# ------------------------------------------------------------
-def apply_rules(text: str, stats: Counter) -> str:
-    for wrong, right in REPLACEMENTS.items():
-        if wrong in text:
-            count = text.count(wrong)
-            stats[wrong] += count
-            text = text.replace(wrong, right)
-    return text
-
-
-# ------------------------------------------------------------
-# START
-# ------------------------------------------------------------
-start_time = time.time()
-
-logger.info("=" * 80)
-logger.info("🧹 RULE-BASED POST-PROCESSING STARTED")
-logger.info(f"📄 Input  : {INPUT_FILE}")
-logger.info(f"📄 Output : {OUTPUT_REFINED}")
-logger.info("=" * 80)
-
-# ------------------------------------------------------------
-# VALIDATION
-# ------------------------------------------------------------
-if not INPUT_FILE.exists():
-    raise FileNotFoundError(f"Raw transcript not found: {INPUT_FILE}")
-
-# ------------------------------------------------------------
-# LOAD RAW TRANSCRIPT
-# ------------------------------------------------------------
-logger.info("📂 Loading raw transcript...")
-
-with INPUT_FILE.open(encoding="utf-8") as f:
-    raw = json.load(f)
-
-segments = raw["segments"]
-raw_lines = [s["text"] for s in segments]
-
-logger.info(f"🧩 Segments loaded: {len(raw_lines)}")
-logger.info(f"📊 Avg confidence : {raw.get('avg_confidence')}")
-
-# ------------------------------------------------------------
-# APPLY RULES
-# ------------------------------------------------------------
-logger.info("🔧 Applying normalization rules...")
-
-rule_stats = Counter()
-refined_lines = []
-
-for i, line in enumerate(raw_lines, start=1):
-    refined = apply_rules(line, rule_stats)
-    refined_lines.append(refined)
-
-    if refined != line:
-        logger.debug(f"✏️ Line {i} changed")
-
-refined_text = " ".join(refined_lines)
-
-logger.info("✅ Rule application complete")
-
-if rule_stats:
-    logger.info("📈 Rule hit counts:")
-    for rule, count in rule_stats.items():
-        logger.info(f"   '{rule}' → {count} replacements")
-else:
-    logger.info("ℹ️ No rule replacements applied")
-
-# ------------------------------------------------------------
-# DIFF GENERATION
+# RUN (rules: config/rules/*.tsv|json, see rule_engine.py)
 # ------------------------------------------------------------
-logger.info("📐 Generating raw vs refined diff...")
-
-diff = list(
-    difflib.unified_diff(
-        raw_lines,
-        refined_lines,
-        fromfile="raw",
-        tofile="refined",
-        lineterm=""
-    )
+postprocess(
+    INPUT_FILE, OUTPUT_REFINED, OUTPUT_CHANGES,
+    output_diff=OUTPUT_DIFF if RENDER_DIFF else None
 )
-
-with OUTPUT_DIFF.open("w", encoding="utf-8") as f:
-    f.write("\n".join(diff))
-
-logger.info(
-    f"📄 Diff saved → {OUTPUT_DIFF} "
-    f"({len(diff)} diff lines)"
-)
-
-# ------------------------------------------------------------
-# SAVE REFINED OUTPUT
-# ------------------------------------------------------------
-logger.info("💾 Saving refined transcript...")
-
-refined_out = {
-    "avg_confidence": raw["avg_confidence"],
-    "text": refined_text,
-    "segments": segments,
-}
-
-with OUTPUT_REFINED.open("w", encoding="utf-8") as f:
-    json.dump(refined_out, f, ensure_ascii=False, indent=2)
-
-# ------------------------------------------------------------
-# DONE
-# ------------------------------------------------------------
-elapsed = time.time() - start_time
-
-logger.info("=" * 80)
-logger.info("✅ POST-PROCESSING COMPLETE")
-logger.info(f"⏱️ Time taken : {elapsed:.2f}s")
-logger.info(f"📄 Refined    : {OUTPUT_REFINED}")
-logger.info(f"📄 Diff       : {OUTPUT_DIFF}")
-logger.info("=" * 80)
+metrics.export("postprocess")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Stage 4 — Index refined transcripts for time-aligned search
+
+Inputs:
+- outputs/refined_transcript.jsonl (stage 3)
+- jobs/*/outputs/refined_transcript.jsonl (worker jobs)
+- INDEX_SOURCES=dir1:dir2   more directories / files to index
+  (also refined_transcript.json from earlier runs)
+
+Output:
+- cache/transcript_index.db   (TRANSCRIPT_INDEX to override)
+
+Only new or changed transcripts are read; entries whose file is gone are
+dropped. Query with:
+
+    python src/transcript_index.py search "सहारनपुर कार्यक्रम"
+"""
+
+import os
+import logging
+from pathlib import Path
+
+import metrics
+from transcript_index import TranscriptIndex
+
+# ------------------------------------------------------------
+# PATH RESOLUTION (ROBUST)
+# src/04_index_transcripts.py → project root
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+SOURCES = [PROJECT_ROOT / "outputs", PROJECT_ROOT / "jobs"] + [
+    Path(p) for p in os.environ.get("INDEX_SOURCES", "").split(os.pathsep) if p
+]
+
+# ------------------------------------------------------------
+# LOGGING
+# ------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# RUN
+# ------------------------------------------------------------
+logger.info("=" * 80)
+logger.info("🗂️ TRANSCRIPT INDEXING STARTED")
+logger.info(f"📁 Sources: {', '.join(str(s) for s in SOURCES)}")
+logger.info("=" * 80)
+
+index = TranscriptIndex()
+with metrics.span("index_update"):
+    stats = index.update(SOURCES, prune=True)
+
+logger.info(
+    f"✅ {stats['indexed']} indexed, {stats['unchanged']} unchanged, {stats['pruned']} pruned "
+    f"of {stats['files']} transcripts in {stats['elapsed_sec']:.2f}s"
+)
+summary = index.report()
+metrics.gauge("index_total_files", summary["files"])
+metrics.gauge("index_total_audio_hours", summary["audio_hours"])
+metrics.export("index")
+logger.info("=" * 80)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Incremental transcript assembly
+
+Builds outputs/raw_transcript.jsonl from every processed clip, not only
+the clips decoded in the current run. Clips are written in clip order as
+soon as the ordered prefix is available: clips of the current run are
+handed in as they finish, every other processed clip is read from the
+transcript cache via the cache key recorded in its checkpoint. Only
+clips that finish out of order are held in memory. Confidence (footer
+avg_confidence) is averaged over the segments of all clips.
+
+With publish_partial=True the ordered prefix is also republished after
+every clip as outputs/partial_transcript.{txt,srt,vtt} with a progress /
+ETA header (see partial_transcript.py).
+
+Without a model (e.g. after a resumed run, or on a laptop with the
+pod's cache/ and pipeline_state.json):
+
+    python src/assemble_transcript.py [pipeline_state.json] [raw_transcript.jsonl]
+
+EXPORT_JSON=1 also writes raw_transcript.json next to it.
+"""
+
+import os
+import sys
+import time
+import logging
+from pathlib import Path
+
+import checkpoint
+import whisper_backend
+from partial_transcript import PartialTranscript
+from transcript_cache import TranscriptCache
+from transcript_io import TranscriptWriter, export_raw_json
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JSON = os.environ.get("EXPORT_JSON", "0") == "1"
+
+
+class IncrementalAssembler:
+    """
+    add(idx, records) for clips transcribed now; every other processed
+    clip comes from `cached` (records read up front) or else the cache
+    when the write position reaches it.
+    """
+
+    def __init__(self, state_file: Path, out_path: Path, cache: TranscriptCache,
+                 pending=(), cached=None, publish_partial: bool = False):
+        self.state = checkpoint.load_state(state_file)
+        self.clips = self.state["clips"]
+        self.keys = self.state.get("cache_keys", {})
+        self.processed = set(self.state["clips_processed"])
+        self.cache = cache
+        self.pending = set(pending)
+        self.cached = dict(cached or {})
+
+        self.out_path = Path(out_path)
+        self.writer = TranscriptWriter(self.out_path, clips=len(self.clips))
+        self.t0 = time.time()
+
+        self.ready = {}
+        self.next = 0
+        self.assembled = 0
+        self.from_cache = 0
+        self.missing = []
+
+        self.partial = None
+        if publish_partial:
+            done = self.processed - self.pending
+            self.partial = PartialTranscript(
+                self.out_path.parent,
+                total_audio_sec=sum(self._clip_sec(i) for i in range(len(self.clips))),
+                total_clips=len(self.clips),
+                done_audio_sec=sum(self._clip_sec(i) for i in done),
+                done_clips=len(done),
+            )
+
+        # earlier runs' clips up to the first pending one, before this
+        # run's cache puts can evict them
+        self._flush()
+        if self.partial is not None:
+            self.partial.publish(force=True)
+
+    def _clip_sec(self, idx) -> float:
+        return self.clips[idx]["duration_ms"] / 1000
+
+    def _cached_records(self, idx):
+        if idx in self.cached:
+            return self.cached.pop(idx)
+        key = self.keys.get(str(idx))
+        segments = self.cache.get(key) if key and idx in self.processed else None
+        if segments is None:
+            return None
+        return whisper_backend.clip_records(segments, self.clips[idx])
+
+    def _flush(self):
+        while self.next < len(self.clips):
+            idx = self.next
+            if idx in self.ready:
+                records = self.ready.pop(idx)
+            elif idx in self.pending:
+                return
+            else:
+                records = self._cached_records(idx)
+                if records is None:
+                    if idx in self.processed:
+                        self.missing.append(idx)
+                    self.next += 1
+                    continue
+                self.from_cache += 1
+
+            self.writer.write(records)
+            if self.partial is not None:
+                self.partial.add(records)
+            self.assembled += 1
+            self.next += 1
+
+    def add(self, idx: int, records: list):
+        self.ready[idx] = records
+        self.pending.discard(idx)
+        self.processed.add(idx)
+        self._flush()
+
+        if self.partial is not None:
+            self.partial.progress(
+                self.partial.done_audio + self._clip_sec(idx), self.partial.done_clips + 1
+            )
+            self.partial.publish()
+
+    def follow(self, state: dict):
+        """
+        Add pending clips that other processes (sharded workers) have
+        journaled since, from the transcript cache.
+        """
+        self.keys.update(state.get("cache_keys", {}))
+        done = set(state["clips_processed"])
+        self.processed |= done
+        for idx in sorted(self.pending & done):
+            records = self._cached_records(idx)
+            if records is not None:
+                self.add(idx, records)
+
+    def abort(self):
+        """
+        Failed run: drop the incomplete .jsonl, keep the partial transcript.
+        """
+        self.writer.abort()
+        if self.partial is not None:
+            self.partial.close(complete=False)
+
+    def finish(self) -> dict:
+        # pending clips that never arrived (failed run) → skipped
+        self.pending.clear()
+        self._flush()
+
+        footer = self.writer.close(clips=len(self.clips), clips_assembled=self.assembled)
+        total = len(self.clips)
+        if self.partial is not None:
+            self.partial.close(complete=self.assembled == total)
+
+        logger.info(
+            f"🧵 Assembled {self.assembled}/{total} clips "
+            f"({self.from_cache} from cache) → {footer['segments']} segments "
+            f"in {time.time() - self.t0:.2f}s"
+        )
+        if self.missing:
+            logger.warning(
+                f"⚠️ {len(self.missing)} processed clips not in transcript cache "
+                f"(first: {self.missing[:5]}) — rerun stage 2 to transcribe them"
+            )
+        if self.assembled < total:
+            logger.warning(f"⏳ Transcript incomplete: {total - self.assembled} clips missing")
+
+        logger.info(f"📄 Saved: {self.out_path}")
+        if EXPORT_JSON:
+            json_path = self.out_path.with_suffix(".json")
+            export_raw_json(self.out_path, json_path)
+            logger.info(f"📄 Exported: {json_path}")
+        logger.info(f"📊 Avg confidence: {footer['avg_confidence']}")
+
+        return {
+            "clips": total,
+            "clips_assembled": self.assembled,
+            "clips_from_cache": self.from_cache,
+            "clips_missing": self.missing,
+            "segments": footer["segments"],
+            "avg_confidence": footer["avg_confidence"],
+            "output": str(self.out_path),
+        }
+
+
+def assemble(state_file: Path, out_path: Path, cache: TranscriptCache,
+             records: dict = None) -> dict:
+    """
+    One-shot assembly; `records` (clip index → records) for clips that
+    are not (or not yet) in the cache.
+    """
+    records = records or {}
+    assembler = IncrementalAssembler(state_file, out_path, cache, pending=records)
+    for idx in sorted(records):
+        assembler.add(idx, records[idx])
+    return assembler.finish()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    project_root = Path(__file__).resolve().parent.parent
+    state_file = Path(sys.argv[1]) if len(sys.argv) > 1 else project_root / "pipeline_state.json"
+    out_path = Path(sys.argv[2]) if len(sys.argv) > 2 else \
+        project_root / "outputs" / "raw_transcript.jsonl"
+
+    if not state_file.exists():
+        raise FileNotFoundError(f"pipeline_state.json not found: {state_file}")
+
+    cache = TranscriptCache()
+    summary = assemble(state_file, out_path, cache)
+    cache.report()
+
+    if summary["clips_assembled"] < summary["clips"]:
+        sys.exit(1)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+16 kHz float32 audio store + clip prefetcher
+
+Array mode skips the clips/*.wav round-trip: the input is decoded ONCE to
+16 kHz mono float32 (exactly what faster-whisper decodes every clip to),
+stored as a raw array on disk, and stage 2 hands zero-copy slices of the
+memory-mapped array to WhisperModel.transcribe().
+
+ClipPrefetcher loads the next clip (page-in of the array slice, or a WAV
+decode in file mode) on a background thread while the current clip is on
+the GPU.
+"""
+
+import queue
+import threading
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16_000
+DTYPE = "<f4"
+
+# Samples touched per page when prefetching a mapped slice (4 KiB / 4 B)
+PAGE_SAMPLES = 1024
+
+# Samples converted per write when the input is already 16 kHz mono PCM
+PCM_BLOCK = 60 * SAMPLE_RATE
+
+
+# ------------------------------------------------------------
+# 16 kHz MONO PCM WAV (ingest output, clips cut from it)
+# ------------------------------------------------------------
+def _open_pcm16k(path):
+    """
+    MappedWav of `path` if it is a 16 kHz mono 16-bit PCM WAV, else None.
+    """
+    from wav_reader import MappedWav
+
+    try:
+        wav = MappedWav(path)
+    except (ValueError, OSError):
+        return None
+    if (wav.frame_rate, wav.channels, wav.sample_width) != (SAMPLE_RATE, 1, 2):
+        wav.close()
+        return None
+    return wav
+
+
+def is_pcm16k(path) -> bool:
+    wav = _open_pcm16k(path)
+    if wav is None:
+        return False
+    wav.close()
+    return True
+
+
+def load_audio(path) -> np.ndarray:
+    """
+    16 kHz mono float32 samples of a clip. A 16 kHz mono PCM WAV is read
+    directly (no decoder, no resampler); anything else goes through
+    faster_whisper.decode_audio. Both give the same samples.
+    """
+    wav = _open_pcm16k(path)
+    if wav is None:
+        from faster_whisper import decode_audio
+
+        return decode_audio(str(path))
+
+    with wav:
+        return wav._frames[:, 0].astype(np.float32) / 32768.0
+
+
+# ------------------------------------------------------------
+# WRITE
+# ------------------------------------------------------------
+def decode_to_array(input_path, out_path) -> int:
+    """
+    Stream-decode any PyAV/ffmpeg-readable input to a raw 16 kHz mono
+    float32 file. Same resampler settings as faster_whisper.decode_audio,
+    so samples match what transcribe(path) would see. A 16 kHz mono PCM
+    WAV (the ingest output) is converted straight from the map instead.
+
+    Returns the number of samples written.
+    """
+    pcm = _open_pcm16k(input_path)
+    if pcm is not None:
+        written = 0
+        with pcm, Path(out_path).open("wb") as f:
+            for start in range(0, pcm.frame_count, PCM_BLOCK):
+                block = pcm._frames[start:start + PCM_BLOCK, 0]
+                f.write((block.astype(np.float32) / 32768.0).astype(DTYPE).tobytes())
+                written += len(block)
+        return written
+
+    import av
+
+    resampler = av.audio.resampler.AudioResampler(
+        format="s16", layout="mono", rate=SAMPLE_RATE
+    )
+    written = 0
+
+    def _write(frames, f):
+        nonlocal written
+        for frame in frames:
+            pcm = frame.to_ndarray().reshape(-1)
+            f.write((pcm.astype(np.float32) / 32768.0).astype(DTYPE).tobytes())
+            written += len(pcm)
+
+    with av.open(str(input_path), mode="r", metadata_errors="ignore") as container, \
+            Path(out_path).open("wb") as f:
+        for frame in container.decode(audio=0):
+            _write(resampler.resample(frame), f)
+        _write(resampler.resample(None), f)
+
+    return written
+
+
+# ------------------------------------------------------------
+# READ
+# ------------------------------------------------------------
+def open_array(path) -> np.ndarray:
+    """
+    Read-only memory map of a raw 16 kHz float32 array.
+    """
+    return np.memmap(path, dtype=DTYPE, mode="r")
+
+
+def ms_to_sample(ms: int) -> int:
+    return int(ms) * SAMPLE_RATE // 1000
+
+
+def array_slice(samples: np.ndarray, start: int, end: int) -> np.ndarray:
+    """
+    Zero-copy view of [start, end) with its pages faulted in.
+    """
+    view = samples[start:end]
+    view[::PAGE_SAMPLES].sum()
+    return view
+
+
+# ------------------------------------------------------------
+# PREFETCH
+# ------------------------------------------------------------
+class ClipPrefetcher:
+    """
+    Iterates (idx, clip, audio) with `loader(clip)` running ahead on a
+    background thread. `depth` bounds how many loaded clips wait in memory.
+    A loader error is re-raised in the consuming thread.
+    """
+
+    _DONE = object()
+
+    def __init__(self, items, loader, depth: int = 1):
+        self._items = items
+        self._loader = loader
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for idx, clip in self._items:
+                if self._stop.is_set():
+                    return
+                try:
+                    item = (idx, clip, self._loader(clip), None)
+                except Exception as e:
+                    item = (idx, clip, None, e)
+                self._queue.put(item)
+        finally:
+            self._queue.put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            idx, clip, audio, error = item
+            if error is not None:
+                raise error
+            yield idx, clip, audio
+
+    def close(self):
+        self._stop.set()
+        # unblock a producer waiting on a full queue
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                self._thread.join(timeout=0.1)
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Parallel output bundler (replaces single-threaded tar -czf / tarfile "w:gz")
+
+Writes a standard .tar.gz that `tar -xzf`, `gzip -d` and tarfile read:
+the tar stream is compressed as a series of independent gzip members
+(one or more per file, BUNDLE_BLOCK_MB each), deflated on BUNDLE_THREADS
+threads (zlib releases the GIL) and written in order.
+
+Because every file owns its members, a manifest next to the archive
+(<archive>.manifest.json: size, mtime and compressed byte range per file)
+lets a rerun copy the compressed bytes of unchanged files from the
+previous archive instead of compressing them again. With --incremental
+only files new / changed since that full bundle go into a delta of their
+own, outputs.<time>.delta.tar.gz (+ .manifest.json), to extract over the
+full archive. Deltas never replace the archive, each other or its
+manifest, so the latest delta alone brings the full archive up to date.
+
+    python src/bundler.py outputs.tar.gz outputs [more paths] [--base .]
+    python src/bundler.py outputs.tar.gz outputs --incremental
+    python src/bundler.py outputs.tar.gz outputs --compare   # vs tarfile "w:gz"
+"""
+
+import os
+import json
+import time
+import zlib
+import tarfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+BUNDLE_THREADS = int(os.environ.get("BUNDLE_THREADS", str(os.cpu_count() or 1)))
+BUNDLE_LEVEL = int(os.environ.get("BUNDLE_LEVEL", "6"))   # gzip -6, as tar -czf
+BLOCK_SIZE = int(float(os.environ.get("BUNDLE_BLOCK_MB", "1")) * 1024 * 1024)
+
+RECORD = tarfile.RECORDSIZE   # tar end-of-archive padding
+
+
+def gzip_member(data: bytes, level: int) -> bytes:
+    c = zlib.compressobj(level, zlib.DEFLATED, 31)   # wbits 31 → gzip header
+    return c.compress(data) + c.flush()
+
+
+# ------------------------------------------------------------
+# FILE LIST
+# ------------------------------------------------------------
+def collect(sources, base: Path, skip=()) -> list:
+    """
+    [(arcname, path, stat)] of the regular files under `sources`, sorted,
+    arcnames relative to `base` (like tar -C base).
+    """
+    skip = {Path(s).resolve() for s in skip}
+    files = []
+    for src in sources:
+        src = Path(src)
+        paths = [src] if src.is_file() else sorted(p for p in src.rglob("*") if p.is_file())
+        for p in paths:
+            if p.resolve() in skip:
+                continue
+            files.append((os.path.relpath(p, base).replace(os.sep, "/"), p, p.stat()))
+    return sorted(files, key=lambda f: f[0])
+
+
+def _tar_header(arcname: str, st) -> bytes:
+    info = tarfile.TarInfo(arcname)
+    info.size = st.st_size
+    info.mtime = int(st.st_mtime)
+    info.mode = st.st_mode & 0o7777
+    return info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+
+
+def _blocks(arcname: str, path: Path, st, block_size: int):
+    """
+    The file's tar entry (header + data + padding) in blocks. Exactly
+    st_size bytes are read, as tarfile does: a file that grew since the
+    stat (a live log) is cut at that size, one that shrank is zero-filled,
+    so the entry always matches its header.
+    """
+    pad = -st.st_size % tarfile.BLOCKSIZE
+    remaining, short = st.st_size, False
+    with open(path, "rb") as f:
+        data = _tar_header(arcname, st)
+        while remaining:
+            n = min(block_size, remaining)
+            chunk = f.read(n)
+            if len(chunk) < n:
+                if not short:
+                    logger.warning(f"⚠️ {arcname} shrank while bundling — zero-filled to {st.st_size} bytes")
+                short = True
+                chunk += b"\0" * (n - len(chunk))
+            remaining -= n
+            data += chunk
+            if remaining:
+                yield data
+                data = b""
+    yield data + b"\0" * pad
+
+
+def _with_last(items):
+    items = iter(items)
+    prev = next(items)
+    for item in items:
+        yield prev, False
+        prev = item
+    yield prev, True
+
+
+# ------------------------------------------------------------
+# BUNDLE
+# ------------------------------------------------------------
+def _stem(archive: Path) -> str:
+    return archive.name[:-len(".tar.gz")] if archive.name.endswith(".tar.gz") else archive.stem
+
+
+def delta_path(archive: Path) -> Path:
+    """
+    outputs.tar.gz → outputs.<time>.delta.tar.gz, never an existing file.
+    """
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    path = archive.with_name(f"{_stem(archive)}.{stamp}.delta.tar.gz")
+    n = 1
+    while path.exists():
+        path = archive.with_name(f"{_stem(archive)}.{stamp}_{n}.delta.tar.gz")
+        n += 1
+    return path
+
+
+def bundle(archive, sources, base=".", incremental: bool = False,
+           threads: int = BUNDLE_THREADS, level: int = BUNDLE_LEVEL,
+           block_size: int = BLOCK_SIZE) -> dict:
+    """
+    Write `archive` (.tar.gz) from `sources`, or with incremental=True a
+    delta next to it (delta_path), and return a report: files / bytes in,
+    bytes compressed vs reused, compression throughput.
+    """
+    archive = Path(archive)
+    full_manifest = archive.with_name(archive.name + ".manifest.json")
+    out_path = delta_path(archive) if incremental else archive
+    manifest_path = out_path.with_name(out_path.name + ".manifest.json")
+    base = Path(base)
+    t0 = time.time()
+
+    # the full bundle's manifest is the baseline of both reuse and deltas
+    previous = {}
+    if full_manifest.is_file():
+        previous = json.loads(full_manifest.read_text(encoding="utf-8"))
+    elif incremental:
+        logger.warning(f"⚠️ No {full_manifest.name} — the delta holds every file")
+    prev_files = previous.get("files", {})
+    can_reuse = (
+        not incremental
+        and previous.get("level") == level
+        and archive.is_file()
+        and archive.stat().st_size == previous.get("archive_size")
+    )
+
+    deltas = archive.parent.glob(f"{_stem(archive)}.*.delta.tar.gz*")
+    files = collect(sources, base, skip=[archive, full_manifest, out_path, manifest_path, *deltas])
+    entries = {}
+    stats = {"files": len(files), "bytes_in": 0, "compressed_files": 0, "compressed_bytes_in": 0,
+             "reused_files": 0, "reused_bytes": 0, "skipped_files": 0}
+
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    prev_fh = open(archive, "rb") if can_reuse else None
+    pool = ThreadPoolExecutor(max_workers=max(threads, 1))
+    max_inflight = 2 * max(threads, 1)
+
+    try:
+        with open(tmp, "wb") as out:
+            # (future or bytes, arcname, first member, last member), in output
+            # order; files are not waited for one by one, so small files
+            # compress in parallel too
+            pending = []
+
+            def drain(limit):
+                while len(pending) > limit:
+                    data, arcname, first, last = pending.pop(0)
+                    if first:
+                        entries[arcname]["offset"] = out.tell()
+                    out.write(data if isinstance(data, bytes) else data.result())
+                    if last:
+                        entries[arcname]["length"] = out.tell() - entries[arcname]["offset"]
+
+            for arcname, path, st in files:
+                stats["bytes_in"] += st.st_size
+                entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o7777,
+                         "offset": None, "length": None}
+                entries[arcname] = entry
+                old = prev_files.get(arcname)
+                unchanged = old and old["size"] == entry["size"] and old["mtime_ns"] == entry["mtime_ns"]
+
+                if incremental and unchanged:
+                    stats["skipped_files"] += 1
+                    continue
+
+                if can_reuse and unchanged and old.get("offset") is not None:
+                    prev_fh.seek(old["offset"])
+                    pieces = range(0, old["length"], block_size)
+                    for piece, last in _with_last(pieces):
+                        data = prev_fh.read(min(block_size, old["length"] - piece))
+                        pending.append((data, arcname, piece == 0, last))
+                        drain(max_inflight)
+                    stats["reused_files"] += 1
+                    stats["reused_bytes"] += old["length"]
+                else:
+                    first = True
+                    for block, last in _with_last(_blocks(arcname, path, st, block_size)):
+                        pending.append((pool.submit(gzip_member, block, level), arcname, first, last))
+                        first = False
+                        drain(max_inflight)
+                    stats["compressed_files"] += 1
+                    stats["compressed_bytes_in"] += st.st_size
+                drain(max_inflight)
+
+            drain(0)
+
+            # end of archive: two zero blocks, padded to a full record
+            out.write(gzip_member(b"\0" * RECORD, level))
+
+        os.replace(tmp, out_path)
+    finally:
+        pool.shutdown()
+        if prev_fh:
+            prev_fh.close()
+        tmp.unlink(missing_ok=True)
+
+    deleted = sorted(set(prev_files) - set(entries))
+    archive_size = out_path.stat().st_size
+    manifest = {
+        "archive_size": archive_size,
+        "level": level,
+        "incremental": incremental,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "files": entries,
+    }
+    if incremental:
+        # entries of unchanged files are only in the full bundle
+        manifest.update({
+            "base": archive.name,
+            "base_created": previous.get("created"),
+            "files": {name: e for name, e in entries.items() if e["offset"] is not None},
+            "deleted": deleted,
+        })
+    tmp_manifest = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    os.replace(tmp_manifest, manifest_path)
+
+    elapsed = time.time() - t0
+    return {
+        **stats,
+        "archive": str(out_path),
+        "deleted_files": len(deleted),
+        "archive_bytes": archive_size,
+        "ratio": round(archive_size / max(stats["bytes_in"], 1), 4),
+        "threads": threads,
+        "level": level,
+        "incremental": incremental,
+        "elapsed_sec": round(elapsed, 3),
+        # compression only: reused / skipped files cost no deflate
+        "mb_per_sec": round(stats["compressed_bytes_in"] / 1e6 / max(elapsed, 1e-9), 1),
+    }
+
+
+def bundle_tarfile(archive, sources, base=".") -> dict:
+    """
+    The single-threaded path (tarfile "w:gz" ≈ tar -czf) for comparison.
+    """
+    base = Path(base)
+    t0 = time.time()
+    files = collect(sources, base, skip=[archive])
+    with tarfile.open(archive, "w:gz") as tar:
+        for arcname, path, _ in files:
+            tar.add(path, arcname=arcname, recursive=False)
+    elapsed = time.time() - t0
+    n_bytes = sum(st.st_size for _, _, st in files)
+    return {
+        "files": len(files),
+        "bytes_in": n_bytes,
+        "archive_bytes": Path(archive).stat().st_size,
+        "elapsed_sec": round(elapsed, 3),
+        "mb_per_sec": round(n_bytes / 1e6 / max(elapsed, 1e-9), 1),
+    }
+
+
+def log_report(archive, r: dict):
+    logger.info(
+        f"📦 {archive}: {r['files']} files, {r['bytes_in'] / 1e6:.1f} MB → "
+        f"{r['archive_bytes'] / 1e6:.1f} MB ({r['ratio']:.1%}) in {r['elapsed_sec']:.2f}s "
+        f"| {r['mb_per_sec']} MB/s compressed on {r['threads']} threads"
+    )
+    logger.info(
+        f"   compressed {r['compressed_files']} files ({r['compressed_bytes_in'] / 1e6:.1f} MB), "
+        f"reused {r['reused_files']} ({r['reused_bytes'] / 1e6:.1f} MB gz)"
+        + (f", skipped {r['skipped_files']} unchanged, {r['deleted_files']} deleted"
+           if r["incremental"] else "")
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Parallel .tar.gz bundler")
+    parser.add_argument("archive", type=Path)
+    parser.add_argument("sources", nargs="+", type=Path)
+    parser.add_argument("--base", type=Path, default=Path("."), help="arcnames relative to this (tar -C)")
+    parser.add_argument("--incremental", action="store_true", help="only new / changed files")
+    parser.add_argument("--threads", type=int, default=BUNDLE_THREADS)
+    parser.add_argument("--level", type=int, default=BUNDLE_LEVEL)
+    parser.add_argument("--compare", action="store_true", help="also time tarfile w:gz on the same files")
+    parser.add_argument("--out", type=Path, help="write the report as JSON")
+    args = parser.parse_args()
+
+    report = bundle(args.archive, args.sources, args.base, args.incremental, args.threads, args.level)
+    log_report(report["archive"], report)
+
+    if args.compare:
+        baseline = args.archive.with_name("baseline_" + args.archive.name)
+        report["tarfile"] = bundle_tarfile(baseline, args.sources, args.base)
+        baseline.unlink()
+        b = report["tarfile"]
+        if report["compressed_bytes_in"]:
+            vs = f"bundler {report['mb_per_sec'] / max(b['mb_per_sec'], 1e-9):.1f}× faster"
+            if report["compressed_files"] < report["files"]:
+                vs += (f" (compressing {report['compressed_files']}/{report['files']} files; "
+                       f"reuse not counted)")
+        else:
+            vs = "bundler compressed nothing (all reused / skipped), no throughput to compare"
+        logger.info(
+            f"🐢 tarfile w:gz: {b['archive_bytes'] / 1e6:.1f} MB in {b['elapsed_sec']:.2f}s "
+            f"| {b['mb_per_sec']} MB/s → {vs}"
+        )
+
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        logger.info(f"📄 Saved: {args.out}")
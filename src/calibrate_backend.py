@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Backend calibration — fastest device / compute type / replica count
+
+Transcribes the same audio sample with every candidate configuration and
+measures the real-time factor (RTF = wall seconds / audio seconds):
+
+    cuda  × {float16, int8_float16}       1 model
+    cpu   × {int8, int8_float32}          1, 2, 4 … replicas (processes),
+                                          cpu_count / replicas threads each
+
+All replicas of a candidate transcribe the sample at the same time, so
+the RTF is the host throughput: wall / (replicas × audio seconds).
+num_workers (concurrent transcribe() calls on one model) is not a
+candidate axis and is measured at 1: every stage calls a model from a
+single thread, so CPU parallelism comes from replicas (SHARDS). The
+winner is written to config/backend.env, which whisper_backend.py and
+stage 2 read when the WHISPER_* / SHARDS variables are not set:
+
+    python src/calibrate_backend.py [--audio audio/215.wav] [--seconds 120]
+    python src/calibrate_backend.py --devices cpu --replicas 1,2,4,8 --dry-run
+"""
+
+import os
+import time
+import json
+import queue
+import socket
+import logging
+import argparse
+import multiprocessing as mp
+from pathlib import Path
+
+import whisper_backend
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_AUDIO = PROJECT_ROOT / "audio" / "215.wav"
+COMPUTE_TYPES = {
+    "cuda": ("float16", "int8_float16"),
+    "cpu": ("int8", "int8_float32"),
+}
+WARMUP_SEC = 5
+RESULT_POLL_SEC = 5.0   # check for replicas that died without reporting
+JOIN_TIMEOUT_SEC = 30
+
+
+def available_devices() -> list:
+    import ctranslate2
+
+    return (["cuda"] if ctranslate2.get_cuda_device_count() > 0 else []) + ["cpu"]
+
+
+def default_replicas() -> list:
+    cores = os.cpu_count() or 1
+    return [r for r in (1, 2, 4, 8, 16) if r <= max(1, cores // 2)]
+
+
+# ------------------------------------------------------------
+# MEASUREMENT
+# ------------------------------------------------------------
+def _replica(model_name, device, compute_type, cpu_threads, samples, barrier, results):
+    """
+    Runs in a spawned process: load, warm up, then transcribe the sample
+    in step with the other replicas.
+    """
+    try:
+        model = whisper_backend.load_model(
+            model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads,
+            num_workers=1
+        )
+        whisper_backend.transcribe_clip(model, samples[:WARMUP_SEC * whisper_backend.SAMPLE_RATE])
+
+        barrier.wait()
+        t0 = time.time()
+        whisper_backend.transcribe_clip(model, samples)
+        results.put((t0, time.time(), None))
+    except Exception as e:
+        barrier.abort()
+        results.put((0.0, 0.0, f"{type(e).__name__}: {e}"))
+
+
+def measure(model_name, device, compute_type, replicas, samples) -> dict:
+    # not replica_threads(): its WHISPER_CPU_THREADS may come from an
+    # earlier calibration's config/backend.env
+    cpu_threads = max(1, (os.cpu_count() or 1) // replicas) if device == "cpu" else 0
+    audio_sec = len(samples) / whisper_backend.SAMPLE_RATE
+
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(replicas)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(
+            target=_replica,
+            args=(model_name, device, compute_type, cpu_threads, samples, barrier, results),
+        )
+        for _ in range(replicas)
+    ]
+    for p in procs:
+        p.start()
+
+    # a replica killed outright (OOM, CTranslate2 crash) never reports
+    runs, errors = [], []
+    while len(runs) < replicas and not errors:
+        try:
+            runs.append(results.get(timeout=RESULT_POLL_SEC))
+        except queue.Empty:
+            errors = [f"replica exited with code {p.exitcode}"
+                      for p in procs if p.exitcode not in (None, 0)]
+    if errors:
+        # replicas still waiting at the barrier fail instead of hanging
+        barrier.abort()
+    for p in procs:
+        p.join(timeout=JOIN_TIMEOUT_SEC)
+        if p.is_alive():
+            p.terminate()
+            p.join()
+
+    result = {
+        "device": device,
+        "compute_type": compute_type,
+        "replicas": replicas,
+        "cpu_threads": cpu_threads,
+    }
+    errors += [err for _, _, err in runs if err]
+    if errors:
+        return {**result, "error": errors[0]}
+
+    wall = max(end for _, end, _ in runs) - min(start for start, _, _ in runs)
+    return {
+        **result,
+        "wall_sec": round(wall, 3),
+        "rtf": round(wall / (replicas * audio_sec), 4),
+    }
+
+
+def write_config(path: Path, best: dict, model_name: str, sample: str):
+    lines = [
+        f"# Written by src/calibrate_backend.py on {time.strftime('%Y-%m-%d %H:%M:%S')} "
+        f"({socket.gethostname()}, {os.cpu_count()} cores)",
+        f"# {best['device']} {best['compute_type']} × {best['replicas']} → RTF {best['rtf']} ({sample})",
+        f"WHISPER_MODEL={model_name}",
+        f"WHISPER_DEVICE={best['device']}",
+        f"WHISPER_COMPUTE_TYPE={best['compute_type']}",
+        f"SHARDS={best['replicas']}",
+    ]
+    if best["cpu_threads"]:
+        lines.append(f"WHISPER_CPU_THREADS={best['cpu_threads']}")
+
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the fastest transcription backend for this host")
+    parser.add_argument("--audio", type=Path, default=DEFAULT_AUDIO)
+    parser.add_argument("--seconds", type=float, default=120.0, help="length of the audio sample")
+    parser.add_argument("--model", default=whisper_backend.MODEL_NAME)
+    parser.add_argument("--devices", help="comma-separated (default: cuda if present, cpu)")
+    parser.add_argument("--replicas", help="CPU replica counts, e.g. 1,2,4,8")
+    parser.add_argument("--out", type=Path, help="also write all results as JSON")
+    parser.add_argument("--dry-run", action="store_true", help=f"do not write {whisper_backend.BACKEND_CONFIG}")
+    args = parser.parse_args()
+
+    from faster_whisper import decode_audio
+
+    samples = decode_audio(str(args.audio))[:int(args.seconds * whisper_backend.SAMPLE_RATE)]
+    audio_sec = len(samples) / whisper_backend.SAMPLE_RATE
+    sample = f"{audio_sec:.0f}s of {args.audio.name}"
+
+    devices = args.devices.split(",") if args.devices else available_devices()
+    replicas = [int(r) for r in args.replicas.split(",")] if args.replicas else default_replicas()
+
+    candidates = [
+        (device, compute_type, r)
+        for device in devices
+        for compute_type in COMPUTE_TYPES[device]
+        for r in (replicas if device == "cpu" else [1])
+    ]
+
+    logger.info("=" * 80)
+    logger.info(f"⚖️ Calibrating {args.model}: {len(candidates)} candidates on {sample}")
+    logger.info("=" * 80)
+
+    results = []
+    for device, compute_type, r in candidates:
+        result = measure(args.model, device, compute_type, r, samples)
+        results.append(result)
+        if "error" in result:
+            logger.warning(f"⚠️ {device:<4} {compute_type:<13} × {r:<2} → failed: {result['error']}")
+        else:
+            logger.info(
+                f"⏱️ {device:<4} {compute_type:<13} × {r:<2} "
+                f"({result['cpu_threads'] or '-'} threads) → RTF {result['rtf']:.4f} "
+                f"| {1 / result['rtf']:.1f}× real time"
+            )
+
+    ok = [r for r in results if "error" not in r]
+    if not ok:
+        raise RuntimeError("No backend configuration could transcribe the sample")
+    best = min(ok, key=lambda r: r["rtf"])
+
+    logger.info("=" * 80)
+    logger.info(
+        f"🏆 Best: {best['device']} {best['compute_type']} × {best['replicas']} replicas "
+        f"→ RTF {best['rtf']}"
+    )
+
+    if args.out:
+        args.out.write_text(json.dumps({
+            "model": args.model,
+            "sample": sample,
+            "host": socket.gethostname(),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+            "best": best,
+        }, indent=2))
+        logger.info(f"📄 Saved: {args.out}")
+
+    if not args.dry_run:
+        write_config(whisper_backend.BACKEND_CONFIG, best, args.model, sample)
+        logger.info(f"📝 Backend config → {whisper_backend.BACKEND_CONFIG}")
+    logger.info("=" * 80)
+
+
+# Guarded: replicas are spawned processes that re-import this file
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Two-model cascade: fast draft pass, large-v3 only where the draft is unsure
+
+Every clip is transcribed by a draft model (CASCADE_DRAFT_MODEL, greedy
+by default). Draft segments whose confidence (compute_confidence of
+avg_logprob / no_speech_prob) is below CASCADE_THRESHOLD, or that look
+like a repetition loop (compression ratio > 2.4, Whisper's own fallback
+criterion), are re-decoded with the main model (WHISPER_MODEL, beam
+BEAM_SIZE):
+
+- the low-confidence spans of a clip (padded by CASCADE_PAD_MS into the
+  gaps around them) are packed into one window with PACK_GUARD_MS of
+  silence between them, as clip_packer.py does for clips, so a clip costs
+  at most one large-model call; segment times come back through remap()
+- when more than CASCADE_CLIP_SHARE of the clip is low-confidence, the
+  whole clip is re-decoded instead (more context, same single call)
+
+The large-model segments replace the low-confidence draft segments; the
+confident draft segments are kept. Results are cached under decode
+params that include the cascade settings.
+
+The report gives the share of audio escalated and the GPU time saved
+against transcribing everything with the main model. That baseline is
+estimated per clip from the main model's measured time per call (whole-
+clip calls when there were any, else span windows, which are shorter, so
+the estimate is conservative).
+
+    CASCADE=1                        stage 2 / worker: enable
+    CASCADE_DRAFT_MODEL=small        draft model (e.g. large-v3-turbo, medium)
+    CASCADE_DRAFT_BEAM=1             draft beam size (1 = greedy)
+    CASCADE_THRESHOLD=0.5            segment confidence below this → escalate
+    CASCADE_PAD_MS=300               context added around a span
+    CASCADE_CLIP_SHARE=0.5           escalate the whole clip above this share
+"""
+
+import time
+import logging
+import dataclasses
+
+import numpy as np
+
+import metrics
+import whisper_backend
+from audio_store import SAMPLE_RATE, ms_to_sample
+from clip_packer import GUARD_MS, WINDOW_MS, remap
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+CASCADE = whisper_backend.setting("CASCADE", "0") == "1"
+DRAFT_MODEL = whisper_backend.setting("CASCADE_DRAFT_MODEL", "small")
+DRAFT_BEAM = int(whisper_backend.setting("CASCADE_DRAFT_BEAM", "1"))
+THRESHOLD = float(whisper_backend.setting("CASCADE_THRESHOLD", "0.5"))
+PAD_MS = int(whisper_backend.setting("CASCADE_PAD_MS", "300"))
+CLIP_SHARE = float(whisper_backend.setting("CASCADE_CLIP_SHARE", "0.5"))
+
+MAX_COMPRESSION_RATIO = 2.4
+
+
+def is_low(seg, threshold: float = THRESHOLD) -> bool:
+    return (
+        whisper_backend.compute_confidence(seg.avg_logprob, seg.no_speech_prob) < threshold
+        or seg.compression_ratio > MAX_COMPRESSION_RATIO
+    )
+
+
+def low_spans(segments, clip_sec: float, threshold: float = THRESHOLD, pad_ms: int = PAD_MS) -> list:
+    """
+    (start, end) seconds to re-decode: low-confidence segments, padded
+    into the gaps around them (never into a kept segment), merged.
+    """
+    pad = pad_ms / 1000
+    spans = []
+    for i, seg in enumerate(segments):
+        if not is_low(seg, threshold):
+            continue
+        prev_end = max((s.end for s in segments[:i] if not is_low(s, threshold)), default=0.0)
+        next_start = min((s.start for s in segments[i + 1:] if not is_low(s, threshold)),
+                         default=clip_sec)
+        start = max(seg.start - pad, prev_end, 0.0)
+        end = min(seg.end + pad, next_start, clip_sec)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        elif end > start:
+            spans.append((start, end))
+    return spans
+
+
+# ------------------------------------------------------------
+# CASCADE
+# ------------------------------------------------------------
+class Cascade:
+    def __init__(self, draft_model, large_model, threshold: float = THRESHOLD,
+                 draft_beam: int = DRAFT_BEAM, pad_ms: int = PAD_MS,
+                 clip_share: float = CLIP_SHARE, draft_name: str = DRAFT_MODEL):
+        self.draft = draft_model
+        self.large = large_model
+        self.threshold = threshold
+        self.draft_beam = draft_beam
+        self.pad_ms = pad_ms
+        self.clip_share = clip_share
+        self.draft_name = draft_name
+
+        self.stats = {
+            "clips": 0, "audio_sec": 0.0, "draft_sec": 0.0,
+            "clips_escalated": 0, "clips_escalated_whole": 0, "spans_escalated": 0,
+            "escalated_audio_sec": 0.0, "large_sec": 0.0,
+            "large_calls_whole": 0, "large_sec_whole": 0.0,
+        }
+
+    @classmethod
+    def load(cls, **load_kwargs) -> "Cascade":
+        """
+        Draft model + main model (same device / compute type / threads).
+        """
+        draft = whisper_backend.load_model(DRAFT_MODEL, **load_kwargs)
+        large = whisper_backend.load_model(**load_kwargs)
+        return cls(draft, large)
+
+    def params(self) -> dict:
+        """
+        Decode params for the transcript cache key.
+        """
+        return {
+            **whisper_backend.decode_params(batched=False),
+            "cascade": {
+                "draft_model": self.draft_name,
+                "draft_beam": self.draft_beam,
+                "threshold": self.threshold,
+                "pad_ms": self.pad_ms,
+                "clip_share": self.clip_share,
+                "guard_ms": GUARD_MS,
+            },
+        }
+
+    def _large(self, audio, whole: bool):
+        t0 = time.time()
+        with metrics.span("cascade_large", scope="clip" if whole else "spans"):
+            segments, info = whisper_backend.transcribe_clip(self.large, audio)
+        elapsed = time.time() - t0
+        self.stats["large_sec"] += elapsed
+        if whole:
+            self.stats["large_calls_whole"] += 1
+            self.stats["large_sec_whole"] += elapsed
+        return segments, info
+
+    def transcribe(self, audio: np.ndarray):
+        """
+        One clip → (segments, info), like whisper_backend.transcribe_clip.
+        """
+        clip_sec = len(audio) / SAMPLE_RATE
+        self.stats["clips"] += 1
+        self.stats["audio_sec"] += clip_sec
+
+        t0 = time.time()
+        with metrics.span("cascade_draft"):
+            draft, info = whisper_backend.transcribe_clip(self.draft, audio, beam_size=self.draft_beam)
+        self.stats["draft_sec"] += time.time() - t0
+
+        spans = low_spans(draft, clip_sec, self.threshold, self.pad_ms)
+        if not spans:
+            return draft, info
+
+        escalated = sum(end - start for start, end in spans)
+        pieces, offset = [], 0
+        for start, end in spans:
+            start_ms, end_ms = round(start * 1000), round(end * 1000)
+            pieces.append({"start_ms": start_ms, "duration_ms": end_ms - start_ms, "offset_ms": offset})
+            offset += end_ms - start_ms + GUARD_MS
+        window_ms = offset - GUARD_MS
+
+        self.stats["clips_escalated"] += 1
+        if escalated > self.clip_share * clip_sec or window_ms > WINDOW_MS:
+            self.stats["clips_escalated_whole"] += 1
+            self.stats["escalated_audio_sec"] += clip_sec
+            logger.info(f"   🔺 Cascade: whole clip → {whisper_backend.MODEL_NAME} "
+                        f"({escalated / clip_sec:.0%} low-confidence)")
+            return self._large(audio, whole=True)
+
+        self.stats["spans_escalated"] += len(spans)
+        self.stats["escalated_audio_sec"] += escalated
+        logger.info(f"   🔺 Cascade: {len(spans)} spans ({escalated:.1f}s of {clip_sec:.1f}s) "
+                    f"→ {whisper_backend.MODEL_NAME}")
+
+        # spans packed into one window, guard silence between them
+        window = np.zeros(ms_to_sample(window_ms), dtype=np.float32)
+        for p in pieces:
+            a, n = ms_to_sample(p["start_ms"]), ms_to_sample(p["duration_ms"])
+            o = ms_to_sample(p["offset_ms"])
+            chunk = audio[a:a + n]
+            window[o:o + len(chunk)] = chunk
+
+        large, info = self._large(window, whole=False)
+        replaced = [
+            dataclasses.replace(
+                seg, start=remap(seg.start, pieces),
+                end=max(remap(seg.end, pieces), remap(seg.start, pieces))
+            )
+            for seg in large
+        ]
+        kept = [seg for seg in draft if not is_low(seg, self.threshold)]
+        return sorted(kept + replaced, key=lambda s: s.start), info
+
+    # --------------------------------------------------------
+    # REPORT
+    # --------------------------------------------------------
+    def merge_stats(self, other: dict):
+        for key, value in other.items():
+            self.stats[key] += value
+
+    def summary(self) -> dict:
+        s = self.stats
+        clips = max(s["clips"], 1)
+        if s["large_calls_whole"]:
+            per_clip = s["large_sec_whole"] / s["large_calls_whole"]
+            basis = "whole-clip calls"
+        elif s["clips_escalated"]:
+            per_clip = s["large_sec"] / s["clips_escalated"]
+            basis = "span windows (conservative)"
+        else:
+            per_clip, basis = None, "no main-model call measured"
+
+        actual = s["draft_sec"] + s["large_sec"]
+        all_large = per_clip * s["clips"] if per_clip is not None else None
+        return {
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in s.items()},
+            "draft_model": self.draft_name,
+            "threshold": self.threshold,
+            "escalated_audio_pct": round(100 * s["escalated_audio_sec"] / max(s["audio_sec"], 1e-9), 1),
+            "clips_escalated_pct": round(100 * s["clips_escalated"] / clips, 1),
+            "cascade_gpu_sec": round(actual, 3),
+            "all_large_gpu_sec_est": round(all_large, 3) if all_large is not None else None,
+            "gpu_sec_saved_est": round(all_large - actual, 3) if all_large is not None else None,
+            "estimate_basis": basis,
+        }
+
+    def report(self) -> dict:
+        r = self.summary()
+        metrics.gauge("cascade_escalated_audio_pct", r["escalated_audio_pct"])
+        metrics.gauge("cascade_gpu_seconds", r["cascade_gpu_sec"])
+        if r["gpu_sec_saved_est"] is not None:
+            metrics.gauge("cascade_gpu_seconds_saved_est", r["gpu_sec_saved_est"])
+
+        logger.info(
+            f"🪜 Cascade ({self.draft_name} → {whisper_backend.MODEL_NAME}, threshold {self.threshold}): "
+            f"escalated {r['escalated_audio_pct']}% of audio | "
+            f"{r['clips_escalated']}/{r['clips']} clips ({r['clips_escalated_whole']} whole, "
+            f"{r['spans_escalated']} spans)"
+        )
+        if r["all_large_gpu_sec_est"] is None:
+            logger.info(
+                f"🪜 GPU time: draft {r['draft_sec']:.1f}s, {whisper_backend.MODEL_NAME} 0s "
+                f"(nothing escalated — all-{whisper_backend.MODEL_NAME} cost not measured)"
+            )
+        else:
+            logger.info(
+                f"🪜 GPU time: draft {r['draft_sec']:.1f}s + {whisper_backend.MODEL_NAME} {r['large_sec']:.1f}s "
+                f"= {r['cascade_gpu_sec']:.1f}s vs ~{r['all_large_gpu_sec_est']:.1f}s all-"
+                f"{whisper_backend.MODEL_NAME} → saved ~{r['gpu_sec_saved_est']:.1f}s "
+                f"({r['gpu_sec_saved_est'] / max(r['all_large_gpu_sec_est'], 1e-9):.0%}, "
+                f"estimated from {r['estimate_basis']})"
+            )
+        return r
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Stage 3 change log
+
+The rule engine reports every replacement it applies; each one becomes a
+record in outputs/refined_changes.jsonl:
+
+    {"segment": 12, "start": 812.34, "end": 815.1, "char_start": 5,
+     "char_end": 10, "rule": "दर्पन", "before": "दर्पन", "after": "दर्पण"}
+
+(start/end: audio time of the segment; char span: in the raw text.)
+
+A unified diff is rendered from the log only when asked for, touching just
+the changed segments and their context instead of diffing the whole
+transcript:
+
+    python src/change_log.py outputs/raw_transcript.jsonl \\
+        outputs/refined_changes.jsonl > raw_vs_refined.diff.txt
+"""
+
+import sys
+import json
+from pathlib import Path
+
+from transcript_io import TranscriptReader
+
+CONTEXT_LINES = 3
+
+
+# ------------------------------------------------------------
+# RECORDS
+# ------------------------------------------------------------
+def edit_records(seg_idx: int, segment: dict, spans, engine) -> list:
+    return [
+        {
+            "segment": seg_idx,
+            "start": segment.get("start"),
+            "end": segment.get("end"),
+            "char_start": start,
+            "char_end": end,
+            "rule": engine.patterns[i],
+            "before": segment["text"][start:end],
+            "after": engine.replacements[i],
+        }
+        for start, end, i in spans
+    ]
+
+
+class ChangeLogWriter:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self._f = self.path.open("w", encoding="utf-8")
+
+    def write(self, records):
+        for r in records:
+            self._f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        self.count += len(records)
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_changes(path: Path) -> list:
+    with Path(path).open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ------------------------------------------------------------
+# DIFF RENDERING
+# ------------------------------------------------------------
+def refined_lines(raw_lines, changes) -> dict:
+    """
+    segment index → refined text, for segments the log changed.
+    """
+    by_seg = {}
+    for c in changes:
+        by_seg.setdefault(c["segment"], []).append(c)
+
+    out = {}
+    for idx, edits in by_seg.items():
+        text = raw_lines[idx]
+        parts, pos = [], 0
+        for c in sorted(edits, key=lambda c: c["char_start"]):
+            parts.append(text[pos:c["char_start"]])
+            parts.append(c["after"])
+            pos = c["char_end"]
+        parts.append(text[pos:])
+        refined = "".join(parts)
+        if refined != text:
+            out[idx] = refined
+    return out
+
+
+def _range(lo: int, hi: int) -> str:
+    return f"{lo + 1}" if hi - lo == 1 else f"{lo + 1},{hi - lo}"
+
+
+def render_diff(raw_lines, changes, n: int = CONTEXT_LINES,
+                fromfile: str = "raw", tofile: str = "refined") -> list:
+    """
+    Same lines as difflib.unified_diff(raw, refined, lineterm="") for
+    line-for-line edits, computed from the change log.
+    """
+    changed = refined_lines(raw_lines, changes)
+    if not changed:
+        return []
+
+    # Hunks: changed lines closer than 2n unchanged lines share a hunk
+    idxs = sorted(changed)
+    groups = [[idxs[0]]]
+    for i in idxs[1:]:
+        if i - groups[-1][-1] - 1 > 2 * n:
+            groups.append([i])
+        else:
+            groups[-1].append(i)
+
+    diff = [f"--- {fromfile}", f"+++ {tofile}"]
+    for group in groups:
+        lo = max(group[0] - n, 0)
+        hi = min(group[-1] + n + 1, len(raw_lines))
+        diff.append(f"@@ -{_range(lo, hi)} +{_range(lo, hi)} @@")
+
+        i = lo
+        while i < hi:
+            if i not in changed:
+                diff.append(" " + raw_lines[i])
+                i += 1
+                continue
+            j = i
+            while j < hi and j in changed:
+                j += 1
+            diff.extend("-" + raw_lines[k] for k in range(i, j))
+            diff.extend("+" + changed[k] for k in range(i, j))
+            i = j
+
+    return diff
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python src/change_log.py <raw_transcript.jsonl> <refined_changes.jsonl>")
+
+    raw_path = Path(sys.argv[1])
+    if raw_path.suffix == ".json":
+        with raw_path.open(encoding="utf-8") as f:
+            raw = [s["text"] for s in json.load(f)["segments"]]
+    else:
+        raw = [s["text"] for s in TranscriptReader(raw_path)]
+    print("\n".join(render_diff(raw, read_changes(sys.argv[2]))))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for pipeline_state.json
+
+pipeline_state.json is the base state (clip list + clips_processed as of
+the last compaction). Each completed clip appends one small line to
+pipeline_state.journal.jsonl instead of rewriting the whole state:
+
+    {"clip": 17, "t": 1760000000.123, "key": "<transcript cache key>"}
+    {"clip": 18, "t": 1760000031.456, "key": "...", "record": {...clip...}}
+
+- appends are fsync'd under an exclusive lock (sharded workers share it)
+- load_state() replays the journal over the base; a torn last line from
+  a pod kill is skipped
+- compact() folds the journal into the base (atomic replace) and empties it
+- a pre-journal pipeline_state.json is simply a base with no journal
+
+Usage:
+    python src/checkpoint.py compact [pipeline_state.json]
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def journal_path(state_file: Path) -> Path:
+    return Path(state_file).with_suffix(".journal.jsonl")
+
+
+@contextmanager
+def locked(state_file: Path):
+    state_file = Path(state_file)
+    lock_path = state_file.with_suffix(state_file.suffix + ".lock")
+    with lock_path.open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def write_state(state_file: Path, state: dict):
+    state_file = Path(state_file)
+    tmp = state_file.with_suffix(state_file.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp, state_file)
+
+
+# ------------------------------------------------------------
+# WRITE
+# ------------------------------------------------------------
+def reset(state_file: Path, state: dict):
+    """
+    Write a new base state and drop the journal (fresh segmentation).
+    """
+    with locked(state_file):
+        write_state(state_file, state)
+        journal_path(state_file).unlink(missing_ok=True)
+
+
+def append(state_file: Path, idx: int, key: str = None, record: dict = None):
+    """
+    Record clip `idx` as processed, with the transcript cache key of its
+    result. `record` also stores the clip itself, for runners that
+    discover clips as they go (stream_pipeline.py).
+    """
+    entry = {"clip": idx, "t": round(time.time(), 3)}
+    if key is not None:
+        entry["key"] = key
+    if record is not None:
+        entry["record"] = record
+    line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    with metrics.span("checkpoint_append"), locked(state_file):
+        with journal_path(state_file).open("a+b") as f:
+            # finish a line torn by a crash so this entry stays parseable
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# ------------------------------------------------------------
+# READ
+# ------------------------------------------------------------
+def replay(state_file: Path):
+    path = journal_path(state_file)
+    if not path.exists():
+        return []
+
+    entries = []
+    with path.open("rb") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"⚠️ Skipping torn journal line in {path.name}")
+    return entries
+
+
+def load_state(state_file: Path) -> dict:
+    """
+    Base state with the journal applied. Cache keys are kept in
+    state["cache_keys"] (clip index as a string → key).
+    """
+    state = json.loads(Path(state_file).read_text(encoding="utf-8"))
+    clips = state.setdefault("clips", [])
+    done = set(state.get("clips_processed", []))
+
+    for entry in replay(state_file):
+        idx = entry["clip"]
+        if "key" in entry:
+            state.setdefault("cache_keys", {})[str(idx)] = entry["key"]
+        if "record" in entry:
+            clips.extend([None] * (idx + 1 - len(clips)))
+            clips[idx] = entry["record"]
+        done.add(idx)
+
+    state["clips_processed"] = sorted(done)
+    return state
+
+
+# ------------------------------------------------------------
+# COMPACTION
+# ------------------------------------------------------------
+def compact(state_file: Path, **updates) -> dict:
+    """
+    Fold the journal into pipeline_state.json and empty it.
+    `updates` are merged into the compacted state (e.g. complete=True).
+    """
+    with metrics.span("checkpoint_compact"), locked(state_file):
+        state = load_state(state_file)
+        state.update(updates)
+        write_state(state_file, state)
+        journal_path(state_file).unlink(missing_ok=True)
+    return state
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    if len(sys.argv) < 2 or sys.argv[1] != "compact":
+        sys.exit(__doc__.split("Usage:")[1])
+
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else \
+        Path(__file__).resolve().parent.parent / "pipeline_state.json"
+    entries = len(replay(target))
+    state = compact(target)
+    logger.info(
+        f"🗜️ Compacted {entries} journal entries → {target} "
+        f"({len(state['clips_processed'])} clips processed)"
+    )
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Clip packing into 30 s Whisper windows
+
+Whisper pads every input to a 30 s window, so a 12 s clip costs as much
+GPU as a full one. Packing (PACK_CLIPS=1 in stage 1, or this script on an
+existing pipeline_state.json) concatenates consecutive clips, separated by
+PACK_GUARD_MS of silence, into windows of at most 30 s. Clips stay in
+order, so each window is contiguous speech context for the model.
+
+Each window replaces its clips in state["clips"] and keeps them as
+"pieces", the offset map back to the original timeline:
+
+    {"name": "window_004", "start_ms": 95120, "duration_ms": 29650,
+     "pieces": [{...clip..., "clip": 9, "offset_ms": 0},
+                {...clip..., "clip": 10, "offset_ms": 14210}]}
+
+Stage 2 transcribes windows like clips (cache, checkpoints and resume are
+per window) and remaps segment times through the pieces
+(whisper_backend.clip_records). state["packing"] records the settings.
+
+    python src/clip_packer.py [pipeline_state.json]
+"""
+
+import os
+import sys
+import logging
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+
+from audio_store import ms_to_sample
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PACK_CLIPS = os.environ.get("PACK_CLIPS", "0") == "1"
+
+WINDOW_MS = 30_000
+GUARD_MS = int(os.environ.get("PACK_GUARD_MS", "500"))
+
+
+# ------------------------------------------------------------
+# PACKING
+# ------------------------------------------------------------
+def pack(clips: list, window_ms: int = WINDOW_MS, guard_ms: int = GUARD_MS) -> list:
+    """
+    Greedy in-order packing: a clip joins the current window if it still
+    fits (with its guard), otherwise it opens the next one.
+    """
+    windows, pieces, length = [], [], 0
+
+    def close():
+        windows.append({
+            "name": f"window_{len(windows):03d}",
+            "start_ms": pieces[0]["start_ms"],
+            "duration_ms": length,
+            "pieces": pieces,
+        })
+
+    for idx, clip in enumerate(clips):
+        offset = length + guard_ms if pieces else 0
+        if pieces and offset + clip["duration_ms"] > window_ms:
+            close()
+            pieces, offset = [], 0
+
+        pieces.append({**clip, "clip": idx, "offset_ms": offset})
+        length = offset + clip["duration_ms"]
+
+    if pieces:
+        close()
+    return windows
+
+
+def fill_pct(clips: list, window_ms: int = WINDOW_MS) -> float:
+    """
+    Share of the padded 30 s model windows that is actual audio.
+    """
+    used = sum(min(c["duration_ms"], window_ms) for c in clips)
+    return round(100 * used / max(len(clips) * window_ms, 1), 1)
+
+
+def pack_state(state: dict, window_ms: int = WINDOW_MS, guard_ms: int = GUARD_MS) -> dict:
+    if state.get("packing"):
+        raise ValueError("pipeline_state.json is already packed")
+    if state.get("clips_processed"):
+        raise ValueError(
+            "Transcription has started on the unpacked clips — "
+            "re-run stage 1 with PACK_CLIPS=1 instead"
+        )
+
+    clips = state["clips"]
+    windows = pack(clips, window_ms, guard_ms)
+
+    state["packing"] = {
+        "window_ms": window_ms,
+        "guard_ms": guard_ms,
+        "source_clips": len(clips),
+        "windows": len(windows),
+        "fill_pct_before": fill_pct(clips, window_ms),
+        "fill_pct": fill_pct(windows, window_ms),
+    }
+    state["clips"] = windows
+    state["total_clips"] = len(windows)
+
+    p = state["packing"]
+    logger.info(
+        f"📦 Packed {p['source_clips']} clips → {p['windows']} windows "
+        f"(window fill {p['fill_pct_before']}% → {p['fill_pct']}%, guard {guard_ms} ms)"
+    )
+    return state
+
+
+# ------------------------------------------------------------
+# WINDOW AUDIO + OFFSET MAP
+# ------------------------------------------------------------
+def window_audio(window: dict, load_clip) -> np.ndarray:
+    """
+    16 kHz float32 window: each piece at its offset (trimmed or padded to
+    its duration so the offset map is exact), silence in between.
+    """
+    out = np.zeros(ms_to_sample(window["duration_ms"]), dtype=np.float32)
+    for piece in window["pieces"]:
+        start = ms_to_sample(piece["offset_ms"])
+        n = ms_to_sample(piece["offset_ms"] + piece["duration_ms"]) - start
+        samples = load_clip(piece)[:n]
+        out[start:start + len(samples)] = samples
+    return out
+
+
+def remap(t: float, pieces: list) -> float:
+    """
+    Window-relative seconds → seconds on the original timeline. Times in
+    a guard go to the nearer adjacent piece edge.
+    """
+    ms = t * 1000
+    i = max(bisect_right([p["offset_ms"] for p in pieces], ms) - 1, 0)
+    piece = pieces[i]
+    local = ms - piece["offset_ms"]
+
+    if local > piece["duration_ms"] and i + 1 < len(pieces):
+        nxt = pieces[i + 1]
+        if nxt["offset_ms"] - ms < local - piece["duration_ms"]:
+            return round(nxt["start_ms"] / 1000, 3)
+
+    local = min(max(local, 0), piece["duration_ms"])
+    return round((piece["start_ms"] + local) / 1000, 3)
+
+
+if __name__ == "__main__":
+    import checkpoint
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    project_root = Path(__file__).resolve().parent.parent
+    state_file = Path(sys.argv[1]) if len(sys.argv) > 1 else project_root / "pipeline_state.json"
+
+    state = checkpoint.load_state(state_file)
+    state.pop("cache_keys", None)
+    try:
+        checkpoint.reset(state_file, pack_state(state))
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    logger.info(f"📄 State written → {state_file}")
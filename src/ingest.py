@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Ingest — any input format → one 16 kHz mono PCM WAV
+
+The input (wav, mp3, m4a, opus, flac, or the audio track of a video) is
+streamed through an ffmpeg pipe and decoded + resampled exactly once to
+16 kHz mono 16-bit PCM, the format Whisper works in:
+
+    ffmpeg -i <input> -vn -ac 1 -ar 16000 -f s16le -  →  clips/input_16k.wav
+
+Segmentation then maps that file (1/5.5 of 44.1 kHz stereo), clips are cut
+from it already at 16 kHz, and stage 2 reads them without a decoder or
+resampler (audio_store.load_audio). Array mode and the VAD convert the
+same file to float32 without decoding again.
+
+    INGEST=0                 stage 1 reads the input WAV as is (source rate)
+    INGEST_DECODER=ffmpeg    ffmpeg binary only; "av" = PyAV (the
+                             ffmpeg libraries bundled with faster-whisper);
+                             default "auto": ffmpeg if on PATH, else av
+
+An input that already is 16 kHz mono PCM WAV is used directly, and an
+ingest output newer than its input is reused.
+"""
+
+import os
+import time
+import wave
+import shutil
+import logging
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+import metrics
+from audio_store import SAMPLE_RATE, is_pcm16k
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+INGEST = os.environ.get("INGEST", "1") == "1"
+INGEST_DECODER = os.environ.get("INGEST_DECODER", "auto")
+DECODERS = ("auto", "ffmpeg", "av")
+
+INGEST_NAME = "input_16k.wav"
+PIPE_BYTES = 1024 * 1024
+
+
+# ------------------------------------------------------------
+# DECODERS (16 kHz mono s16le byte chunks)
+# ------------------------------------------------------------
+def _ffmpeg_pcm(input_path: Path):
+    proc = subprocess.Popen(
+        ["ffmpeg", "-nostdin", "-v", "error", "-i", str(input_path),
+         "-vn", "-map", "0:a:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while chunk := proc.stdout.read(PIPE_BYTES):
+            yield chunk
+    finally:
+        proc.stdout.close()
+        err = proc.stderr.read().decode(errors="replace").strip()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg could not decode {input_path}: {err}")
+
+
+def _av_pcm(input_path: Path):
+    import av
+
+    resampler = av.audio.resampler.AudioResampler(
+        format="s16", layout="mono", rate=SAMPLE_RATE
+    )
+    with av.open(str(input_path), mode="r", metadata_errors="ignore") as container:
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                yield out.to_ndarray().astype(np.int16, copy=False).tobytes()
+        for out in resampler.resample(None):
+            yield out.to_ndarray().astype(np.int16, copy=False).tobytes()
+
+
+def pick_decoder(decoder: str = INGEST_DECODER) -> str:
+    if decoder not in DECODERS:
+        raise ValueError(f"INGEST_DECODER must be one of {DECODERS}, got: {decoder}")
+    if decoder == "auto":
+        return "ffmpeg" if shutil.which("ffmpeg") else "av"
+    return decoder
+
+
+# ------------------------------------------------------------
+# INGEST
+# ------------------------------------------------------------
+def ingest(input_path, out_path, decoder: str = INGEST_DECODER) -> dict:
+    """
+    Decode `input_path` once to a 16 kHz mono PCM WAV at `out_path`.
+    Returns the state "ingest" entry; its "path" is the file to segment
+    (the input itself when it is already 16 kHz mono PCM).
+    """
+    input_path, out_path = Path(input_path), Path(out_path)
+    source_bytes = input_path.stat().st_size
+
+    if is_pcm16k(input_path):
+        logger.info(f"🎛️ Input is already {SAMPLE_RATE} Hz mono PCM — no ingest needed")
+        return {"path": input_path, "decoder": None, "source_bytes": source_bytes}
+
+    if out_path.exists() and out_path.stat().st_mtime >= input_path.stat().st_mtime \
+            and is_pcm16k(out_path):
+        logger.info(f"♻️ Reusing ingested audio → {out_path}")
+        return {"path": out_path, "decoder": "reused", "source_bytes": source_bytes,
+                "pcm_bytes": out_path.stat().st_size}
+
+    decoder = pick_decoder(decoder)
+    chunks = _ffmpeg_pcm(input_path) if decoder == "ffmpeg" else _av_pcm(input_path)
+
+    logger.info(f"🎛️ Ingesting {input_path.name} → {SAMPLE_RATE} Hz mono PCM ({decoder})")
+    t0 = time.time()
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    pcm_bytes = 0
+    try:
+        with metrics.span("ingest", decoder=decoder), wave.open(str(tmp), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            for chunk in chunks:
+                w.writeframesraw(chunk)
+                pcm_bytes += len(chunk)
+        os.replace(tmp, out_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    elapsed = time.time() - t0
+    seconds = pcm_bytes / 2 / SAMPLE_RATE
+    metrics.gauge("ingest_x_realtime", round(seconds / max(elapsed, 1e-9), 1))
+
+    logger.info(
+        f"🎛️ Ingested {seconds:.1f}s of audio in {elapsed:.1f}s "
+        f"({seconds / max(elapsed, 1e-9):.0f}× real time) | "
+        f"{source_bytes / 1e6:.1f} MB → {pcm_bytes / 1e6:.1f} MB PCM"
+    )
+    return {
+        "path": out_path,
+        "decoder": decoder,
+        "source_bytes": source_bytes,
+        "pcm_bytes": pcm_bytes,
+        "decode_sec": round(elapsed, 3),
+    }
+
+
+def state_entry(report: dict, root: Path) -> dict:
+    """
+    The ingest report as stored in pipeline_state.json (paths relative
+    to the project / job root when possible).
+    """
+    path = Path(report["path"])
+    try:
+        path = path.relative_to(root)
+    except ValueError:
+        pass
+    return {**{k: v for k, v in report.items() if k != "path"}, "file": str(path)}
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Structured metrics for the pipeline stages
+
+Spans (timed sections), counters and gauges are recorded in a process-wide
+registry and exported at the end of a stage as
+
+    outputs/metrics/<stage>.json   (machine-readable, per-span percentiles)
+    outputs/metrics/<stage>.prom   (Prometheus text format, e.g. for the
+                                    node_exporter textfile collector)
+
+    with metrics.span("clip_inference"):
+        ...
+    metrics.count("transcript_cache_hits")
+    metrics.gauge("rtf", 0.031)
+    metrics.export("transcribe")
+
+Opt-in profiling of the hot loops (segmentation, transcription, rules):
+
+    PROFILE=cprofile      → outputs/metrics/<name>.prof  (pstats / snakeviz)
+    PROFILE=pyinstrument  → outputs/metrics/<name>.html  (needs pyinstrument)
+
+The registry is thread-safe (clips are decoded on a prefetch thread).
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+METRICS_DIR = Path(os.environ.get("METRICS_DIR", str(PROJECT_ROOT / "outputs" / "metrics")))
+PROFILE = os.environ.get("PROFILE", "")  # "", "cprofile" or "pyinstrument"
+
+PREFIX = "whisper_pipeline_"
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _key(name: str, labels: dict):
+    return name, tuple(sorted(labels.items()))
+
+
+# ------------------------------------------------------------
+# REGISTRY
+# ------------------------------------------------------------
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.spans = {}      # key → [seconds, ...]
+            self.counters = {}   # key → value
+            self.gauges = {}     # key → value
+
+    def observe(self, name: str, seconds: float, **labels):
+        with self._lock:
+            self.spans.setdefault(_key(name, labels), []).append(seconds)
+
+    def count(self, name: str, n: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    # --------------------------------------------------------
+    # EXPORT
+    # --------------------------------------------------------
+    def snapshot(self, stage: str) -> dict:
+        with self._lock:
+            spans = {k: list(v) for k, v in self.spans.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        def entry(key, **fields):
+            name, labels = key
+            return {"name": name, "labels": dict(labels), **fields}
+
+        span_entries = []
+        for key, samples in spans.items():
+            a = np.asarray(samples)
+            span_entries.append(entry(
+                key,
+                count=len(samples),
+                total_sec=round(float(a.sum()), 6),
+                min_sec=round(float(a.min()), 6),
+                max_sec=round(float(a.max()), 6),
+                **{f"p{int(q * 100)}_sec": round(float(np.quantile(a, q)), 6) for q in QUANTILES}
+            ))
+
+        return {
+            "stage": stage,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "wall_sec": round(time.time() - self.started, 3),
+            "spans": span_entries,
+            "counters": [entry(k, value=v) for k, v in counters.items()],
+            "gauges": [entry(k, value=v) for k, v in gauges.items()],
+        }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict, **extra) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items.items()) + "}"
+
+
+def prometheus_text(snapshot: dict) -> str:
+    """
+    Spans → summaries (<name>_seconds), counters → <name>_total, gauges as is.
+    Every series carries a stage label.
+    """
+    stage = snapshot["stage"]
+    lines = []
+    seen = set()
+
+    def header(metric, kind):
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f"# TYPE {metric} {kind}")
+
+    for s in snapshot["spans"]:
+        metric = f"{PREFIX}{s['name']}_seconds"
+        header(metric, "summary")
+        for q in QUANTILES:
+            lines.append(
+                f"{metric}{_labels(s['labels'], stage=stage, quantile=q)} "
+                f"{s[f'p{int(q * 100)}_sec']}"
+            )
+        lines.append(f"{metric}_sum{_labels(s['labels'], stage=stage)} {s['total_sec']}")
+        lines.append(f"{metric}_count{_labels(s['labels'], stage=stage)} {s['count']}")
+
+    for c in snapshot["counters"]:
+        metric = f"{PREFIX}{c['name']}_total"
+        header(metric, "counter")
+        lines.append(f"{metric}{_labels(c['labels'], stage=stage)} {c['value']}")
+
+    for g in snapshot["gauges"]:
+        metric = f"{PREFIX}{g['name']}"
+        header(metric, "gauge")
+        lines.append(f"{metric}{_labels(g['labels'], stage=stage)} {g['value']}")
+
+    metric = f"{PREFIX}stage_wall_seconds"
+    header(metric, "gauge")
+    lines.append(f"{metric}{_labels({}, stage=stage)} {snapshot['wall_sec']}")
+
+    return "\n".join(lines) + "\n"
+
+
+_registry = Registry()
+
+observe = _registry.observe
+count = _registry.count
+gauge = _registry.gauge
+span = _registry.span
+reset = _registry.reset
+
+
+def export(stage: str, out_dir: Path = None) -> dict:
+    """
+    Write <stage>.json and <stage>.prom (atomically) and return the snapshot.
+    """
+    out_dir = Path(out_dir or METRICS_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    snap = _registry.snapshot(stage)
+
+    for path, text in (
+        (out_dir / f"{stage}.json", json.dumps(snap, indent=2, ensure_ascii=False)),
+        (out_dir / f"{stage}.prom", prometheus_text(snap)),
+    ):
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    logger.info(f"📈 Metrics → {out_dir / stage}.json / .prom")
+    return snap
+
+
+# ------------------------------------------------------------
+# PROFILING (opt-in)
+# ------------------------------------------------------------
+@contextmanager
+def profiled(name: str, out_dir: Path = None):
+    """
+    Profile the enclosed block when PROFILE is set; no-op otherwise.
+    """
+    if not PROFILE:
+        yield
+        return
+
+    out_dir = Path(out_dir or METRICS_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if PROFILE == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(out_dir / f"{name}.prof")
+            logger.info(f"🔬 cProfile → {out_dir / name}.prof")
+
+    elif PROFILE == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("⚠️ PROFILE=pyinstrument but pyinstrument is not installed")
+            yield
+            return
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            (out_dir / f"{name}.html").write_text(profiler.output_html(), encoding="utf-8")
+            logger.info(f"🔬 pyinstrument → {out_dir / name}.html")
+
+    else:
+        logger.warning(f"⚠️ Unknown PROFILE={PROFILE!r} (use cprofile or pyinstrument)")
+        yield
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Local model artifact store (models/)
+
+A fresh pod resolves WHISPER_MODEL through the Hugging Face cache, so cold
+start depends on the network. The store keeps converted CTranslate2 model
+directories inside the project, so they travel with the project bundle
+(01-tar_local_project.sh), each with a checksum manifest:
+
+    models/large-v3/
+        model.bin  config.json  tokenizer.json  vocabulary.*  ...
+        model_manifest.json   {"name", "source", "files": {rel: {size, sha256}}}
+
+    python src/model_store.py fetch large-v3          # download into models/
+    python src/model_store.py add path/to/ct2_dir --name my-model
+    python src/model_store.py verify [name ...]
+    python src/model_store.py list
+
+whisper_backend.load_model() uses a stored model when present. Loading is
+timed in three spans, so cold start can be broken down:
+
+    model_download     (only when the model is not in the store)
+    model_disk_read    (checksum pass / page-cache warm-up of the files)
+    model_device_init  (WhisperModel on the warm files: weights → device)
+
+    MODEL_OFFLINE=1   fail instead of downloading when the model is not stored
+    MODEL_VERIFY=0    skip the sha256 check (files are still read once)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+MODELS_DIR = Path(os.environ.get("MODELS_DIR", str(PROJECT_ROOT / "models")))
+MODEL_OFFLINE = os.environ.get("MODEL_OFFLINE", "0") == "1"
+MODEL_VERIFY = os.environ.get("MODEL_VERIFY", "1") == "1"
+
+MANIFEST = "model_manifest.json"
+REQUIRED = ("model.bin", "config.json")
+CHUNK = 8 * 1024 * 1024
+
+
+# ------------------------------------------------------------
+# MANIFEST
+# ------------------------------------------------------------
+def model_dir(name: str, models_dir: Path = None) -> Path:
+    # "Systran/faster-whisper-large-v3" → models/Systran--faster-whisper-large-v3
+    return Path(models_dir or MODELS_DIR) / name.replace("/", "--")
+
+
+def _files(path: Path) -> list:
+    return sorted(
+        p for p in path.rglob("*")
+        if p.is_file() and p.name != MANIFEST and ".cache" not in p.relative_to(path).parts
+    )
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_manifest(path: Path, name: str, source: str) -> dict:
+    missing = [f for f in REQUIRED if not (path / f).is_file()]
+    if missing:
+        raise ValueError(f"Not a CTranslate2 model directory (missing {', '.join(missing)}): {path}")
+
+    manifest = {
+        "name": name,
+        "source": source,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "files": {
+            p.relative_to(path).as_posix(): {"size": p.stat().st_size, "sha256": _sha256(p)}
+            for p in _files(path)
+        },
+    }
+    (path / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def read_manifest(path: Path) -> dict:
+    return json.loads((path / MANIFEST).read_text(encoding="utf-8"))
+
+
+def verify(path: Path, checksums: bool = True) -> int:
+    """
+    Check every manifest file (size, and sha256 unless checksums=False)
+    and return the bytes read. Raises ValueError on a mismatch.
+    """
+    manifest = read_manifest(path)
+    total = 0
+
+    for rel, entry in manifest["files"].items():
+        f = path / rel
+        if not f.is_file():
+            raise ValueError(f"{manifest['name']}: missing {rel}")
+        if f.stat().st_size != entry["size"]:
+            raise ValueError(f"{manifest['name']}: size mismatch for {rel}")
+
+        if checksums:
+            if _sha256(f) != entry["sha256"]:
+                raise ValueError(f"{manifest['name']}: checksum mismatch for {rel}")
+        else:
+            # same sequential read, so device init starts from the page cache
+            buf = bytearray(CHUNK)
+            with open(f, "rb") as fh:
+                while fh.readinto(buf):
+                    pass
+        total += entry["size"]
+
+    return total
+
+
+# ------------------------------------------------------------
+# STORE
+# ------------------------------------------------------------
+def _install(staging: Path, dest: Path):
+    if dest.exists():
+        shutil.rmtree(dest)
+    os.replace(staging, dest)
+
+
+def fetch(name: str, models_dir: Path = None) -> Path:
+    """
+    Download a faster-whisper model (size name or HF repo id) into the store.
+    """
+    from faster_whisper.utils import download_model
+
+    dest = model_dir(name, models_dir)
+    staging = dest.with_name(f".{dest.name}.partial")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    logger.info(f"⬇️ Downloading {name} → {dest}")
+    t0 = time.time()
+    with metrics.span("model_download", model=name):
+        download_model(name, output_dir=str(staging))
+    shutil.rmtree(staging / ".cache", ignore_errors=True)
+
+    manifest = write_manifest(staging, name, source=f"huggingface:{name}")
+    _install(staging, dest)
+    logger.info(
+        f"✅ {name}: {len(manifest['files'])} files, "
+        f"{_size_mb(manifest):.0f} MB in {time.time() - t0:.1f}s"
+    )
+    return dest
+
+
+def add(src: Path, name: str = None, models_dir: Path = None) -> Path:
+    """
+    Copy an already converted CTranslate2 directory into the store.
+    """
+    src = Path(src)
+    name = name or src.name
+    dest = model_dir(name, models_dir)
+    staging = dest.with_name(f".{dest.name}.partial")
+    shutil.rmtree(staging, ignore_errors=True)
+
+    shutil.copytree(src, staging, ignore=shutil.ignore_patterns(MANIFEST, ".cache"))
+    manifest = write_manifest(staging, name, source=f"local:{src.resolve()}")
+    _install(staging, dest)
+    logger.info(f"✅ {name}: {len(manifest['files'])} files, {_size_mb(manifest):.0f} MB → {dest}")
+    return dest
+
+
+def stored(models_dir: Path = None) -> list:
+    root = Path(models_dir or MODELS_DIR)
+    if not root.is_dir():
+        return []
+    return sorted(p for p in root.iterdir() if (p / MANIFEST).is_file())
+
+
+def _size_mb(manifest: dict) -> float:
+    return sum(f["size"] for f in manifest["files"].values()) / 1e6
+
+
+# ------------------------------------------------------------
+# RESOLVE (used by whisper_backend.load_model)
+# ------------------------------------------------------------
+def resolve(name: str, models_dir: Path = None) -> str:
+    """
+    Local model directory for `name`, read once (verified) so the
+    following device init is timed on its own. A name that is already a
+    directory is used as is. Outside the store the model is downloaded
+    to the Hugging Face cache, unless MODEL_OFFLINE=1.
+    """
+    path = Path(name)
+    if not path.is_dir():
+        path = model_dir(name, models_dir)
+
+    if not (path / MANIFEST).is_file():
+        if path.is_dir():
+            return str(path)
+        if MODEL_OFFLINE:
+            raise FileNotFoundError(
+                f"MODEL_OFFLINE=1 and {name} is not in {path.parent} "
+                f"(python src/model_store.py fetch {name})"
+            )
+
+        from faster_whisper.utils import download_model
+
+        with metrics.span("model_download", model=name):
+            return download_model(name)
+
+    t0 = time.time()
+    with metrics.span("model_disk_read", model=name):
+        n_bytes = verify(path, checksums=MODEL_VERIFY)
+    elapsed = time.time() - t0
+
+    logger.info(
+        f"💾 {name} from {path}: {n_bytes / 1e6:.0f} MB read in {elapsed:.1f}s "
+        f"({n_bytes / 1e6 / max(elapsed, 1e-9):.0f} MB/s, "
+        f"{'sha256 verified' if MODEL_VERIFY else 'not verified'})"
+    )
+    return str(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Local model artifact store")
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("fetch").add_argument("name")
+    p = sub.add_parser("add")
+    p.add_argument("path", type=Path)
+    p.add_argument("--name")
+    sub.add_parser("verify").add_argument("names", nargs="*")
+    sub.add_parser("list")
+    args = parser.parse_args()
+
+    if args.cmd == "fetch":
+        fetch(args.name, args.models_dir)
+
+    elif args.cmd == "add":
+        add(args.path, args.name, args.models_dir)
+
+    elif args.cmd == "verify":
+        paths = [model_dir(n, args.models_dir) for n in args.names] or stored(args.models_dir)
+        failed = 0
+        for path in paths:
+            try:
+                t0 = time.time()
+                n_bytes = verify(path)
+                logger.info(f"✅ {path.name}: {n_bytes / 1e6:.0f} MB OK in {time.time() - t0:.1f}s")
+            except (ValueError, FileNotFoundError) as e:
+                logger.error(f"❌ {e}")
+                failed += 1
+        sys.exit(1 if failed or not paths else 0)
+
+    else:
+        for path in stored(args.models_dir):
+            m = read_manifest(path)
+            logger.info(f"🧠 {m['name']:<30} {_size_mb(m):8.0f} MB  {m['source']}  ({m['created']})")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Partial transcript, published while transcription runs
+
+After every clip the transcript so far (clip order) is republished next
+to the final outputs, so the first minutes can be read after one clip
+instead of after the whole GPU run, and a pod that dies still leaves a
+usable transcript behind:
+
+    outputs/partial_transcript.txt    progress header + text
+    outputs/partial_transcript.srt    subtitles (SRT has no header)
+    outputs/partial_transcript.vtt    WebVTT, progress in a NOTE block
+    outputs/partial_transcript.json   progress only (clips, audio, RTF, ETA)
+
+Segments are appended to spool files (outputs/.partial/) as they arrive;
+each publish writes header + spool to <name>.tmp and renames it over the
+previous file, so a reader never sees a half-written transcript. The ETA
+is the remaining audio × the real-time factor measured in this run.
+
+    PARTIAL_TRANSCRIPT=0     do not publish
+    PARTIAL_EVERY_SEC=10     publish at most every 10 s (default: every clip)
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+from pathlib import Path
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PARTIAL_TRANSCRIPT = os.environ.get("PARTIAL_TRANSCRIPT", "1") == "1"
+PARTIAL_EVERY_SEC = float(os.environ.get("PARTIAL_EVERY_SEC", "0"))
+
+PARTIAL_NAME = "partial_transcript"
+FORMATS = ("txt", "srt", "vtt")
+
+
+def clock(sec: float) -> str:
+    sec = int(round(sec))
+    return f"{sec // 3600}:{sec % 3600 // 60:02d}:{sec % 60:02d}"
+
+
+def cue_time(sec: float, sep: str) -> str:
+    ms = int(round(max(sec, 0.0) * 1000))
+    return f"{ms // 3_600_000:02d}:{ms % 3_600_000 // 60_000:02d}:{ms % 60_000 // 1000:02d}{sep}{ms % 1000:03d}"
+
+
+class PartialTranscript:
+    """
+    add(records) in clip order, progress(...) as clips complete (any
+    order), publish() after each clip, close() at the end.
+    """
+
+    def __init__(self, output_dir: Path, total_audio_sec: float, total_clips: int = None,
+                 done_audio_sec: float = 0.0, done_clips: int = 0,
+                 name: str = PARTIAL_NAME, every_sec: float = PARTIAL_EVERY_SEC):
+        self.output_dir = Path(output_dir)
+        self.name = name
+        self.every_sec = every_sec
+        self.spool_dir = self.output_dir / ".partial"
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.spools = {fmt: (self.spool_dir / f"{name}.{fmt}").open("w", encoding="utf-8")
+                       for fmt in FORMATS}
+
+        self.total_audio = total_audio_sec
+        self.total_clips = total_clips
+        self.done_audio = done_audio_sec
+        self.done_clips = done_clips
+        # RTF is measured on this run only (earlier runs' clips are free)
+        self.start_audio = done_audio_sec
+        self.t0 = time.time()
+
+        self.segments = 0
+        self.published_at = 0.0
+        self.first_published = None
+
+    def path(self, fmt: str) -> Path:
+        return self.output_dir / f"{self.name}.{fmt}"
+
+    # --------------------------------------------------------
+    # INPUT
+    # --------------------------------------------------------
+    def add(self, records):
+        txt, srt, vtt = (self.spools[fmt] for fmt in FORMATS)
+        for r in records:
+            if not r["text"]:
+                continue
+            self.segments += 1
+            txt.write(("" if self.segments == 1 else " ") + r["text"])
+            srt.write(
+                f"{self.segments}\n"
+                f"{cue_time(r['start'], ',')} --> {cue_time(r['end'], ',')}\n{r['text']}\n\n"
+            )
+            vtt.write(f"{cue_time(r['start'], '.')} --> {cue_time(r['end'], '.')}\n{r['text']}\n\n")
+
+    def progress(self, done_audio_sec: float, done_clips: int):
+        self.done_audio = done_audio_sec
+        self.done_clips = done_clips
+
+    # --------------------------------------------------------
+    # PROGRESS / ETA
+    # --------------------------------------------------------
+    def status(self, complete: bool = False) -> dict:
+        elapsed = time.time() - self.t0
+        run_audio = self.done_audio - self.start_audio
+        rtf = elapsed / run_audio if run_audio > 0 else None
+        remaining = 0.0 if complete else max(self.total_audio - self.done_audio, 0.0)
+        eta = remaining * rtf if rtf is not None else None
+
+        return {
+            "complete": complete,
+            "updated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "clips_done": self.done_clips,
+            "clips_total": self.total_clips,
+            "audio_done_sec": round(self.done_audio, 3),
+            "audio_total_sec": round(self.total_audio, 3),
+            "percent": round(100 * self.done_audio / max(self.total_audio, 1e-9), 1),
+            "segments": self.segments,
+            "elapsed_sec": round(elapsed, 3),
+            "rtf": round(rtf, 4) if rtf is not None else None,
+            "eta_sec": round(eta, 1) if eta is not None else None,
+            "eta_at": time.strftime("%H:%M:%S", time.localtime(time.time() + eta))
+                      if eta is not None else None,
+        }
+
+    def header(self, s: dict) -> list:
+        clips = f"{s['clips_done']}/{s['clips_total']}" if s["clips_total"] else f"{s['clips_done']}"
+        lines = [
+            f"{'COMPLETE' if s['complete'] else 'PARTIAL'} TRANSCRIPT — {clips} clips | "
+            f"{clock(s['audio_done_sec'])} of {clock(s['audio_total_sec'])} audio ({s['percent']}%)",
+        ]
+        if s["complete"]:
+            lines.append(f"Finished {s['updated']} after {clock(s['elapsed_sec'])}")
+        elif s["rtf"] is None:
+            lines.append(f"Updated {s['updated']} | ETA: measuring")
+        else:
+            lines.append(
+                f"Updated {s['updated']} | RTF {s['rtf']} ({1 / max(s['rtf'], 1e-9):.1f}× real time) "
+                f"| ETA {clock(s['eta_sec'])} (~{s['eta_at']})"
+            )
+        return lines
+
+    # --------------------------------------------------------
+    # PUBLISH (atomic replace)
+    # --------------------------------------------------------
+    def _replace(self, fmt: str, head: str):
+        out = self.path(fmt)
+        tmp = out.with_name(out.name + ".tmp")
+        self.spools[fmt].flush()
+        with tmp.open("w", encoding="utf-8") as f, \
+                (self.spool_dir / f"{self.name}.{fmt}").open(encoding="utf-8") as body:
+            f.write(head)
+            shutil.copyfileobj(body, f)
+        os.replace(tmp, out)
+
+    def publish(self, force: bool = False, complete: bool = False) -> bool:
+        now = time.time()
+        if not force and now - self.published_at < self.every_sec:
+            return False
+        self.published_at = now
+
+        s = self.status(complete)
+        lines = self.header(s)
+        with metrics.span("partial_publish"):
+            self._replace("txt", "".join(f"[{line}]\n" for line in lines) + "\n")
+            self._replace("srt", "")
+            self._replace("vtt", "WEBVTT\n\nNOTE\n" + "\n".join(lines) + "\n\n")
+
+            out = self.path("json")
+            tmp = out.with_name(out.name + ".tmp")
+            tmp.write_text(json.dumps(
+                {**s, "files": [self.path(fmt).name for fmt in FORMATS]}, indent=2
+            ), encoding="utf-8")
+            os.replace(tmp, out)
+
+        if self.first_published is None and self.segments:
+            self.first_published = now - self.t0
+            metrics.gauge("first_partial_sec", round(self.first_published, 3))
+            logger.info(
+                f"   📝 First partial transcript after {self.first_published:.1f}s "
+                f"→ {self.path('txt')}"
+            )
+        return True
+
+    def close(self, complete: bool):
+        if complete:
+            self.done_audio = max(self.done_audio, self.total_audio)
+        self.publish(force=True, complete=complete)
+        for f in self.spools.values():
+            f.close()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+        logger.info(
+            f"📝 {'Final' if complete else 'Partial'} transcript "
+            f"({self.segments} segments) → {self.path('txt').name}, .srt, .vtt"
+        )
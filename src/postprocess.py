@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Rule-based post-processing shared by stage 3 and the worker
+
+postprocess() streams raw_transcript.jsonl into refined_transcript.jsonl
+(transcript_io.py) segment by segment, plus a change log of every
+replacement (change_log.py); the raw vs refined diff is rendered from that
+log on request. Memory does not grow with the transcript, except for the
+optional diff. EXPORT_JSON=1 also writes refined_transcript.json.
+"""
+
+import os
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+
+import metrics
+from change_log import ChangeLogWriter, edit_records, render_diff
+from rule_engine import RULES_PATH, RuleEngine, load_rules
+from transcript_io import TranscriptReader, TranscriptWriter, export_refined_json, read_footer
+
+logger = logging.getLogger(__name__)
+
+EXPORT_JSON = os.environ.get("EXPORT_JSON", "0") == "1"
+
+# ------------------------------------------------------------
+# RULES (extend safely in config/rules/*.tsv|json)
+# ------------------------------------------------------------
+_engine = None
+
+
+def rule_engine() -> RuleEngine:
+    global _engine
+    if _engine is None:
+        rules = load_rules()
+        logger.info(f"📚 Loaded {len(rules)} rules from {', '.join(map(str, RULES_PATH))}")
+        with metrics.span("rule_compile"):
+            _engine = RuleEngine.compile(rules)
+    return _engine
+
+
+# ------------------------------------------------------------
+# POST-PROCESSING
+# ------------------------------------------------------------
+def refine_segments(segments, engine: RuleEngine, change_log: ChangeLogWriter,
+                    rule_stats: Counter, changes: list = None):
+    """
+    Generator: raw segments in, refined segments (same timing and
+    confidence, refined text) out; edits go to the change log.
+    """
+    for i, seg in enumerate(segments):
+        refined, spans = engine.rewrite(seg["text"])
+
+        if spans:
+            records = edit_records(i, seg, spans, engine)
+            change_log.write(records)
+            if changes is not None:
+                changes.extend(records)
+            for _, _, r in spans:
+                rule_stats[engine.patterns[r]] += 1
+            logger.debug(f"✏️ Line {i + 1} changed")
+
+        yield {**seg, "text": refined}
+
+
+def postprocess(input_file: Path, output_refined: Path, output_changes: Path,
+                output_diff: Path = None) -> dict:
+    """
+    output_diff=None → no diff (it can be rendered later from the change log).
+    """
+    start_time = time.time()
+
+    logger.info("=" * 80)
+    logger.info("🧹 RULE-BASED POST-PROCESSING STARTED")
+    logger.info(f"📄 Input  : {input_file}")
+    logger.info(f"📄 Output : {output_refined}")
+    logger.info("=" * 80)
+
+    # --------------------------------------------------------
+    # VALIDATION
+    # --------------------------------------------------------
+    if not input_file.exists():
+        raise FileNotFoundError(f"Raw transcript not found: {input_file}")
+
+    raw_footer = read_footer(input_file)
+
+    logger.info(f"🧩 Segments       : {raw_footer['segments']}")
+    logger.info(f"📊 Avg confidence : {raw_footer['avg_confidence']}")
+
+    # --------------------------------------------------------
+    # APPLY RULES (streaming)
+    # --------------------------------------------------------
+    logger.info("🔧 Applying normalization rules...")
+
+    engine = rule_engine()
+    rule_stats = Counter()
+    changes = [] if output_diff else None
+
+    raw = TranscriptReader(input_file)
+    writer = TranscriptWriter(output_refined, source=input_file.name, rules=len(engine.patterns))
+    try:
+        with ChangeLogWriter(output_changes) as change_log, \
+                metrics.span("rule_pass"), metrics.profiled("rules"):
+            for seg in refine_segments(raw, engine, change_log, rule_stats, changes):
+                writer.write((seg,))
+    except BaseException:
+        writer.abort()
+        raise
+
+    footer = writer.close(
+        avg_confidence=raw_footer["avg_confidence"],
+        changes=change_log.count,
+    )
+
+    metrics.count("segments", footer["segments"])
+    metrics.count("rule_changes", change_log.count)
+    for rule, hits in rule_stats.items():
+        metrics.count("rule_hits", hits, rule=rule)
+
+    logger.info("✅ Rule application complete")
+    logger.info(f"📝 Change log → {output_changes} ({change_log.count} edits)")
+
+    if rule_stats:
+        logger.info("📈 Rule hit counts:")
+        for rule, count in rule_stats.items():
+            logger.info(f"   '{rule}' → {count} replacements")
+    else:
+        logger.info("ℹ️ No rule replacements applied")
+
+    # --------------------------------------------------------
+    # DIFF (optional, from the change log)
+    # --------------------------------------------------------
+    diff = []
+    if output_diff:
+        logger.info("📐 Rendering raw vs refined diff from change log...")
+
+        with metrics.span("render_diff"):
+            raw_lines = [s["text"] for s in TranscriptReader(input_file)]
+            diff = render_diff(raw_lines, changes)
+
+        with output_diff.open("w", encoding="utf-8") as f:
+            f.write("\n".join(diff))
+
+        logger.info(
+            f"📄 Diff saved → {output_diff} "
+            f"({len(diff)} diff lines)"
+        )
+
+    # --------------------------------------------------------
+    # JSON EXPORT (optional, previous format)
+    # --------------------------------------------------------
+    if EXPORT_JSON:
+        json_path = output_refined.with_suffix(".json")
+        export_refined_json(output_refined, input_file, json_path)
+        logger.info(f"📄 Exported: {json_path}")
+
+    # --------------------------------------------------------
+    # DONE
+    # --------------------------------------------------------
+    elapsed = time.time() - start_time
+
+    logger.info("=" * 80)
+    logger.info("✅ POST-PROCESSING COMPLETE")
+    logger.info(f"⏱️ Time taken : {elapsed:.2f}s")
+    logger.info(f"📄 Refined    : {output_refined}")
+    logger.info(f"📄 Changes    : {output_changes}")
+    if output_diff:
+        logger.info(f"📄 Diff       : {output_diff}")
+    logger.info("=" * 80)
+
+    return {
+        "segments": footer["segments"],
+        "rule_hits": dict(rule_stats),
+        "changes": change_log.count,
+        "diff_lines": len(diff),
+        "elapsed_sec": round(elapsed, 3),
+    }
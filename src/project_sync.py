@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Incremental, content-addressed project sync (instead of tar + scp + untar)
+
+Both sides describe their tree as a manifest of fixed-size chunks
+(SYNC_CHUNK_MB, sha256 each). Only chunks the receiving side cannot find
+in its own files are sent; every changed file is reassembled from
+received and local chunks, checked against its sha256 and swapped in
+atomically. A changed script costs one chunk; audio already on the pod
+costs nothing.
+
+    python src/project_sync.py push root@213.192.2.85:/workspace/transcribe-whisper-cloud-gpu \\
+        --port 40070 --key ~/.ssh/id_ed25519
+    python src/project_sync.py pull root@213.192.2.85:/workspace/transcribe-whisper-cloud-gpu/outputs \\
+        --to outputs --port 40070 --key ~/.ssh/id_ed25519
+
+A local directory can stand in for the remote (measures the transfer
+without a pod):
+
+    python src/project_sync.py push /tmp/pod_copy [--dry-run]
+
+Over SSH the remote side is this file, sent inline (`python3 -c`), so
+nothing has to be installed on the pod. Stdlib only. State lives in
+<root>/.sync/ on both sides (scan cache, tracked files); push removes
+files it had synced before and that are gone locally, never anything
+else (outputs, clips and caches on the pod are left alone).
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import shlex
+import fnmatch
+import hashlib
+import logging
+import argparse
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+CHUNK_SIZE = int(float(os.environ.get("SYNC_CHUNK_MB", "4")) * 1024 * 1024)
+SYNC_DIR = ".sync"
+
+# Same as 02_upload_to_pod.sh, plus what the pod produces itself
+PUSH_EXCLUDES = [
+    ".git", ".idea", "__pycache__", "*.pyc", "*.tar.gz", ".DS_Store", "._*",
+    SYNC_DIR, "outputs", "cache", "jobs",
+]
+PULL_EXCLUDES = [SYNC_DIR, "*.tmp", "*.partial", "*.tar.gz"]
+
+
+# ------------------------------------------------------------
+# MANIFEST
+# ------------------------------------------------------------
+def _excluded(rel: str, excludes) -> bool:
+    parts = rel.split("/")
+    return any(fnmatch.fnmatch(p, pat) for pat in excludes for p in parts)
+
+
+def _hash_file(path: Path, chunk_size: int) -> dict:
+    whole = hashlib.sha256()
+    chunks = []
+    with open(path, "rb") as f:
+        while block := f.read(chunk_size):
+            whole.update(block)
+            chunks.append(hashlib.sha256(block).hexdigest())
+    return {"sha256": whole.hexdigest(), "chunks": chunks}
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+# ------------------------------------------------------------
+# ENDPOINT (one side of the sync, a local directory)
+# ------------------------------------------------------------
+class LocalEndpoint:
+    def __init__(self, root, excludes=PUSH_EXCLUDES, chunk_size: int = CHUNK_SIZE):
+        self.root = Path(root).expanduser()
+        self.excludes = list(excludes)
+        self.chunk_size = chunk_size
+        self.sync_dir = self.root / SYNC_DIR
+        self.staging = self.sync_dir / "chunks"
+        self.files = None
+        self.index = {}   # chunk id → (rel, offset, length)
+
+    def scan(self) -> dict:
+        """
+        {"chunk_size", "files": {rel: {size, mtime_ns, mode, sha256, chunks}}};
+        files unchanged since the last scan (size + mtime) are not re-hashed.
+        """
+        cache_path = self.sync_dir / "scan_cache.json"
+        cache = _read_json(cache_path, {})
+        if cache.get("chunk_size") != self.chunk_size:
+            cache = {}
+        cached = cache.get("files", {})
+
+        files = {}
+        if self.root.is_dir():
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, "/")
+                rel_dir = "" if rel_dir == "." else rel_dir + "/"
+                dirnames[:] = [d for d in dirnames if not _excluded(rel_dir + d, self.excludes)]
+
+                for name in filenames:
+                    rel = rel_dir + name
+                    path = Path(dirpath) / name
+                    if _excluded(rel, self.excludes) or not path.is_file():
+                        continue
+                    st = path.stat()
+                    entry = cached.get(rel)
+                    if not entry or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                 **_hash_file(path, self.chunk_size)}
+                    entry["mode"] = st.st_mode & 0o777
+                    files[rel] = entry
+
+        self._set_files(files)
+        _write_json(cache_path, {"chunk_size": self.chunk_size, "files": files})
+        return {"chunk_size": self.chunk_size, "files": files}
+
+    def _set_files(self, files: dict):
+        self.files = files
+        self.index = {}
+        for rel, entry in files.items():
+            for i, cid in enumerate(entry["chunks"]):
+                offset = i * self.chunk_size
+                self.index.setdefault(cid, (rel, offset, min(self.chunk_size, entry["size"] - offset)))
+
+    def read_chunk(self, cid: str) -> bytes:
+        staged = self.staging / cid
+        if staged.is_file():
+            return staged.read_bytes()
+        rel, offset, length = self.index[cid]
+        with open(self.root / rel, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    # --------------------------------------------------------
+    # RECEIVING SIDE
+    # --------------------------------------------------------
+    def missing(self, ids: list) -> list:
+        if self.files is None:
+            self.scan()
+        return [cid for cid in ids if cid not in self.index and not (self.staging / cid).is_file()]
+
+    def put(self, cid: str, data: bytes):
+        if hashlib.sha256(data).hexdigest() != cid:
+            raise ValueError(f"Chunk {cid[:12]} corrupted in transfer")
+        self.staging.mkdir(parents=True, exist_ok=True)
+        tmp = self.staging / (cid + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self.staging / cid)
+
+    def apply(self, manifest: dict, prune: bool = False) -> dict:
+        """
+        Make the tree match `manifest`: reassemble changed files from
+        staged and local chunks, verify, then swap them in. All new files
+        are built before any is replaced, so chunks can come from files
+        that are about to change.
+        """
+        if manifest["chunk_size"] != self.chunk_size:
+            raise ValueError("Chunk size differs between the two sides")
+        if self.files is None:
+            self.scan()
+
+        changed = {
+            rel: entry for rel, entry in manifest["files"].items()
+            if self.files.get(rel, {}).get("sha256") != entry["sha256"]
+        }
+
+        built = []
+        try:
+            for rel, entry in changed.items():
+                dest = self.root / rel
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                tmp = dest.with_name(dest.name + ".sync-tmp")
+                whole = hashlib.sha256()
+                with open(tmp, "wb") as f:
+                    for cid in entry["chunks"]:
+                        data = self.read_chunk(cid)
+                        whole.update(data)
+                        f.write(data)
+                if whole.hexdigest() != entry["sha256"]:
+                    raise ValueError(f"{rel}: checksum mismatch after reassembly")
+                os.chmod(tmp, entry["mode"])
+                built.append((tmp, dest))
+        except BaseException:
+            for tmp, _ in built:
+                tmp.unlink(missing_ok=True)
+            raise
+
+        for tmp, dest in built:
+            os.replace(tmp, dest)
+
+        tracked_path = self.sync_dir / "tracked.json"
+        deleted = 0
+        if prune:
+            for rel in set(_read_json(tracked_path, [])) - set(manifest["files"]):
+                path = self.root / rel
+                if path.is_file():
+                    path.unlink()
+                    deleted += 1
+        _write_json(tracked_path, sorted(manifest["files"]))
+
+        for p in self.staging.glob("*"):
+            p.unlink()
+
+        # the new files are known: record them without hashing again
+        files = {rel: e for rel, e in self.files.items() if (self.root / rel).is_file()}
+        for rel, entry in changed.items():
+            st = (self.root / rel).stat()
+            files[rel] = {**entry, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self._set_files(files)
+        _write_json(self.sync_dir / "scan_cache.json", {"chunk_size": self.chunk_size, "files": files})
+
+        return {
+            "written": len(changed),
+            "written_bytes": sum(e["size"] for e in changed.values()),
+            "deleted": deleted,
+        }
+
+    def close(self):
+        pass
+
+
+# ------------------------------------------------------------
+# REMOTE ENDPOINT (same calls over ssh → `serve`)
+# ------------------------------------------------------------
+class RemoteEndpoint:
+    """
+    Runs this file on the remote host (`python3 -c <source> serve <root>`)
+    and speaks to it over stdin/stdout: one JSON line per message, an
+    optional binary payload of "size" bytes after it (zlib when "z").
+    """
+
+    def __init__(self, target: str, root: str, excludes, port=None, key=None,
+                 chunk_size: int = CHUNK_SIZE):
+        ssh = shlex.split(os.environ.get("SYNC_SSH", "ssh"))
+        if port:
+            ssh += ["-p", str(port)]
+        if key:
+            ssh += ["-i", os.path.expanduser(key)]
+
+        source = Path(__file__).read_text(encoding="utf-8")
+        remote_cmd = " ".join(
+            ["SYNC_CHUNK_MB=" + str(chunk_size / 1024 / 1024), "python3", "-c", shlex.quote(source),
+             "serve", shlex.quote(root)]
+            + [f"--exclude={shlex.quote(e)}" for e in excludes]
+        )
+        self.chunk_size = chunk_size
+        self.proc = subprocess.Popen(ssh + [target, remote_cmd], stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE)
+
+    def _call(self, op: str, payload: bytes = None, reply: bool = True, **args):
+        send_message(self.proc.stdin, {"op": op, **args}, payload)
+        if not reply:
+            return None
+        header, data = read_message(self.proc.stdout)
+        if header is None:
+            raise RuntimeError(f"Remote sync ended unexpectedly (exit {self.proc.wait()})")
+        if "error" in header:
+            raise RuntimeError(f"Remote: {header['error']}")
+        return data if data is not None else header.get("result")
+
+    def scan(self):
+        return self._call("scan")
+
+    def read_chunk(self, cid):
+        return self._call("read_chunk", cid=cid)
+
+    def missing(self, ids):
+        return self._call("missing", ids=ids)
+
+    def put(self, cid, data):
+        # no reply: chunks stream without a round trip each; a failed put
+        # surfaces as the error of the next call
+        self._call("put", payload=data, reply=False, cid=cid)
+
+    def apply(self, manifest, prune=False):
+        return self._call("apply", manifest=manifest, prune=prune)
+
+    def close(self):
+        try:
+            send_message(self.proc.stdin, {"op": "bye"})
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.proc.wait()
+
+
+def send_message(stream, header: dict, payload: bytes = None):
+    if payload is not None:
+        packed = zlib.compress(payload, 1)
+        if len(packed) < len(payload):
+            header, payload = {**header, "z": 1}, packed
+        header = {**header, "size": len(payload)}
+    stream.write(json.dumps(header).encode() + b"\n")
+    if payload is not None:
+        stream.write(payload)
+    stream.flush()
+
+
+def read_message(stream):
+    line = stream.readline()
+    if not line:
+        return None, None
+    header = json.loads(line)
+    data = None
+    if "size" in header:
+        data = stream.read(header["size"])
+        if header.get("z"):
+            data = zlib.decompress(data)
+    return header, data
+
+
+def serve(root: str, excludes):
+    """
+    Remote side: answer endpoint calls on stdin/stdout until "bye".
+    """
+    endpoint = LocalEndpoint(root, excludes)
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    pending_error = None
+
+    while True:
+        header, data = read_message(stdin)
+        if header is None or header["op"] == "bye":
+            return
+        op = header.pop("op")
+        for k in ("size", "z"):
+            header.pop(k, None)
+
+        try:
+            if op == "put":
+                endpoint.put(header["cid"], data)
+                continue
+            if pending_error:
+                raise pending_error
+            result = getattr(endpoint, op)(**header)
+        except Exception as e:
+            if op == "put":
+                pending_error = pending_error or e
+                continue
+            pending_error = None
+            send_message(stdout, {"error": f"{type(e).__name__}: {e}"})
+            continue
+
+        if isinstance(result, bytes):
+            send_message(stdout, {}, result)
+        else:
+            send_message(stdout, {"result": result})
+
+
+# ------------------------------------------------------------
+# SYNC
+# ------------------------------------------------------------
+def sync(src, dst, prune: bool = False, dry_run: bool = False) -> dict:
+    t0 = time.time()
+    manifest = src.scan()
+    t_scan = time.time() - t0
+
+    cs = manifest["chunk_size"]
+    lengths = {
+        cid: min(cs, e["size"] - i * cs)
+        for e in manifest["files"].values() for i, cid in enumerate(e["chunks"])
+    }
+    ids = list(lengths)
+    missing = dst.missing(ids)
+    total_bytes = sum(e["size"] for e in manifest["files"].values())
+
+    sent = 0
+    t1 = time.time()
+    if not dry_run:
+        for cid in missing:
+            data = src.read_chunk(cid)
+            dst.put(cid, data)
+            sent += len(data)
+        applied = dst.apply(manifest, prune=prune)
+    else:
+        sent = sum(lengths[cid] for cid in missing)
+        applied = {"written": None, "written_bytes": None, "deleted": None}
+    elapsed = time.time() - t0
+
+    return {
+        "files": len(manifest["files"]),
+        "bytes": total_bytes,
+        "chunks": len(ids),
+        "chunks_sent": len(missing),
+        "bytes_sent": sent,
+        "saved_pct": round(100 * (1 - sent / max(total_bytes, 1)), 2),
+        "scan_sec": round(t_scan, 3),
+        "transfer_sec": round(time.time() - t1, 3),
+        "elapsed_sec": round(elapsed, 3),
+        **applied,
+    }
+
+
+def endpoint(spec: str, excludes, port=None, key=None):
+    """
+    "user@host:/path" → RemoteEndpoint, anything else → local directory.
+    """
+    host, sep, path = spec.partition(":")
+    if sep and "/" not in host and not Path(spec).exists():
+        return RemoteEndpoint(host, path, excludes, port=port, key=key)
+    return LocalEndpoint(spec, excludes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental content-addressed project sync")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    for name in ("push", "pull"):
+        p = sub.add_parser(name)
+        p.add_argument("remote", help="user@host:/path, or a local directory standing in for it")
+        p.add_argument("--port")
+        p.add_argument("--key")
+        p.add_argument("--exclude", action="append", default=[])
+        p.add_argument("--dry-run", action="store_true", help="only report what would be sent")
+        p.add_argument("--out", type=Path, help="write the transfer report as JSON")
+    sub.choices["push"].add_argument("--from", dest="local", help="default: project root")
+    sub.choices["push"].add_argument("--no-prune", action="store_true")
+    sub.choices["pull"].add_argument("--to", dest="local", default="outputs")
+
+    s = sub.add_parser("serve")
+    s.add_argument("root")
+    s.add_argument("--exclude", action="append", default=[])
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        serve(args.root, args.exclude)
+        return
+
+    if args.cmd == "push" and not args.local:
+        args.local = str(Path(__file__).resolve().parent.parent)
+
+    excludes = (PUSH_EXCLUDES if args.cmd == "push" else PULL_EXCLUDES) + args.exclude
+    remote = endpoint(args.remote, excludes, args.port, args.key)
+    local = LocalEndpoint(args.local, excludes)
+    src, dst = (local, remote) if args.cmd == "push" else (remote, local)
+
+    arrow = "→" if args.cmd == "push" else "←"
+    logger.info(f"🔁 {args.cmd}: {args.local} {arrow} {args.remote}")
+    try:
+        report = sync(src, dst, prune=args.cmd == "push" and not args.no_prune, dry_run=args.dry_run)
+    finally:
+        remote.close()
+
+    mb = 1024 * 1024
+    logger.info(
+        f"📦 {report['files']} files, {report['bytes'] / mb:.1f} MB in {report['chunks']} chunks "
+        f"(scan {report['scan_sec']:.1f}s)"
+    )
+    logger.info(
+        f"📤 Sent {report['chunks_sent']} chunks, {report['bytes_sent'] / mb:.1f} MB "
+        f"({report['saved_pct']}% saved vs full copy) in {report['transfer_sec']:.1f}s"
+        + ("" if args.dry_run else
+           f" | {report['written']} files updated, {report['deleted']} removed")
+    )
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        logger.info(f"📄 Saved: {args.out}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern correction engine (Aho-Corasick)
+
+All rules are compiled into one automaton and applied in a single pass
+over each segment, so cost grows with text length, not rules × text.
+
+Overlapping rules: the leftmost match wins; at the same start the
+longest pattern wins. Replaced text is not re-scanned (no rule chains).
+
+Rules come from dictionary files, loaded in name order (a later file
+overrides an earlier one for the same pattern):
+
+    config/rules/*.tsv    wrong<TAB>right, '#' comments
+    config/rules/*.json   {"wrong": "right", ...} or [["wrong", "right"], ...]
+
+    RULES_PATH=a.tsv:glossary/   (files or directories, overrides the default)
+
+The compiled automaton is cached as JSON in cache/rules/, keyed by a hash
+of the rule set, so unchanged glossaries are not rebuilt on every run.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import Counter, deque
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+RULES_PATH = [
+    Path(p) for p in
+    os.environ.get("RULES_PATH", str(PROJECT_ROOT / "config" / "rules")).split(os.pathsep)
+    if p
+]
+AUTOMATON_CACHE = PROJECT_ROOT / "cache" / "rules"
+
+ENGINE_VERSION = 1
+
+
+# ------------------------------------------------------------
+# DICTIONARIES
+# ------------------------------------------------------------
+def _read_tsv(path: Path):
+    for n, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        line = line.strip("\r\n")
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        parts = line.split("\t")
+        if len(parts) != 2 or not parts[0]:
+            raise ValueError(f"{path}:{n}: expected 'wrong<TAB>right', got {line!r}")
+        yield parts[0], parts[1]
+
+
+def _read_json(path: Path):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    pairs = data.items() if isinstance(data, dict) else data
+    for wrong, right in pairs:
+        yield wrong, right
+
+
+def rule_files(paths=None):
+    files = []
+    for p in paths or RULES_PATH:
+        if p.is_dir():
+            files.extend(sorted(
+                f for f in p.iterdir() if f.suffix in (".tsv", ".json")
+            ))
+        elif p.exists():
+            files.append(p)
+        else:
+            logger.warning(f"⚠️ Rules path not found: {p}")
+    return files
+
+
+def load_rules(paths=None) -> dict:
+    """
+    wrong → right, in load order.
+    """
+    rules = {}
+    for path in rule_files(paths):
+        reader = _read_json if path.suffix == ".json" else _read_tsv
+        for wrong, right in reader(path):
+            if wrong in rules and rules[wrong] != right:
+                logger.warning(
+                    f"⚠️ {path.name}: '{wrong}' → '{right}' overrides '{rules[wrong]}'"
+                )
+            rules[wrong] = right
+    return rules
+
+
+# ------------------------------------------------------------
+# AUTOMATON
+# ------------------------------------------------------------
+def build_automaton(patterns):
+    """
+    goto[state]: char → state, fail[state], out[state]: pattern index
+    ending here (or -1), dict_link[state]: next state on the fail chain
+    with an output (or -1).
+    """
+    goto, out = [{}], [-1]
+    for i, pattern in enumerate(patterns):
+        state = 0
+        for ch in pattern:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                out.append(-1)
+            state = nxt
+        out[state] = i
+
+    fail = [0] * len(goto)
+    dict_link = [-1] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0) if goto[f].get(ch, 0) != nxt else 0
+            dict_link[nxt] = fail[nxt] if out[fail[nxt]] >= 0 else dict_link[fail[nxt]]
+            queue.append(nxt)
+
+    return {"goto": goto, "fail": fail, "out": out, "dict_link": dict_link}
+
+
+class RuleEngine:
+    def __init__(self, rules: dict, automaton: dict = None):
+        self.patterns = list(rules)
+        self.replacements = list(rules.values())
+        a = automaton or build_automaton(self.patterns)
+        self._goto = a["goto"]
+        self._fail = a["fail"]
+        self._out = a["out"]
+        self._dict_link = a["dict_link"]
+
+    @classmethod
+    def compile(cls, rules: dict, cache_dir: Path = AUTOMATON_CACHE) -> "RuleEngine":
+        """
+        Engine for `rules`, reusing a cached automaton when the rule set
+        is unchanged.
+        """
+        digest = hashlib.sha256(
+            json.dumps([ENGINE_VERSION, list(rules)], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+        cache_file = Path(cache_dir) / f"automaton_{digest}.json"
+
+        if cache_file.exists():
+            try:
+                engine = cls(rules, json.loads(cache_file.read_text(encoding="utf-8")))
+                logger.info(f"⚡ Loaded compiled rules ({len(rules)} patterns) → {cache_file.name}")
+                return engine
+            except (ValueError, KeyError):
+                logger.warning(f"⚠️ Ignoring unreadable automaton cache {cache_file.name}")
+
+        engine = cls(rules)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "goto": engine._goto, "fail": engine._fail,
+            "out": engine._out, "dict_link": engine._dict_link,
+        }, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, cache_file)
+        logger.info(
+            f"🔧 Compiled {len(rules)} rules → {len(engine._goto)} states ({cache_file.name})"
+        )
+        return engine
+
+    # --------------------------------------------------------
+    # MATCHING
+    # --------------------------------------------------------
+    def matches(self, text: str):
+        """
+        Non-overlapping (start, end, rule index), leftmost then longest.
+        """
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        patterns = self.patterns
+
+        found = []
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            s = state if out[state] >= 0 else dict_link[state]
+            while s > 0:
+                i = out[s]
+                found.append((pos + 1 - len(patterns[i]), pos + 1, i))
+                s = dict_link[s]
+
+        if not found:
+            return []
+
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        selected, last_end = [], 0
+        for start, end, i in found:
+            if start >= last_end:
+                selected.append((start, end, i))
+                last_end = end
+        return selected
+
+    def rewrite(self, text: str):
+        """
+        (refined text, applied (start, end, rule index) spans in `text`).
+        """
+        spans = self.matches(text)
+        if not spans:
+            return text, spans
+
+        parts, pos = [], 0
+        for start, end, i in spans:
+            parts.append(text[pos:start])
+            parts.append(self.replacements[i])
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts), spans
+
+    def apply(self, text: str, stats: Counter) -> str:
+        refined, spans = self.rewrite(text)
+        for _, _, i in spans:
+            stats[self.patterns[i]] += 1
+        return refined
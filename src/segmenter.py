@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Silence-aware segmenter shared by stage 1 and the streaming runner
+
+iter_clips() yields one clip record (the pipeline_state.json entry) as
+soon as its cut is known, so callers can hand clips downstream while the
+rest of the input is still being segmented. With precomputed bounds (the
+speech regions of vad_segmenter.py) it only writes the clips.
+"""
+
+import os
+import logging
+from pathlib import Path
+
+from audio_store import SAMPLE_RATE, decode_to_array, ms_to_sample
+from silence_engine import plan_clips
+from wav_reader import MappedWav, StreamingEnvelope
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+MAX_MS = 30_000
+MIN_CLIP_MS = 12_000
+MIN_SILENCE = 600
+THRESH = -40
+KEEP_SILENCE_MS = 300
+
+CLIP_MODES = ("wav", "array")
+
+# energy → -40 dBFS silence cuts (default), vad → speech regions only
+SEGMENTER = os.environ.get("SEGMENTER", "energy")
+SEGMENTERS = ("energy", "vad")
+
+
+# ------------------------------------------------------------
+# SEGMENTATION
+# ------------------------------------------------------------
+def iter_clips(audio: MappedWav, out_dir: Path, project_root: Path,
+               clip_mode: str = "wav", bounds=None):
+    """
+    Yield pipeline_state clip records in order.
+
+    wav   → clip written to out_dir/clip_NNN.wav from the mapped buffer
+    array → sample range into the 16 kHz array (see write_audio_array)
+
+    bounds: [(start_ms, end_ms)] to use instead of the energy cut plan.
+    """
+    bounds = bounds if bounds is not None else plan_clips(
+        StreamingEnvelope(audio),
+        len(audio),
+        audio.channels,
+        audio.sample_width,
+        max_ms=MAX_MS,
+        min_clip_ms=MIN_CLIP_MS,
+        min_silence_ms=MIN_SILENCE,
+        thresh=THRESH,
+        keep_silence_ms=KEEP_SILENCE_MS
+    )
+
+    for clip_idx, (start_ms, end_ms) in enumerate(bounds):
+        if clip_mode == "wav":
+            fname = out_dir / f"clip_{clip_idx:03d}.wav"
+            duration_ms = audio.write_clip(fname, start_ms, end_ms)
+
+            clip = {
+                "file": str(fname.relative_to(project_root)),
+                "start_ms": start_ms,
+                "duration_ms": duration_ms
+            }
+        else:
+            duration_ms = audio.clip_duration_ms(start_ms, end_ms)
+
+            clip = {
+                "name": f"clip_{clip_idx:03d}",
+                "start_ms": start_ms,
+                "duration_ms": duration_ms,
+                "start_sample": ms_to_sample(start_ms),
+                "end_sample": ms_to_sample(start_ms + duration_ms)
+            }
+
+        logger.info(
+            f"✂️ Clip {clip_idx+1:03d} | "
+            f"start={start_ms/1000:.1f}s | "
+            f"dur={duration_ms/1000:.1f}s"
+        )
+
+        yield clip
+
+        # Later windows never start before this clip
+        audio.release(start_ms)
+
+
+def write_audio_array(input_path: Path, array_path: Path, project_root: Path,
+                      clips: list, n_samples: int = None) -> dict:
+    """
+    Array mode: single decode to 16 kHz mono float32 (skipped when the
+    array was already decoded, n_samples given). Clamps clip sample
+    ranges to the decoded length and returns the state "audio_array" entry.
+    """
+    if n_samples is None:
+        logger.info(f"🎛️ Decoding input → {SAMPLE_RATE} Hz float32 array")
+        n_samples = decode_to_array(input_path, array_path)
+
+    for clip in clips:
+        clip["end_sample"] = min(clip["end_sample"], n_samples)
+
+    logger.info(
+        f"🎛️ Array written → {array_path} "
+        f"({n_samples * 4 / 1e6:.0f} MB)"
+    )
+
+    return {
+        "file": str(array_path.relative_to(project_root)),
+        "sample_rate": SAMPLE_RATE,
+        "dtype": "float32",
+        "samples": n_samples
+    }
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Sharded stage 2 — one long file split over N worker processes
+
+Each worker loads its own model (on SHARD_DEVICES[i % len], e.g. one per
+GPU) and pulls clip indices from one shared queue, so a worker stuck on a
+slow clip never holds back clips another worker could take (work
+stealing). Workers record completion by appending to the shared
+checkpoint journal (locked, fsync'd), and the parent assembles
+raw_transcript.jsonl in clip order, so the output does not depend on
+which worker ran which clip. While the workers run, the parent follows
+the journal and publishes the ordered prefix as the partial transcript.
+
+With WHISPER_DEVICE=cpu the workers are CPU replicas: every worker gets
+cpu_count / SHARDS threads (or WHISPER_CPU_THREADS) so the replicas do
+not oversubscribe the cores. With CASCADE=1 every worker loads the draft
+and the main model (cascade.py); the parent sums their cascade stats.
+"""
+
+import os
+import queue
+import time
+import logging
+import multiprocessing as mp
+from pathlib import Path
+
+import checkpoint
+import metrics
+import whisper_backend
+from assemble_transcript import IncrementalAssembler
+from cascade import Cascade
+from partial_transcript import PARTIAL_TRANSCRIPT
+from transcriber import TranscriptionJob, fmt
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+# Device index per worker (round-robin), e.g. "0,1,2,3" for 4 GPUs
+SHARD_DEVICES = [int(d) for d in os.environ.get("SHARD_DEVICES", "0").split(",")]
+
+# also how often the parent picks up journaled clips for the partial transcript
+RESULT_POLL_SEC = 1.0
+
+
+def _shard_worker(worker_id, device_index, cpu_threads, root, state_file, batch_size,
+                  use_cascade, tasks, results):
+    """
+    Runs in a spawned process: load a model, transcribe clips from the
+    shared queue until the None sentinel, send records back.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    cascade = None
+    if use_cascade:
+        cascade = Cascade.load(device_index=device_index, cpu_threads=cpu_threads)
+        model = cascade.large
+    else:
+        model = whisper_backend.load_model(device_index=device_index, cpu_threads=cpu_threads)
+    job = TranscriptionJob(
+        model, root=root, state_file=state_file, output_dir=root,
+        batch_size=batch_size, cascade=cascade
+    )
+    job.load_state()
+
+    def claimed():
+        for idx in iter(tasks.get, None):
+            yield idx, job.clips[idx]
+
+    with metrics.profiled(f"transcribe_shard{worker_id}"):
+        job.transcribe(claimed())
+    metrics.export(f"transcribe_shard{worker_id}")
+    results.put((worker_id, job.records, job.audio_sec, job.cache.stats(),
+                 cascade.stats if cascade else None))
+
+
+def run_sharded(root: Path, state_file: Path, output_dir: Path,
+                workers: int, batch_size: int = 0, use_cascade: bool = False) -> dict:
+    # parent cascade: no models, only the summed worker stats
+    job = TranscriptionJob(
+        None, root=root, state_file=state_file, output_dir=output_dir,
+        cascade=Cascade(None, None) if use_cascade else None
+    )
+    job.load_state()
+
+    logger.info(f"📁 Total clips      : {len(job.clips)}")
+    logger.info(f"⚡ Already processed: {len(job.processed)}")
+
+    pending = job.pending()
+    if not pending:
+        # resumed, already complete job: no worker (and no model load)
+        logger.info("✅ Nothing to transcribe — assembling the transcript only")
+        job.assembler = IncrementalAssembler(
+            state_file, job.output_path, job.cache, publish_partial=PARTIAL_TRANSCRIPT
+        )
+        job.state = checkpoint.compact(state_file)
+        job.processed = set(job.state["clips_processed"])
+        job.cache.report()
+        return job.write_output(0.0)
+
+    workers = max(1, min(workers, len(pending)))
+
+    on_cpu = whisper_backend.DEVICE == "cpu"
+    cpu_threads = whisper_backend.replica_threads(workers)
+
+    logger.info(
+        f"🔀 Sharding {len(pending)} clips over {workers} workers "
+        + (f"(CPU replicas, {cpu_threads} threads each)" if on_cpu else f"(devices={SHARD_DEVICES})")
+    )
+    overall_start = time.time()
+
+    # Completed clips reach raw_transcript.jsonl / the partial transcript
+    # from the journal + cache as workers finish them, in clip order
+    # (started before the workers, whose cache puts evict old entries)
+    job.assembler = IncrementalAssembler(
+        state_file, job.output_path, job.cache,
+        pending=[idx for idx, _ in pending], cached=job.cached_records,
+        publish_partial=PARTIAL_TRANSCRIPT
+    )
+
+    # spawn: every worker initialises its own CUDA context
+    ctx = mp.get_context("spawn")
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+
+    for idx, _ in pending:
+        tasks.put(idx)
+    for _ in range(workers):
+        tasks.put(None)
+
+    procs = {}
+    for i in range(workers):
+        p = ctx.Process(
+            target=_shard_worker,
+            args=(i, 0 if on_cpu else SHARD_DEVICES[i % len(SHARD_DEVICES)], cpu_threads,
+                  Path(root), Path(state_file), batch_size, use_cascade, tasks, results),
+            name=f"shard-{i}",
+        )
+        p.start()
+        procs[i] = p
+
+    # Collect results; a worker that died without reporting is a failure
+    remaining = set(procs)
+    failed = []
+    while remaining:
+        job.assembler.follow(checkpoint.load_state(state_file))
+        try:
+            worker_id, records, audio_sec, cache, cascade_stats = results.get(timeout=RESULT_POLL_SEC)
+        except queue.Empty:
+            for i in list(remaining):
+                if not procs[i].is_alive() and procs[i].exitcode != 0:
+                    logger.error(f"❌ Worker {i} exited with code {procs[i].exitcode}")
+                    failed.append(i)
+                    remaining.discard(i)
+            continue
+
+        remaining.discard(worker_id)
+        job.records.update(records)
+        job.clips_this_run += len(records)
+        job.audio_sec += audio_sec
+        job.cache.hits += cache["hits"]
+        job.cache.misses += cache["misses"]
+        job.cache.evicted += cache["evicted"]
+        if cascade_stats:
+            job.cascade.merge_stats(cascade_stats)
+        # worker counters land in the stage totals (details: transcribe_shard<N>)
+        metrics.count("transcript_cache_hits", cache["hits"])
+        metrics.count("transcript_cache_misses", cache["misses"])
+        metrics.count("clips", len(records), source="shards")
+        logger.info(
+            f"✅ Worker {worker_id} done | clips={len(records)} | "
+            f"cache hits={cache['hits']}"
+        )
+
+    for p in procs.values():
+        p.join()
+
+    # results that did not come through the cache (e.g. evicted)
+    for idx in sorted(job.records):
+        if idx in job.assembler.pending:
+            job.assembler.add(idx, job.records[idx])
+
+    if failed:
+        job.assembler.abort()
+        raise RuntimeError(
+            f"{len(failed)} worker(s) failed — completed clips are checkpointed, "
+            f"rerun to resume"
+        )
+
+    total_time = time.time() - overall_start
+    metrics.gauge("audio_seconds", round(job.audio_sec, 3))
+    metrics.gauge("transcribe_wall_seconds", round(total_time, 3))
+    metrics.gauge("rtf", round(total_time / max(job.audio_sec, 1e-9), 6))
+    metrics.gauge("shards", workers)
+    job.state = checkpoint.compact(state_file)
+    job.processed = set(job.state["clips_processed"])
+
+    logger.info("=" * 80)
+    logger.info("🧩 Sharded transcription complete")
+    logger.info(f"⏱️ Total time: {fmt(total_time)}")
+    logger.info(
+        f"🚀 Throughput: {job.audio_sec / max(total_time, 1e-9):.1f} audio-s/s "
+        f"({workers} workers)"
+    )
+    job.cache.report()
+    if job.cascade is not None:
+        job.cascade.report()
+
+    return job.write_output(total_time)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Vectorized silence detection engine (NumPy)
+
+Computes a per-millisecond energy envelope of the input ONCE and derives
+every clip cut from it, instead of re-running pydub.silence.detect_silence()
+(pure-Python RMS at every 1 ms step) on each 30s window.
+
+Semantics match the pydub segmentation loop:
+- a position is silent when the RMS of the next MIN_SILENCE ms is
+  <= THRESH dBFS (pydub integer RMS, 1 ms seek step)
+- silent positions closer than MIN_SILENCE ms merge into one range
+- a window is cut at the start of its LAST silent range, if that start
+  lies at or after MIN_CLIP_MS; the clip keeps KEEP_SILENCE_MS of silence
+- otherwise the full window (MAX_MS) becomes the clip
+
+Note: frame offsets are taken on the absolute timeline. For sample rates
+that are not a multiple of 1 kHz (44.1k) pydub slices relative to the
+window start, which can shift a slice edge by one frame.
+"""
+
+import math
+
+import numpy as np
+
+# Envelope is computed in blocks to keep temporaries bounded
+BLOCK_MS = 10_000
+
+
+# ------------------------------------------------------------
+# PCM HELPERS
+# ------------------------------------------------------------
+def pcm_frames(raw, sample_width: int, channels: int) -> np.ndarray:
+    """
+    View raw little-endian PCM bytes as a (frames, channels) int array.
+    No copy for 8/16/32-bit; 24-bit is expanded to int32.
+    """
+    if sample_width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        samples = (
+            b[:, 0].astype(np.int32)
+            | (b[:, 1].astype(np.int32) << 8)
+            | (b[:, 2].astype(np.int8).astype(np.int32) << 16)
+        )
+    else:
+        dtype = {1: np.int8, 2: np.int16, 4: np.int32}[sample_width]
+        samples = np.frombuffer(raw, dtype=dtype)
+    return samples.reshape(-1, channels)
+
+
+def ms_to_frame(ms, frame_rate: int) -> np.ndarray:
+    """
+    Frame index of a millisecond position, truncated exactly like
+    pydub's AudioSegment slicing (ms * (frame_rate / 1000.0)).
+    """
+    return (np.asarray(ms, dtype=np.float64) * (frame_rate / 1000.0)).astype(np.int64)
+
+
+def rms_limit(thresh_dbfs: float, sample_width: int) -> int:
+    """
+    pydub compares int(rms) <= thresh, i.e. rms < floor(thresh) + 1.
+    """
+    max_amp = 2 ** (8 * sample_width - 1)
+    return int(math.floor(10 ** (thresh_dbfs / 20) * max_amp)) + 1
+
+
+# ------------------------------------------------------------
+# ENVELOPE
+# ------------------------------------------------------------
+def energy_envelope(frames: np.ndarray, frame_rate: int,
+                    start_ms: int, end_ms: int, frame_offset: int = 0):
+    """
+    Per-ms sum of squared samples for [start_ms, end_ms).
+
+    `frames` is a (frames, channels) array whose first row is the absolute
+    frame `frame_offset`. Returns (energy, frame_counts); bins past the end
+    of `frames` have zero frames.
+    """
+    wide = np.int64 if frames.dtype.itemsize <= 2 else np.float64
+    energy = np.zeros(end_ms - start_ms, dtype=wide)
+    counts = np.zeros(end_ms - start_ms, dtype=np.int64)
+
+    for b0 in range(start_ms, end_ms, BLOCK_MS):
+        b1 = min(b0 + BLOCK_MS, end_ms)
+        edges = ms_to_frame(np.arange(b0, b1 + 1), frame_rate) - frame_offset
+        edges = np.clip(edges, 0, len(frames))
+
+        block = frames[edges[0]:edges[-1]].astype(wide)
+        per_frame = (block * block).sum(axis=1)
+        csum = np.concatenate(([0], np.cumsum(per_frame)))
+
+        local = edges - edges[0]
+        energy[b0 - start_ms:b1 - start_ms] = csum[local[1:]] - csum[local[:-1]]
+        counts[b0 - start_ms:b1 - start_ms] = np.diff(edges)
+
+    return energy, counts
+
+
+class Envelope:
+    """
+    Whole-input energy envelope, computed once.
+    """
+
+    def __init__(self, frames: np.ndarray, frame_rate: int, total_ms: int):
+        self.energy, self.counts = energy_envelope(frames, frame_rate, 0, total_ms)
+
+    def window(self, start_ms: int, end_ms: int):
+        return self.energy[start_ms:end_ms], self.counts[start_ms:end_ms]
+
+
+# ------------------------------------------------------------
+# DETECTION
+# ------------------------------------------------------------
+def silent_positions(energy, counts, channels: int,
+                     min_silence_ms: int, limit: int) -> np.ndarray:
+    """
+    Window-relative ms positions i where [i, i + min_silence_ms) is silent.
+    """
+    if len(energy) < min_silence_ms:
+        return np.empty(0, dtype=np.int64)
+
+    ce = np.concatenate(([0], np.cumsum(energy)))
+    cc = np.concatenate(([0], np.cumsum(counts)))
+    e = ce[min_silence_ms:] - ce[:-min_silence_ms]
+    n = (cc[min_silence_ms:] - cc[:-min_silence_ms]) * channels
+
+    return np.flatnonzero(e < (limit * limit) * n)
+
+
+def last_silence_start(positions: np.ndarray, min_silence_ms: int):
+    """
+    Start of the last merged silent range (pydub detect_silence()[-1][0]).
+    """
+    if not len(positions):
+        return None
+    gaps = np.flatnonzero(np.diff(positions) > min_silence_ms)
+    return int(positions[gaps[-1] + 1]) if len(gaps) else int(positions[0])
+
+
+def plan_clips(envelope, total_ms: int, channels: int, sample_width: int,
+               max_ms: int, min_clip_ms: int, min_silence_ms: int,
+               thresh: float, keep_silence_ms: int):
+    """
+    Yield (start_ms, end_ms) clip bounds on the original timeline.
+
+    `envelope` is any object with window(start_ms, end_ms) →
+    (energy, counts), e.g. Envelope.
+    """
+    limit = rms_limit(thresh, sample_width)
+    cursor = 0
+
+    while cursor < total_ms:
+        wlen = min(max_ms, total_ms - cursor)
+        energy, counts = envelope.window(cursor, cursor + wlen)
+
+        positions = silent_positions(energy, counts, channels, min_silence_ms, limit)
+        cut = last_silence_start(positions, min_silence_ms)
+
+        if cut is not None and cut >= min_clip_ms:
+            yield cursor, min(cursor + cut + keep_silence_ms, total_ms)
+            cursor += cut
+        else:
+            yield cursor, cursor + wlen
+            cursor += wlen
+
+
+def plan_audio_segment(audio, max_ms, min_clip_ms, min_silence_ms,
+                       thresh, keep_silence_ms):
+    """
+    Clip bounds for an in-memory pydub AudioSegment.
+    """
+    frames = pcm_frames(audio.raw_data, audio.sample_width, audio.channels)
+    envelope = Envelope(frames, audio.frame_rate, len(audio))
+
+    return list(plan_clips(
+        envelope, len(audio), audio.channels, audio.sample_width,
+        max_ms, min_clip_ms, min_silence_ms, thresh, keep_silence_ms
+    ))
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Streaming runner — stages 1 + 2 overlapped in one process
+
+- the model loads on a background thread while segmentation starts
+- the segmenter pushes each clip into a bounded queue as soon as its cut
+  is known (the input is ingested to 16 kHz mono first, see ingest.py)
+- the transcription worker consumes the queue concurrently; a full queue
+  blocks the segmenter, so memory stays bounded (backpressure)
+- a restart re-segments and gets already transcribed clips from the
+  transcript cache
+
+Outputs (same as stage 1 + stage 2, resumable by either):
+- clips/*.wav
+- pipeline_state.json
+- outputs/raw_transcript.jsonl   (segments written as each clip finishes)
+- outputs/partial_transcript.{txt,srt,vtt}  (republished after each clip)
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from pathlib import Path
+
+import checkpoint
+import whisper_backend
+from audio_store import SAMPLE_RATE, load_audio
+from ingest import INGEST, INGEST_NAME, ingest, state_entry
+from partial_transcript import PARTIAL_TRANSCRIPT, PartialTranscript
+from segmenter import iter_clips
+from transcript_cache import TranscriptCache, cache_key
+from transcript_io import TranscriptWriter, export_raw_json
+from wav_reader import MappedWav
+
+# ------------------------------------------------------------
+# PATH RESOLUTION (ROBUST)
+# src/stream_pipeline.py → project root
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+INPUT = Path(os.environ.get("INPUT_AUDIO", str(PROJECT_ROOT / "audio" / "215.wav"))).resolve()
+CLIPS_DIR = PROJECT_ROOT / "clips"
+OUTPUT_DIR = PROJECT_ROOT / "outputs"
+STATE_FILE = PROJECT_ROOT / "pipeline_state.json"
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+# Max decoded clips waiting for the GPU (~2 MB each)
+QUEUE_DEPTH = int(os.environ.get("STREAM_QUEUE_DEPTH", "4"))
+
+# Also write the previous raw_transcript.json format
+EXPORT_JSON = os.environ.get("EXPORT_JSON", "0") == "1"
+
+# ------------------------------------------------------------
+# LOGGING
+# ------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def fmt(sec: float) -> str:
+    return f"{sec:.1f}s"
+
+
+# ------------------------------------------------------------
+# PRODUCER — segmentation
+# ------------------------------------------------------------
+def produce(audio: MappedWav, q: queue.Queue, errors: list):
+    try:
+        for idx, clip in enumerate(iter_clips(audio, CLIPS_DIR, PROJECT_ROOT, "wav")):
+            samples = load_audio(PROJECT_ROOT / clip["file"])
+            q.put((idx, clip, samples))
+    except BaseException as e:
+        errors.append(e)
+    finally:
+        q.put(_DONE)
+
+
+def main():
+    if not INPUT.exists():
+        raise FileNotFoundError(f"Input audio not found: {INPUT}")
+
+    CLIPS_DIR.mkdir(parents=True, exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    t_start = time.time()
+
+    logger.info("=" * 80)
+    logger.info("🌊 STREAMING PIPELINE (segmentation ∥ transcription)")
+    logger.info(f"🎧 Input       → {INPUT}")
+    logger.info(f"📦 Queue depth → {QUEUE_DEPTH}")
+    logger.info("=" * 80)
+
+    # --------------------------------------------------------
+    # MODEL LOAD (background)
+    # --------------------------------------------------------
+    loaded = {}
+
+    def load():
+        try:
+            loaded["model"] = whisper_backend.load_model()
+        except BaseException as e:
+            loaded["error"] = e
+
+    loader = threading.Thread(target=load, name="model-load", daemon=True)
+    loader.start()
+
+    # --------------------------------------------------------
+    # SEGMENTATION (background)
+    # --------------------------------------------------------
+    source = INPUT
+    ingested = None
+    if INGEST:
+        ingested = ingest(INPUT, CLIPS_DIR / INGEST_NAME)
+        source = ingested["path"]
+
+    audio = MappedWav(source)
+    # A restart re-segments; clips transcribed before are transcript cache hits
+    cache = TranscriptCache()
+    params = whisper_backend.decode_params(batched=False)
+
+    state = {
+        "input_audio": os.path.relpath(INPUT, PROJECT_ROOT),
+        "total_duration_ms": len(audio),
+        "clips": [],
+        "clips_processed": []
+    }
+    if ingested:
+        state["ingest"] = state_entry(ingested, PROJECT_ROOT)
+    # Clips are discovered as we go → each journal line carries its clip
+    checkpoint.reset(STATE_FILE, state)
+
+    q = queue.Queue(maxsize=QUEUE_DEPTH)
+    producer_errors = []
+    producer = threading.Thread(
+        target=produce, args=(audio, q, producer_errors), name="segmenter", daemon=True
+    )
+    producer.start()
+
+    # --------------------------------------------------------
+    # CONSUMER — transcription
+    # --------------------------------------------------------
+    out_path = OUTPUT_DIR / "raw_transcript.jsonl"
+    writer = TranscriptWriter(out_path, input_audio=state["input_audio"])
+    # clip count unknown until segmentation ends → progress by position
+    partial = PartialTranscript(OUTPUT_DIR, len(audio) / 1000) if PARTIAL_TRANSCRIPT else None
+    first_segment_at = None
+    audio_sec = 0.0
+    model = None
+
+    while True:
+        item = q.get()
+        if item is _DONE:
+            break
+        idx, clip, samples = item
+
+        clip_path = PROJECT_ROOT / clip["file"]
+        key = cache_key(samples, params)
+        state["clips"].append(clip)
+
+        logger.info("-" * 80)
+        logger.info(
+            f"▶ Clip {idx+1} | {clip_path.name} | "
+            f"start={clip['start_ms']/1000:.1f}s | "
+            f"dur={clip['duration_ms']/1000:.1f}s | "
+            f"queued={q.qsize()}"
+        )
+
+        segments = cache.get(key)
+        if segments is not None:
+            logger.info("   ⚡ Loaded cached transcription")
+        else:
+            if model is None:
+                t_wait = time.time()
+                loader.join()
+                if "error" in loaded:
+                    raise loaded["error"]
+                model = loaded["model"]
+                logger.info(f"   ⏳ Waited {fmt(time.time() - t_wait)} for model")
+
+            t_clip = time.time()
+            segments, info = whisper_backend.transcribe_clip(model, samples)
+            logger.info(
+                f"   ✅ Inference done in {fmt(time.time() - t_clip)} | "
+                f"segments={len(segments)}"
+            )
+
+            cache.put(key, segments)
+
+        if segments and first_segment_at is None:
+            first_segment_at = time.time() - t_start
+            logger.info(f"   ⏱️ First transcribed segment after {fmt(first_segment_at)}")
+
+        start_offset = clip["start_ms"] / 1000
+        records = [whisper_backend.segment_record(seg, start_offset) for seg in segments]
+        writer.write(records)
+
+        audio_sec += len(samples) / SAMPLE_RATE
+        state["clips_processed"].append(idx)
+        checkpoint.append(STATE_FILE, idx, key=key, record=clip)
+
+        if partial is not None:
+            partial.add(records)
+            partial.progress((clip["start_ms"] + clip["duration_ms"]) / 1000, idx + 1)
+            partial.publish()
+
+    producer.join()
+    audio.close()
+    if producer_errors:
+        writer.abort()
+        if partial is not None:
+            partial.close(complete=False)
+        raise producer_errors[0]
+
+    state["total_clips"] = len(state["clips"])
+    checkpoint.compact(STATE_FILE, total_clips=state["total_clips"])
+
+    # --------------------------------------------------------
+    # FINAL OUTPUT
+    # --------------------------------------------------------
+    total_time = time.time() - t_start
+
+    footer = writer.close(clips=state["total_clips"], clips_assembled=state["total_clips"])
+    if partial is not None:
+        partial.total_clips = state["total_clips"]
+        partial.close(complete=True)
+    avg_conf = footer["avg_confidence"]
+    if EXPORT_JSON:
+        export_raw_json(out_path, out_path.with_suffix(".json"))
+
+    logger.info("=" * 80)
+    logger.info(f"✅ Streaming pipeline complete — {state['total_clips']} clips")
+    logger.info(f"⏱️ Time to first segment : {fmt(first_segment_at or 0.0)}")
+    logger.info(f"⏱️ Total wall-clock      : {fmt(total_time)}")
+    logger.info(f"🚀 Throughput            : {audio_sec / max(total_time, 1e-9):.1f} audio-s/s")
+    logger.info(f"📄 Saved: {out_path}")
+    logger.info(f"📊 Avg confidence: {avg_conf}")
+    cache.report()
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Stage 2 transcription loop, reusable with an already-loaded model
+
+Used by 02_transcribe_clips.py (one job per process), worker.py (many
+jobs on one warm model) and sharded.py (one job split over processes).
+Paths are relative to a job root, so any directory with a stage 1
+pipeline_state.json can be transcribed.
+"""
+
+import time
+import logging
+from pathlib import Path
+
+import checkpoint
+import metrics
+import whisper_backend
+from assemble_transcript import IncrementalAssembler
+from audio_store import SAMPLE_RATE, ClipPrefetcher, array_slice, load_audio, open_array
+from clip_packer import window_audio
+from partial_transcript import PARTIAL_TRANSCRIPT
+from transcript_cache import TranscriptCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def fmt(sec: float) -> str:
+    return f"{sec:.1f}s"
+
+
+def clip_label(clip) -> str:
+    return Path(clip["file"]).name if "file" in clip else clip["name"]
+
+
+def group(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TranscriptionJob:
+    """
+    Transcribes the pending clips of one pipeline_state.json.
+
+    batch_size=0 → one clip per model.transcribe() call
+    batch_size=N → N clips per BatchedInferencePipeline pass
+
+    Clips whose audio + decode params are already in the transcript cache
+    skip the model. With a cascade (cascade.py) each clip goes through the
+    draft model first, one clip at a time.
+    """
+
+    def __init__(self, model, root: Path, state_file: Path, output_dir: Path,
+                 batch_size: int = 0, pipeline=None, cache: TranscriptCache = None,
+                 cascade=None):
+        self.model = model
+        self.root = Path(root)
+        self.state_file = Path(state_file)
+        self.output_dir = Path(output_dir)
+
+        self.cascade = cascade
+        if cascade is not None and batch_size > 0:
+            logger.warning("⚠️ CASCADE=1 transcribes one clip at a time — BATCH_SIZE ignored")
+            batch_size = 0
+        self.batch_size = batch_size
+
+        if batch_size > 0 and pipeline is None:
+            pipeline = whisper_backend.batched_pipeline(model)
+        self.pipeline = pipeline
+
+        self.cache = cache or TranscriptCache()
+        self.params = cascade.params() if cascade is not None else \
+            whisper_backend.decode_params(batched=batch_size > 0)
+
+        # run(): clips stream into raw_transcript.jsonl in clip order;
+        # a shard (no assembler) keeps clip index → records for its parent
+        self.assembler = None
+        self.records = {}
+        # pending(): processed clips behind the first pending one, read up
+        # front so this run's cache puts cannot evict them first
+        self.cached_records = {}
+        self.clips_this_run = 0
+        self.audio_sec = 0.0
+
+    # --------------------------------------------------------
+    # CLIPS
+    # --------------------------------------------------------
+    def clip_loader(self):
+        """
+        Clips are handed to the model as 16 kHz float32 arrays; the next one
+        is loaded on a background thread while the current one is on the GPU.
+        """
+        audio_array = self.state.get("audio_array")
+
+        if audio_array:
+            samples = open_array(self.root / audio_array["file"])
+            logger.info(f"🎛️ Array mode → {audio_array['file']} ({len(samples)} samples)")
+
+            def load_source(clip):
+                return array_slice(samples, clip["start_sample"], clip["end_sample"])
+        else:
+            def load_source(clip):
+                return load_audio(self.root / clip["file"])
+
+        def load_clip(clip):
+            with metrics.span("clip_decode"):
+                if "pieces" in clip:
+                    return window_audio(clip, load_source)
+                return load_source(clip)
+
+        return load_clip
+
+    def log_clip(self, idx, clip):
+        logger.info("-" * 80)
+        logger.info(
+            f"▶ Clip {idx+1}/{len(self.clips)} | "
+            f"{clip_label(clip)} | "
+            f"start={clip['start_ms']/1000:.1f}s | "
+            f"dur={clip['duration_ms']/1000:.1f}s"
+        )
+
+    # --------------------------------------------------------
+    # PER-CLIP RESULT (cache + checkpoint)
+    # --------------------------------------------------------
+    def cached(self, audio):
+        """
+        (key, cached segments or None) for a loaded clip.
+        """
+        key = cache_key(audio, self.params)
+        return key, self.cache.get(key)
+
+    def finish_clip(self, idx, clip, key, segments, from_cache=False):
+        metrics.count("clips", source="cache" if from_cache else "model")
+        metrics.count("segments", len(segments))
+        if from_cache:
+            logger.info(f"   ⚡ Cache hit ({clip_label(clip)}, {len(segments)} segments)")
+        else:
+            self.cache.put(key, segments)
+            logger.info(f"   💾 Cached raw segments ({clip_label(clip)})")
+
+        records = whisper_backend.clip_records(segments, clip)
+        if self.assembler is not None:
+            self.assembler.add(idx, records)
+        else:
+            self.records[idx] = records
+        self.clips_this_run += 1
+
+        # One journal line per clip (shared safely between shards)
+        checkpoint.append(self.state_file, idx, key=key)
+        self.processed.add(idx)
+
+        logger.info(
+            f"   📊 Progress: {len(self.processed)}/{len(self.clips)} clips done"
+        )
+
+    # --------------------------------------------------------
+    # LOOPS
+    # --------------------------------------------------------
+    def _run_batched(self, prefetcher):
+        for batch in group(prefetcher, self.batch_size):
+            self.audio_sec += sum(len(audio) for _, _, audio in batch) / SAMPLE_RATE
+
+            misses = []
+            for idx, clip, audio in batch:
+                self.log_clip(idx, clip)
+                key, segments = self.cached(audio)
+                if segments is None:
+                    misses.append((idx, clip, audio, key))
+                else:
+                    self.finish_clip(idx, clip, key, segments, from_cache=True)
+
+            if not misses:
+                continue
+
+            batch = misses
+            batch_audio = sum(len(audio) for _, _, audio, _ in batch) / SAMPLE_RATE
+            t_batch = time.time()
+            logger.info(f"   🧠 Batched inference started ({len(batch)} clips)")
+
+            with metrics.span("batch_inference"):
+                results, info = whisper_backend.transcribe_batch(
+                    self.pipeline,
+                    [audio for _, _, audio, _ in batch],
+                    batch_size=self.batch_size
+                )
+
+            elapsed = time.time() - t_batch
+            logger.info(
+                f"   ✅ Batch done in {fmt(elapsed)} | "
+                f"segments={sum(len(r) for r in results)} | "
+                f"throughput={batch_audio / max(elapsed, 1e-9):.1f} audio-s/s"
+            )
+
+            for (idx, clip, _, key), segments in zip(batch, results):
+                self.finish_clip(idx, clip, key, segments)
+
+    def _run_sequential(self, prefetcher):
+        for idx, clip, audio in prefetcher:
+            self.log_clip(idx, clip)
+            self.audio_sec += len(audio) / SAMPLE_RATE
+
+            key, segments = self.cached(audio)
+            if segments is not None:
+                self.finish_clip(idx, clip, key, segments, from_cache=True)
+                continue
+
+            t_clip = time.time()
+            logger.info("   🧠 GPU inference started")
+
+            with metrics.span("clip_inference"):
+                if self.cascade is not None:
+                    segments, info = self.cascade.transcribe(audio)
+                else:
+                    segments, info = whisper_backend.transcribe_clip(self.model, audio)
+
+            logger.info(
+                f"   ✅ Inference done in {fmt(time.time() - t_clip)} | "
+                f"segments={len(segments)} | "
+                f"language={info.language}"
+            )
+
+            self.finish_clip(idx, clip, key, segments)
+
+    # --------------------------------------------------------
+    # RUN
+    # --------------------------------------------------------
+    def load_state(self):
+        self.state = checkpoint.load_state(self.state_file)
+
+        self.clips = self.state["clips"]
+        self.processed = set(self.state.get("clips_processed", []))
+
+    def pending(self):
+        """
+        Clips not processed yet, plus processed clips whose result is no
+        longer in the transcript cache (evicted, or from a pickle-era run).
+
+        Processed clips before the first pending one are written as soon
+        as the assembler starts; those after it are read now (into
+        cached_records), since the assembler only reaches them after this
+        run's cache puts, which evict the least recently used entries.
+        """
+        keys = self.state.get("cache_keys", {})
+        pending = []
+        self.cached_records = {}
+        for idx, clip in enumerate(self.clips):
+            key = keys.get(str(idx))
+            if idx in self.processed and key:
+                cached = self.cache.has(key)
+                if cached and pending:
+                    self.cached_records[idx] = whisper_backend.clip_records(self.cache.get(key), clip)
+                if cached:
+                    logger.info(f"⏭️  Skipping clip {idx+1}/{len(self.clips)} (cached)")
+                    continue
+                logger.info(f"♻️ Clip {idx+1}/{len(self.clips)} not in cache — re-queued")
+            pending.append((idx, clip))
+        return pending
+
+    def transcribe(self, items):
+        """
+        Transcribe an iterable of (idx, clip); it may be lazy (a shard
+        pulling clips from a shared queue).
+        """
+        prefetcher = ClipPrefetcher(
+            items, self.clip_loader(), depth=max(self.batch_size, 1)
+        )
+
+        try:
+            if self.batch_size > 0:
+                self._run_batched(prefetcher)
+            else:
+                self._run_sequential(prefetcher)
+        finally:
+            prefetcher.close()
+
+    def run(self) -> dict:
+        self.load_state()
+
+        logger.info(f"📁 Total clips      : {len(self.clips)}")
+        logger.info(f"⚡ Already processed: {len(self.processed)}")
+
+        pending = self.pending()
+
+        logger.info("🎙️ Starting transcription loop")
+        overall_start = time.time()
+
+        self.assembler = IncrementalAssembler(
+            self.state_file, self.output_path, self.cache,
+            pending=[idx for idx, _ in pending], cached=self.cached_records,
+            publish_partial=PARTIAL_TRANSCRIPT
+        )
+        try:
+            with metrics.profiled("transcribe"):
+                self.transcribe(pending)
+        except BaseException:
+            self.assembler.abort()
+            raise
+        checkpoint.compact(self.state_file)
+
+        total_time = time.time() - overall_start
+        metrics.gauge("audio_seconds", round(self.audio_sec, 3))
+        metrics.gauge("transcribe_wall_seconds", round(total_time, 3))
+        metrics.gauge("rtf", round(total_time / max(self.audio_sec, 1e-9), 6))
+        logger.info("=" * 80)
+        logger.info("🧩 Transcription loop complete")
+        logger.info(f"⏱️ Total time: {fmt(total_time)}")
+        logger.info(
+            f"🚀 Throughput: {self.audio_sec / max(total_time, 1e-9):.1f} audio-s/s "
+            f"(batch_size={self.batch_size or 1})"
+        )
+        self.cache.report()
+        if self.cascade is not None:
+            self.cascade.report()
+
+        return self.write_output(total_time)
+
+    # --------------------------------------------------------
+    # FINAL OUTPUT
+    # --------------------------------------------------------
+    @property
+    def output_path(self) -> Path:
+        return self.output_dir / "raw_transcript.jsonl"
+
+    def write_output(self, total_time: float) -> dict:
+        """
+        raw_transcript.jsonl over all processed clips: this run's records
+        plus earlier runs' results from the transcript cache.
+        """
+        assembled = self.assembler.finish()
+
+        summary = {
+            "clips": len(self.clips),
+            "clips_processed": len(self.processed),
+            "clips_this_run": self.clips_this_run,
+            "segments": assembled["segments"],
+            "audio_sec": round(self.audio_sec, 3),
+            "wall_sec": round(total_time, 3),
+            "avg_confidence": assembled["avg_confidence"],
+            "cache": self.cache.stats(),
+            "output": assembled["output"],
+        }
+        if self.cascade is not None:
+            summary["cascade"] = self.cascade.summary()
+        return summary
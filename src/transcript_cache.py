@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Content-addressed transcription cache
+
+Key = sha256(decode params + 16 kHz float32 clip samples). The params
+include model, compute type, language, beam size and the cache format
+version, so re-segmenting or changing the model never reuses a stale
+result, while an identical audio span is transcribed once across runs
+and input files.
+
+Entries live in one SQLite file (cache/transcripts.db, WAL, shared by
+sharded workers) as zlib-compressed JSON, not pickles, so they do not
+depend on the faster-whisper version. Total size is bounded; the least
+recently used entries are evicted first.
+
+    TRANSCRIPT_CACHE=/path/transcripts.db   (default: <project>/cache/)
+    TRANSCRIPT_CACHE_MB=512
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+CACHE_PATH = Path(os.environ.get(
+    "TRANSCRIPT_CACHE", PROJECT_ROOT / "cache" / "transcripts.db"
+))
+CACHE_MAX_MB = float(os.environ.get("TRANSCRIPT_CACHE_MB", "512"))
+
+CACHE_VERSION = 1
+
+
+class CachedSegment(NamedTuple):
+    """
+    The Segment fields the pipeline reads (whisper_backend.segment_record).
+    """
+    start: float
+    end: float
+    text: str
+    avg_logprob: float
+    no_speech_prob: float
+    compression_ratio: float
+
+
+def cache_key(audio: np.ndarray, params: dict) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps({"v": CACHE_VERSION, **params}, sort_keys=True).encode())
+    h.update(memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast("B"))
+    return h.hexdigest()
+
+
+def encode(segments) -> bytes:
+    rows = [
+        [round(s.start, 3), round(s.end, 3), s.text,
+         s.avg_logprob, s.no_speech_prob, s.compression_ratio]
+        for s in segments
+    ]
+    return zlib.compress(
+        json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def decode(blob: bytes):
+    return [CachedSegment(*row) for row in json.loads(zlib.decompress(blob))]
+
+
+class TranscriptCache:
+    def __init__(self, path: Path = CACHE_PATH, max_mb: float = CACHE_MAX_MB):
+        self.path = Path(path)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key         TEXT PRIMARY KEY,
+                data        BLOB NOT NULL,
+                size        INTEGER NOT NULL,
+                last_used   REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+
+    # --------------------------------------------------------
+    # LOOKUP
+    # --------------------------------------------------------
+    def get(self, key: str):
+        """
+        Cached segments for `key`, or None (counted as a miss).
+        """
+        row = self.db.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            metrics.count("transcript_cache_misses")
+            return None
+
+        self.hits += 1
+        metrics.count("transcript_cache_hits")
+        self.db.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return decode(row[0])
+
+    def has(self, key: str) -> bool:
+        return self.db.execute(
+            "SELECT 1 FROM entries WHERE key = ?", (key,)
+        ).fetchone() is not None
+
+    def peek(self, key: str):
+        """
+        Like get(), without touching LRU order or hit/miss counters.
+        """
+        row = self.db.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        return None if row is None else decode(row[0])
+
+    # --------------------------------------------------------
+    # STORE
+    # --------------------------------------------------------
+    def put(self, key: str, segments):
+        blob = encode(segments)
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, blob, len(blob), time.time())
+        )
+        self._evict()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            for key, size in self.db.execute(
+                "SELECT key, size FROM entries ORDER BY last_used"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                self.evicted += 1
+                metrics.count("transcript_cache_evictions")
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    # --------------------------------------------------------
+    # REPORT
+    # --------------------------------------------------------
+    def stats(self) -> dict:
+        entries, size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evicted": self.evicted,
+            "entries": entries,
+            "size_mb": round(size / 1024 / 1024, 2),
+        }
+
+    def report(self):
+        s = self.stats()
+        logger.info(
+            f"🗃️ Transcript cache: hits={s['hits']} misses={s['misses']} "
+            f"(hit rate {s['hit_rate']:.0%}) | evicted={s['evicted']} | "
+            f"{s['entries']} entries, {s['size_mb']:.1f}/{self.max_bytes / 1024 / 1024:.0f} MB"
+        )
+        return s
+
+    def close(self):
+        self.db.close()
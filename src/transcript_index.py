@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Time-aligned inverted index over produced transcripts
+
+Every indexed transcript (refined_transcript.jsonl, or the previous
+refined_transcript.json) is split into tokens; each token occurrence is a
+posting (token, file, position) pointing at its segment, so a hit comes
+back with the segment start / end on the original audio timeline.
+
+Tokens are normalized the same way for indexing and for queries:
+
+    NFC → correction rules (config/rules, rule_engine.py) → Devanagari-aware
+    tokens (letters + matras / virama / nukta, split on spaces, danda,
+    punctuation) → fold: casefold, drop ZWJ / ZWNJ and nukta,
+    chandrabindu → anusvara, Devanagari digits → ASCII
+
+so "दर्पन" finds "दर्पण". refined_transcript.jsonl is stage 3 output and
+is indexed as it is on disk; the raw segments of refined_transcript.json
+are refined first, so they are indexed as they read after stage 3. A
+changed rule set re-indexes everything.
+
+The index is one SQLite file (cache/transcript_index.db, WAL). Updates
+are incremental: files are re-read only when their size / mtime changed,
+so the worker can index each job as it finishes. A phrase query is one
+indexed join per word, driven by the rarest word:
+
+    python src/transcript_index.py update outputs jobs [--prune] [--rebuild]
+    python src/transcript_index.py search "सहारनपुर कार्यक्रम" [--limit 20] [--file 215] [--json]
+    python src/transcript_index.py stats
+
+    TRANSCRIPT_INDEX=/path/index.db   (default: <project>/cache/transcript_index.db)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+from pathlib import Path
+
+import metrics
+from rule_engine import RuleEngine, load_rules
+from transcript_io import TranscriptReader
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+INDEX_PATH = Path(os.environ.get(
+    "TRANSCRIPT_INDEX", PROJECT_ROOT / "cache" / "transcript_index.db"
+))
+
+# Files picked up under a source directory (.jsonl wins in the same dir)
+TRANSCRIPT_NAMES = ("refined_transcript.jsonl", "refined_transcript.json")
+
+NORMALIZE_VERSION = 1
+
+
+# ------------------------------------------------------------
+# NORMALIZATION
+# ------------------------------------------------------------
+# Word characters, plus the Devanagari combining marks (matras, virama,
+# nukta, anusvara …) that str.isalnum() rejects; danda / double danda split
+TOKEN_RE = re.compile(r"(?:[^\W_]|[\u0900-\u0963\u0966-\u097f\ua8e0-\ua8ff\u200c\u200d])+")
+
+FOLD = str.maketrans({
+    "\u200c": None,     # ZWNJ
+    "\u200d": None,     # ZWJ
+    "\u093c": None,     # nukta: ज़ → ज, फ़ → फ
+    "\u0901": "\u0902",  # chandrabindu → anusvara: हँ → हं
+    **{chr(0x0966 + d): str(d) for d in range(10)},   # ०-९ → 0-9
+})
+
+
+class Normalizer:
+    """
+    Text → search tokens, with the stage 3 correction rules applied first.
+    """
+
+    def __init__(self, rules: dict = None):
+        rules = load_rules() if rules is None else rules
+        self.engine = RuleEngine.compile(rules)
+        self.fingerprint = hashlib.sha256(
+            json.dumps([NORMALIZE_VERSION, list(rules.items())], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def refine(self, text: str) -> str:
+        return self.engine.rewrite(unicodedata.normalize("NFC", text))[0]
+
+    def tokens(self, text: str) -> list:
+        """
+        Tokens of already refined text.
+        """
+        # NFD exposes the nukta of precomposed letters (क़ = क + ़) to FOLD
+        folded = (unicodedata.normalize("NFD", t).casefold().translate(FOLD)
+                  for t in TOKEN_RE.findall(text))
+        return [unicodedata.normalize("NFC", t) for t in folded if t]
+
+    def query_tokens(self, text: str) -> list:
+        return self.tokens(self.refine(text))
+
+
+def fmt_ts(sec: float) -> str:
+    ms = int(round(sec * 1000))
+    return f"{ms // 3_600_000}:{ms % 3_600_000 // 60_000:02d}:{ms % 60_000 // 1000:02d}.{ms % 1000:03d}"
+
+
+# ------------------------------------------------------------
+# SOURCES
+# ------------------------------------------------------------
+def find_transcripts(sources) -> list:
+    """
+    Transcript files under `sources` (files or directories), one per
+    output directory.
+    """
+    found = {}
+    for src in sources:
+        src = Path(src)
+        if src.is_file():
+            found.setdefault(src.parent, []).append(src)
+        elif src.is_dir():
+            for name in TRANSCRIPT_NAMES:
+                for p in src.rglob(name):
+                    found.setdefault(p.parent, []).append(p)
+
+    files = []
+    for candidates in found.values():
+        order = {name: i for i, name in enumerate(TRANSCRIPT_NAMES)}
+        files.append(min(set(candidates), key=lambda p: order.get(p.name, -1)))
+    return sorted(files)
+
+
+def read_segments(path: Path):
+    """
+    (start, end, text) of a .jsonl transcript or a .json export
+    ({"segments": [...]}).
+    """
+    if path.suffix == ".jsonl":
+        for seg in TranscriptReader(path):
+            yield seg["start"], seg["end"], seg["text"]
+    else:
+        for seg in json.loads(path.read_text(encoding="utf-8")).get("segments", []):
+            yield seg["start"], seg["end"], seg["text"]
+
+
+def doc_name(path: Path) -> str:
+    # relative to the project when inside it, so the index travels with it
+    path = path.resolve()
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+# ------------------------------------------------------------
+# INDEX (SQLite)
+# ------------------------------------------------------------
+class TranscriptIndex:
+    def __init__(self, path: Path = INDEX_PATH, normalizer: Normalizer = None):
+        self.path = Path(path)
+        self.normalizer = normalizer or Normalizer()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key         TEXT PRIMARY KEY,
+                value       TEXT
+            );
+            CREATE TABLE IF NOT EXISTS docs (
+                id          INTEGER PRIMARY KEY,
+                path        TEXT UNIQUE NOT NULL,
+                size        INTEGER NOT NULL,
+                mtime_ns    INTEGER NOT NULL,
+                segments    INTEGER NOT NULL,
+                tokens      INTEGER NOT NULL,
+                duration    REAL NOT NULL,
+                indexed     REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS segments (
+                doc         INTEGER NOT NULL,
+                seq         INTEGER NOT NULL,
+                start       REAL NOT NULL,
+                "end"       REAL NOT NULL,
+                text        TEXT NOT NULL,
+                PRIMARY KEY (doc, seq)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS postings (
+                token       TEXT NOT NULL,
+                doc         INTEGER NOT NULL,
+                pos         INTEGER NOT NULL,
+                seq         INTEGER NOT NULL,
+                PRIMARY KEY (token, doc, pos)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+            CREATE TABLE IF NOT EXISTS terms (
+                token       TEXT PRIMARY KEY,
+                count       INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        """)
+
+    def _meta(self, key: str):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # --------------------------------------------------------
+    # WRITE
+    # --------------------------------------------------------
+    def _delete_doc(self, doc_id: int):
+        self.db.executemany(
+            "UPDATE terms SET count = count - ? WHERE token = ?",
+            [(n, token) for token, n in self.db.execute(
+                "SELECT token, COUNT(*) FROM postings WHERE doc = ? GROUP BY token", (doc_id,)
+            ).fetchall()]
+        )
+        self.db.execute("DELETE FROM terms WHERE count <= 0")
+        self.db.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+        self.db.execute("DELETE FROM segments WHERE doc = ?", (doc_id,))
+        self.db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def _index_doc(self, path: Path, name: str, st) -> tuple:
+        cur = self.db.execute(
+            "INSERT INTO docs (path, size, mtime_ns, segments, tokens, duration, indexed) "
+            "VALUES (?, ?, ?, 0, 0, 0, ?)",
+            (name, st.st_size, st.st_mtime_ns, time.time())
+        )
+        doc_id = cur.lastrowid
+
+        segments, postings, counts = [], [], {}
+        pos = 0
+        duration = 0.0
+        # .jsonl is already refined (rules applied twice would chain)
+        refine = path.suffix == ".json"
+        for seq, (start, end, text) in enumerate(read_segments(path)):
+            if refine:
+                text = self.normalizer.refine(text)
+            segments.append((doc_id, seq, start, end, text))
+            for token in self.normalizer.tokens(text):
+                postings.append((token, doc_id, pos, seq))
+                counts[token] = counts.get(token, 0) + 1
+                pos += 1
+            duration = max(duration, end)
+
+        self.db.executemany(
+            'INSERT INTO segments (doc, seq, start, "end", text) VALUES (?, ?, ?, ?, ?)', segments
+        )
+        self.db.executemany(
+            "INSERT INTO postings (token, doc, pos, seq) VALUES (?, ?, ?, ?)", postings
+        )
+        self.db.executemany(
+            "INSERT INTO terms (token, count) VALUES (?, ?) "
+            "ON CONFLICT (token) DO UPDATE SET count = count + excluded.count",
+            counts.items()
+        )
+        self.db.execute(
+            "UPDATE docs SET segments = ?, tokens = ?, duration = ? WHERE id = ?",
+            (len(segments), pos, duration, doc_id)
+        )
+        return len(segments), pos
+
+    def clear(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        for table in ("postings", "segments", "terms", "docs"):
+            self.db.execute(f"DELETE FROM {table}")
+        self.db.execute("COMMIT")
+
+    def update(self, sources, prune: bool = False, rebuild: bool = False) -> dict:
+        """
+        Index new / changed transcripts under `sources`; prune=True also
+        drops indexed files that no longer exist.
+        """
+        t0 = time.time()
+        fingerprint = self.normalizer.fingerprint
+        if rebuild or self._meta("fingerprint") not in (None, fingerprint):
+            if not rebuild:
+                logger.info("♻️ Correction rules changed — re-indexing all transcripts")
+            self.clear()
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,)
+        )
+
+        stats = {"files": 0, "indexed": 0, "unchanged": 0, "pruned": 0, "segments": 0, "tokens": 0}
+        for path in find_transcripts(sources):
+            stats["files"] += 1
+            name = doc_name(path)
+            st = path.stat()
+            row = self.db.execute(
+                "SELECT id, size, mtime_ns FROM docs WHERE path = ?", (name,)
+            ).fetchone()
+            if row and row[1] == st.st_size and row[2] == st.st_mtime_ns:
+                stats["unchanged"] += 1
+                continue
+
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                if row:
+                    self._delete_doc(row[0])
+                with metrics.span("index_file"):
+                    n_segments, n_tokens = self._index_doc(path, name, st)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            stats["indexed"] += 1
+            stats["segments"] += n_segments
+            stats["tokens"] += n_tokens
+            logger.info(f"🗂️ Indexed {name}: {n_segments} segments, {n_tokens} tokens")
+
+        if prune:
+            for doc_id, name in self.db.execute("SELECT id, path FROM docs").fetchall():
+                path = Path(name) if os.path.isabs(name) else PROJECT_ROOT / name
+                if not path.exists():
+                    self.db.execute("BEGIN IMMEDIATE")
+                    self._delete_doc(doc_id)
+                    self.db.execute("COMMIT")
+                    stats["pruned"] += 1
+                    logger.info(f"🗑️ Pruned {name} (file gone)")
+
+        stats["elapsed_sec"] = round(time.time() - t0, 3)
+        metrics.count("index_files", stats["indexed"])
+        metrics.count("index_tokens", stats["tokens"])
+        return stats
+
+    # --------------------------------------------------------
+    # SEARCH
+    # --------------------------------------------------------
+    def search(self, query: str, limit: int = 20, file_filter: str = None) -> list:
+        """
+        Occurrences of `query` as a phrase (consecutive tokens, also across
+        segment boundaries): [{file, start, end, text}], in file / time order.
+        """
+        tokens = self.normalizer.query_tokens(query)
+        if not tokens:
+            return []
+
+        counts = {
+            t: (self.db.execute("SELECT count FROM terms WHERE token = ?", (t,)).fetchone() or (0,))[0]
+            for t in set(tokens)
+        }
+        if min(counts.values()) == 0:
+            return []
+
+        # drive the join from the rarest token; the others are point
+        # lookups on (token, doc, pos)
+        r = min(range(len(tokens)), key=lambda i: counts[tokens[i]])
+        order = [r] + [i for i in range(len(tokens)) if i != r]
+        sql = [f"SELECT p{r}.doc, p{r}.pos - {r}, p0.seq, p{len(tokens) - 1}.seq FROM postings p{r}"]
+        params = [tokens[r]]
+        for i in order[1:]:
+            sql.append(
+                f"CROSS JOIN postings p{i} ON p{i}.token = ? AND p{i}.doc = p{r}.doc "
+                f"AND p{i}.pos = p{r}.pos + {i - r}"
+            )
+            params.append(tokens[i])
+        sql.append(f"WHERE p{r}.token = ?")
+        params.append(params.pop(0))
+
+        docs = {}
+        if file_filter:
+            docs = dict(self.db.execute(
+                "SELECT id, path FROM docs WHERE instr(path, ?) > 0", (file_filter,)
+            ).fetchall())
+            if not docs:
+                return []
+            sql.append(f"AND p{r}.doc IN ({','.join('?' * len(docs))})")
+            params.extend(docs)
+        sql.append("ORDER BY 1, 2 LIMIT ?")
+        params.append(limit)
+
+        hits = []
+        for doc_id, _, first, last in self.db.execute(" ".join(sql), params).fetchall():
+            rows = self.db.execute(
+                'SELECT start, "end", text FROM segments WHERE doc = ? AND seq BETWEEN ? AND ? ORDER BY seq',
+                (doc_id, first, last)
+            ).fetchall()
+            if doc_id not in docs:
+                docs[doc_id] = self.db.execute("SELECT path FROM docs WHERE id = ?", (doc_id,)).fetchone()[0]
+            hits.append({
+                "file": docs[doc_id],
+                "start": rows[0][0],
+                "end": rows[-1][1],
+                "text": " ".join(text for _, _, text in rows),
+            })
+        return hits
+
+    # --------------------------------------------------------
+    # REPORT
+    # --------------------------------------------------------
+    def stats(self) -> dict:
+        docs, segments, tokens, hours = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(segments), 0), COALESCE(SUM(tokens), 0), "
+            "COALESCE(SUM(duration), 0) / 3600 FROM docs"
+        ).fetchone()
+        return {
+            "files": docs,
+            "segments": segments,
+            "tokens": tokens,
+            "terms": self.db.execute("SELECT COUNT(*) FROM terms").fetchone()[0],
+            "audio_hours": round(hours, 2),
+            "size_mb": round(self.path.stat().st_size / 1024 / 1024, 2),
+        }
+
+    def report(self):
+        s = self.stats()
+        logger.info(
+            f"🗂️ Transcript index: {s['files']} files, {s['audio_hours']:.1f} h of audio, "
+            f"{s['segments']} segments, {s['tokens']} tokens ({s['terms']} distinct) "
+            f"| {s['size_mb']:.1f} MB → {self.path}"
+        )
+        return s
+
+    def close(self):
+        self.db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Time-aligned transcript index")
+    parser.add_argument("--db", type=Path, default=INDEX_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("update")
+    p.add_argument("sources", nargs="*", type=Path,
+                   default=[PROJECT_ROOT / "outputs", PROJECT_ROOT / "jobs"])
+    p.add_argument("--prune", action="store_true", help="drop indexed files that no longer exist")
+    p.add_argument("--rebuild", action="store_true", help="re-index everything")
+    p = sub.add_parser("search")
+    p.add_argument("query")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--file", help="only files whose path contains this")
+    p.add_argument("--json", action="store_true", help="print hits as JSON lines")
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    index = TranscriptIndex(args.db)
+
+    if args.cmd == "update":
+        s = index.update(args.sources, prune=args.prune, rebuild=args.rebuild)
+        logger.info(
+            f"✅ {s['indexed']} indexed, {s['unchanged']} unchanged, {s['pruned']} pruned "
+            f"of {s['files']} transcripts in {s['elapsed_sec']:.2f}s"
+        )
+        index.report()
+
+    elif args.cmd == "search":
+        t0 = time.perf_counter()
+        hits = index.search(args.query, limit=args.limit, file_filter=args.file)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        for h in hits:
+            if args.json:
+                print(json.dumps(h, ensure_ascii=False))
+            else:
+                print(f"{h['file']}  {fmt_ts(h['start'])} → {fmt_ts(h['end'])}  {h['text']}")
+        logger.info(f"🔎 {len(hits)} hits for {args.query!r} in {elapsed_ms:.1f} ms")
+        sys.exit(0 if hits else 1)
+
+    else:
+        index.report()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Line-delimited transcript format (stages 2 and 3)
+
+    {"type": "header", "format": "transcript-jsonl", "version": 1, ...}
+    {"start": 0.0, "end": 4.2, "text": "...", "confidence": 0.91}
+    ...
+    {"type": "footer", "segments": 812, "avg_confidence": 0.8734, ...}
+
+Segments are appended as they are produced and read back as a generator,
+so neither stage holds a whole transcript in memory. Aggregates such as
+avg_confidence go in the footer. The file is written as <name>.tmp and
+renamed on close, so a complete file always has its footer.
+
+The previous raw/refined_transcript.json files can still be exported
+(export_raw_json / export_refined_json), also without loading the
+transcript.
+"""
+
+import os
+import json
+from pathlib import Path
+
+FORMAT = "transcript-jsonl"
+VERSION = 1
+
+
+# ------------------------------------------------------------
+# WRITE
+# ------------------------------------------------------------
+class TranscriptWriter:
+    def __init__(self, path: Path, **meta):
+        self.path = Path(path)
+        self.tmp = self.path.with_name(self.path.name + ".tmp")
+        self.segments = 0
+        self._conf_sum = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.tmp.open("w", encoding="utf-8")
+        self._line({"type": "header", "format": FORMAT, "version": VERSION, **meta})
+
+    def _line(self, record: dict):
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write(self, records):
+        for r in records:
+            self._line(r)
+            self.segments += 1
+            self._conf_sum += r.get("confidence", 0.0)
+        self._f.flush()
+
+    def close(self, **aggregates) -> dict:
+        """
+        Write the footer and publish the file. `aggregates` are added to
+        (or override) segments / avg_confidence.
+        """
+        footer = {
+            "type": "footer",
+            "segments": self.segments,
+            "avg_confidence": round(self._conf_sum / max(self.segments, 1), 4),
+            **aggregates,
+        }
+        self._line(footer)
+        self._f.close()
+        os.replace(self.tmp, self.path)
+        return footer
+
+    def abort(self):
+        self._f.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+# ------------------------------------------------------------
+# READ
+# ------------------------------------------------------------
+class TranscriptReader:
+    """
+    Iterates segment records; header/footer are set as they are read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.header = None
+        self.footer = None
+
+    def __iter__(self):
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                kind = record.get("type")
+                if kind == "header":
+                    self.header = record
+                elif kind == "footer":
+                    self.footer = record
+                else:
+                    yield record
+
+
+def read_footer(path: Path) -> dict:
+    """
+    The last line, without reading the file front to back.
+    """
+    with Path(path).open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0 and tail.count(b"\n") < 2:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    footer = json.loads(tail.rstrip(b"\n").rsplit(b"\n", 1)[-1])
+    if footer.get("type") != "footer":
+        raise ValueError(f"{path} has no footer (incomplete transcript)")
+    return footer
+
+
+# ------------------------------------------------------------
+# JSON EXPORT (previous formats)
+# ------------------------------------------------------------
+def _dump_segments(f, segments):
+    """
+    The "segments" list exactly as json.dump(..., indent=2) nests it.
+    """
+    first = True
+    for seg in segments:
+        f.write("[\n" if first else ",\n")
+        first = False
+        body = json.dumps(seg, ensure_ascii=False, indent=2)
+        f.write("\n".join("    " + line for line in body.split("\n")))
+    f.write("[]" if first else "\n  ]")
+
+
+def export_raw_json(jsonl_path: Path, out_path: Path):
+    """
+    raw_transcript.jsonl → raw_transcript.json {"avg_confidence", "segments"}
+    """
+    footer = read_footer(jsonl_path)
+    with Path(out_path).open("w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f'  "avg_confidence": {json.dumps(footer["avg_confidence"])},\n')
+        f.write('  "segments": ')
+        _dump_segments(f, TranscriptReader(jsonl_path))
+        f.write("\n}")
+
+
+def export_refined_json(refined_jsonl: Path, raw_jsonl: Path, out_path: Path):
+    """
+    refined_transcript.jsonl → refined_transcript.json
+    {"avg_confidence", "text" (refined, joined), "segments" (raw)}
+    """
+    footer = read_footer(refined_jsonl)
+    with Path(out_path).open("w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f'  "avg_confidence": {json.dumps(footer["avg_confidence"])},\n')
+
+        f.write('  "text": "')
+        first = True
+        for seg in TranscriptReader(refined_jsonl):
+            if not first:
+                f.write(" ")
+            first = False
+            f.write(json.dumps(seg["text"], ensure_ascii=False)[1:-1])
+        f.write('",\n')
+
+        f.write('  "segments": ')
+        _dump_segments(f, TranscriptReader(raw_jsonl))
+        f.write("\n}")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Speech-only segmentation with Silero VAD (SEGMENTER=vad)
+
+The energy segmenter cuts every 30 s window of the input, so long pauses,
+music and crowd noise all reach the GPU. This mode runs the Silero VAD
+model that ships with faster-whisper (ONNX, CPU) over the input decoded
+to 16 kHz, and turns the detected speech regions into clips:
+
+- every clip is one speech region (≤ MAX_MS), non-speech between regions
+  is never transcribed
+- clip start_ms is the region start on the original timeline, so stage 2
+  timestamps need no remapping
+- the skipped audio is reported (log, state "segmentation", metrics)
+
+The VAD runs over blocks of VAD_BLOCK_SEC so memory stays bounded on long
+recordings; regions that touch a block edge are joined again.
+
+    SEGMENTER=vad VAD_THRESHOLD=0.5 VAD_MIN_SILENCE_MS=1000 VAD_SPEECH_PAD_MS=400
+"""
+
+import os
+import time
+import logging
+
+import numpy as np
+
+import metrics
+from audio_store import SAMPLE_RATE, decode_to_array, open_array
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+VAD_THRESHOLD = float(os.environ.get("VAD_THRESHOLD", "0.5"))
+VAD_MIN_SPEECH_MS = int(os.environ.get("VAD_MIN_SPEECH_MS", "250"))
+VAD_MIN_SILENCE_MS = int(os.environ.get("VAD_MIN_SILENCE_MS", "1000"))
+VAD_SPEECH_PAD_MS = int(os.environ.get("VAD_SPEECH_PAD_MS", "400"))
+
+# Audio per VAD call (10 min ≈ 38 MB of float32)
+VAD_BLOCK_SEC = int(os.environ.get("VAD_BLOCK_SEC", "600"))
+
+
+def vad_options(max_ms: int):
+    from faster_whisper.vad import VadOptions
+
+    return VadOptions(
+        threshold=VAD_THRESHOLD,
+        min_speech_duration_ms=VAD_MIN_SPEECH_MS,
+        max_speech_duration_s=max_ms / 1000,
+        min_silence_duration_ms=VAD_MIN_SILENCE_MS,
+        speech_pad_ms=VAD_SPEECH_PAD_MS,
+    )
+
+
+# ------------------------------------------------------------
+# SPEECH REGIONS
+# ------------------------------------------------------------
+def speech_regions(samples: np.ndarray, max_ms: int, block_sec: int = VAD_BLOCK_SEC):
+    """
+    [(start_sample, end_sample)] of speech in a 16 kHz mono float32 array.
+    """
+    from faster_whisper.vad import get_speech_timestamps
+
+    options = vad_options(max_ms)
+    block = block_sec * SAMPLE_RATE
+    pad = VAD_SPEECH_PAD_MS * SAMPLE_RATE // 1000
+    max_len = max_ms * SAMPLE_RATE // 1000
+
+    regions = []
+    for offset in range(0, len(samples), block):
+        chunk = np.ascontiguousarray(samples[offset:offset + block], dtype=np.float32)
+        for ts in get_speech_timestamps(chunk, options):
+            start, end = ts["start"] + offset, ts["end"] + offset
+
+            # speech running over a block edge → join the two halves
+            if (regions and offset and regions[-1][1] >= offset - pad
+                    and start <= offset + pad and end - regions[-1][0] <= max_len):
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+
+    return regions
+
+
+def sample_to_ms(sample: int) -> int:
+    return sample * 1000 // SAMPLE_RATE
+
+
+def plan_speech(input_path, array_path, max_ms: int):
+    """
+    Decode the input to a 16 kHz float32 array at `array_path` (reused as
+    the clip source in array mode), detect speech, and return
+    (bounds [(start_ms, end_ms)], samples decoded, segmentation report).
+    """
+    t0 = time.time()
+    with metrics.span("vad_decode"):
+        n_samples = decode_to_array(input_path, array_path)
+
+    t1 = time.time()
+    with metrics.span("vad"):
+        regions = speech_regions(open_array(array_path), max_ms)
+
+    bounds = [(sample_to_ms(s), sample_to_ms(e)) for s, e in regions]
+    audio_ms = sample_to_ms(n_samples)
+    speech_ms = sum(e - s for s, e in bounds)
+    skipped_ms = audio_ms - speech_ms
+
+    report = {
+        "mode": "vad",
+        "audio_ms": audio_ms,
+        "speech_ms": speech_ms,
+        "skipped_ms": skipped_ms,
+        "skipped_pct": round(100 * skipped_ms / max(audio_ms, 1), 2),
+        "regions": len(bounds),
+        "vad": {
+            "threshold": VAD_THRESHOLD,
+            "min_speech_ms": VAD_MIN_SPEECH_MS,
+            "min_silence_ms": VAD_MIN_SILENCE_MS,
+            "speech_pad_ms": VAD_SPEECH_PAD_MS,
+        },
+    }
+
+    metrics.gauge("speech_seconds", speech_ms / 1000)
+    metrics.gauge("skipped_seconds", skipped_ms / 1000)
+
+    logger.info(
+        f"🗣️ VAD: {len(bounds)} speech regions | speech {speech_ms/1000:.1f}s | "
+        f"skipped {skipped_ms/1000:.1f}s of {audio_ms/1000:.1f}s ({report['skipped_pct']}%) | "
+        f"decode {t1 - t0:.1f}s, VAD {time.time() - t1:.1f}s"
+    )
+    return bounds, n_samples, report
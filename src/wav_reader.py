@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped WAV reader
+
+Maps the PCM data chunk of a WAV file instead of loading it with
+AudioSegment.from_wav(). Slices are zero-copy views into the map, clips
+are written straight from the mapped buffer, and pages behind the
+segmentation cursor are released so peak RSS stays bounded by the
+window being processed, not by the input length.
+"""
+
+import mmap
+import struct
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from silence_engine import energy_envelope, ms_to_frame, pcm_frames
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class MappedWav:
+    """
+    Read-only PCM WAV opened through mmap.
+
+    Positions follow pydub conventions: milliseconds are converted to
+    frames with truncation, duration is round(1000 * frames / rate).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        offset, size = self._parse_header()
+        size = min(size, len(self._map) - offset)
+        size -= size % self.frame_width
+
+        self._data_offset = offset
+        self.frame_count = size // self.frame_width
+        self._frames = pcm_frames(
+            memoryview(self._map)[offset:offset + size],
+            self.sample_width,
+            self.channels
+        )
+
+    # --------------------------------------------------------
+    # HEADER
+    # --------------------------------------------------------
+    def _parse_header(self):
+        m = self._map
+        if m[0:4] != b"RIFF" or m[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {self.path}")
+
+        pos = 12
+        fmt_seen = False
+        while pos + 8 <= len(m):
+            chunk_id = m[pos:pos + 4]
+            chunk_size = struct.unpack("<I", m[pos + 4:pos + 8])[0]
+            body = pos + 8
+
+            if chunk_id == b"fmt ":
+                fmt_tag, channels, rate, _, _, bits = struct.unpack(
+                    "<HHIIHH", m[body:body + 16]
+                )
+                if fmt_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                    fmt_tag = struct.unpack("<H", m[body + 24:body + 26])[0]
+                if fmt_tag != WAVE_FORMAT_PCM:
+                    raise ValueError(f"Unsupported WAV format tag {fmt_tag}: {self.path}")
+
+                self.channels = channels
+                self.frame_rate = rate
+                self.sample_width = bits // 8
+                self.frame_width = channels * self.sample_width
+                fmt_seen = True
+
+            elif chunk_id == b"data":
+                if not fmt_seen:
+                    raise ValueError(f"data chunk before fmt chunk: {self.path}")
+                # 0 / 0xFFFFFFFF = size unknown (streamed writers)
+                if chunk_size in (0, 0xFFFFFFFF):
+                    chunk_size = len(m) - body
+                return body, chunk_size
+
+            pos = body + chunk_size + (chunk_size & 1)
+
+        raise ValueError(f"No data chunk found: {self.path}")
+
+    # --------------------------------------------------------
+    # ACCESS
+    # --------------------------------------------------------
+    def __len__(self):
+        return round(1000 * self.frame_count / self.frame_rate)
+
+    @property
+    def duration_ms(self) -> int:
+        return len(self)
+
+    def _frame_range(self, start_ms: int, end_ms: int):
+        f0, f1 = ms_to_frame([start_ms, end_ms], self.frame_rate)
+        return min(int(f0), self.frame_count), min(int(f1), self.frame_count)
+
+    def frames(self, start_ms: int, end_ms: int) -> np.ndarray:
+        """
+        Zero-copy (frames, channels) view of [start_ms, end_ms).
+        """
+        f0, f1 = self._frame_range(start_ms, end_ms)
+        return self._frames[f0:f1]
+
+    def clip_duration_ms(self, start_ms: int, end_ms: int) -> int:
+        f0, f1 = self._frame_range(start_ms, end_ms)
+        return round(1000 * (f1 - f0) / self.frame_rate)
+
+    def write_clip(self, path, start_ms: int, end_ms: int) -> int:
+        """
+        Write [start_ms, end_ms) as a PCM WAV straight from the map.
+        Returns the clip duration in ms.
+        """
+        f0, f1 = self._frame_range(start_ms, end_ms)
+        a = self._data_offset + f0 * self.frame_width
+        b = self._data_offset + f1 * self.frame_width
+
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(self.channels)
+            w.setsampwidth(self.sample_width)
+            w.setframerate(self.frame_rate)
+            w.writeframes(self._map[a:b])
+
+        return round(1000 * (f1 - f0) / self.frame_rate)
+
+    def release(self, before_ms: int):
+        """
+        Drop resident pages before `before_ms` (they are re-read from
+        disk if touched again).
+        """
+        f0, _ = self._frame_range(before_ms, before_ms)
+        end = (self._data_offset + f0 * self.frame_width) // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > 0 and hasattr(self._map, "madvise"):
+            self._map.madvise(mmap.MADV_DONTNEED, 0, end)
+
+    def close(self):
+        self._frames = None
+        try:
+            self._map.close()
+        except BufferError:
+            # a caller still holds a view; the map is freed with it
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StreamingEnvelope:
+    """
+    Energy envelope computed lazily from a MappedWav.
+
+    Only the bins between the segmentation cursor and the furthest window
+    requested so far are kept; every ms is computed once.
+    """
+
+    def __init__(self, wav: MappedWav, block_ms: int = 60_000):
+        self.wav = wav
+        self.block_ms = block_ms
+        self._start = 0
+        self._energy = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+
+    def _extend(self, end_ms: int):
+        have = self._start + len(self._energy)
+        if end_ms <= have:
+            return
+        end_ms = max(end_ms, have + self.block_ms)
+        f0, f1 = self.wav._frame_range(have, end_ms)
+
+        energy, counts = energy_envelope(
+            self.wav._frames[f0:f1], self.wav.frame_rate, have, end_ms, frame_offset=f0
+        )
+        self._energy = np.concatenate((self._energy, energy))
+        self._counts = np.concatenate((self._counts, counts))
+
+    def window(self, start_ms: int, end_ms: int):
+        if start_ms > self._start:
+            drop = start_ms - self._start
+            self._energy = self._energy[drop:]
+            self._counts = self._counts[drop:]
+            self._start = start_ms
+
+        self._extend(end_ms)
+        a, b = start_ms - self._start, end_ms - self._start
+        return self._energy[a:b], self._counts[a:b]
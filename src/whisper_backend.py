@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+faster-whisper backend shared by the transcription entry points
+
+Model, device and compute type come from the environment so the same
+code runs large-v3 on the pod GPU and `tiny` on a laptop CPU:
+
+    WHISPER_MODEL=tiny WHISPER_DEVICE=cpu WHISPER_COMPUTE_TYPE=int8 \\
+        python src/02_transcribe_clips.py
+
+Settings not in the environment are read from config/backend.env
+(KEY=VALUE lines, written by `python src/calibrate_backend.py`), so a host
+is switched to its measured best device / compute type / replica count
+(SHARDS) without editing the source.
+
+A model in the local store (models/, see model_store.py) is loaded from
+there, checksum-verified and without network access.
+"""
+
+import os
+import math
+import time
+import logging
+import dataclasses
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+
+import metrics
+import model_store
+from audio_store import SAMPLE_RATE
+from clip_packer import remap
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BACKEND_CONFIG = Path(os.environ.get("BACKEND_CONFIG", str(PROJECT_ROOT / "config" / "backend.env")))
+
+
+def read_env_file(path: Path) -> dict:
+    if not path.is_file():
+        return {}
+    values = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+_CONFIG = read_env_file(BACKEND_CONFIG)
+
+
+def setting(key: str, default: str) -> str:
+    """
+    Environment first, then config/backend.env, then the default.
+    """
+    return os.environ.get(key, _CONFIG.get(key, default))
+
+
+MODEL_NAME = setting("WHISPER_MODEL", "large-v3")
+DEVICE = setting("WHISPER_DEVICE", "cuda")
+COMPUTE_TYPE = setting("WHISPER_COMPUTE_TYPE", "float16")
+
+# CPU: threads per model replica (0 = all cores split over the replicas)
+# and concurrent transcribe() calls per model
+CPU_THREADS = int(setting("WHISPER_CPU_THREADS", "0"))
+NUM_WORKERS = int(setting("WHISPER_NUM_WORKERS", "1"))
+
+LANGUAGE = "hi"
+BEAM_SIZE = 5
+
+
+# ------------------------------------------------------------
+# MODEL
+# ------------------------------------------------------------
+def replica_threads(replicas: int, device=DEVICE) -> int:
+    """
+    cpu_threads for each of `replicas` models on this host (0 on GPU:
+    CTranslate2 default).
+    """
+    if device != "cpu":
+        return 0
+    return CPU_THREADS or max(1, (os.cpu_count() or 1) // max(replicas, 1))
+
+
+def load_model(model_name=MODEL_NAME, device=DEVICE, compute_type=COMPUTE_TYPE,
+               device_index: int = 0, cpu_threads: int = None,
+               num_workers: int = NUM_WORKERS):
+    """
+    Load from the local model store (model_store.py) when the model is
+    there; load time is split into download / disk read / device init.
+    """
+    from faster_whisper import WhisperModel
+
+    if cpu_threads is None:
+        cpu_threads = replica_threads(1, device)
+
+    logger.info(
+        f"🧠 Loading faster-whisper {model_name} ({device}:{device_index}, {compute_type}"
+        + (f", {cpu_threads} threads" if cpu_threads else "") + ")"
+    )
+    t0 = time.time()
+
+    with metrics.span("model_load", model=model_name, device=device):
+        path = model_store.resolve(model_name)
+
+        t1 = time.time()
+        with metrics.span("model_device_init", model=model_name, device=device):
+            model = WhisperModel(
+                path,
+                device=device,
+                device_index=device_index,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+                local_files_only=True
+            )
+
+    logger.info(
+        f"🧠 Model loaded in {time.time() - t0:.1f}s "
+        f"(resolve {t1 - t0:.1f}s, device init {time.time() - t1:.1f}s)"
+    )
+    return model
+
+
+def batched_pipeline(model):
+    from faster_whisper import BatchedInferencePipeline
+
+    return BatchedInferencePipeline(model=model)
+
+
+# ------------------------------------------------------------
+# TRANSCRIPTION
+# ------------------------------------------------------------
+def decode_params(batched: bool) -> dict:
+    """
+    Everything besides the audio that changes the result (cache key).
+    """
+    return {
+        "model": MODEL_NAME,
+        "compute_type": COMPUTE_TYPE,
+        "language": LANGUAGE,
+        "beam_size": BEAM_SIZE,
+        "batched": batched,
+    }
+
+
+def transcribe_clip(model, audio, beam_size: int = BEAM_SIZE):
+    """
+    One clip (path or 16 kHz float32 array) → (segments list, info).
+    """
+    segments, info = model.transcribe(
+        audio,
+        language=LANGUAGE,
+        beam_size=beam_size
+    )
+    return list(segments), info
+
+
+def transcribe_batch(pipeline, audios, batch_size: int):
+    """
+    Several clips in one batched forward pass.
+
+    Clips are laid end to end in one buffer and passed as clip_timestamps,
+    so each clip is exactly one batch item. Returns one segment list per
+    clip with clip-relative timestamps (same as transcribe_clip).
+    """
+    offsets = [0]
+    for a in audios:
+        offsets.append(offsets[-1] + len(a))
+    buffer = np.concatenate(audios).astype(np.float32, copy=False)
+    starts = [o / SAMPLE_RATE for o in offsets[:-1]]
+
+    segments, info = pipeline.transcribe(
+        buffer,
+        language=LANGUAGE,
+        beam_size=BEAM_SIZE,
+        batch_size=batch_size,
+        vad_filter=False,
+        without_timestamps=False,
+        clip_timestamps=[
+            {"start": offsets[i] / SAMPLE_RATE, "end": offsets[i + 1] / SAMPLE_RATE}
+            for i in range(len(audios))
+        ]
+    )
+
+    per_clip = [[] for _ in audios]
+    for seg in segments:
+        # segment times are rounded to ms; tolerate that at clip edges
+        i = max(bisect_right(starts, seg.start + 1e-3) - 1, 0)
+        per_clip[i].append(dataclasses.replace(
+            seg,
+            start=round(max(seg.start - starts[i], 0.0), 3),
+            end=round(max(seg.end - starts[i], 0.0), 3)
+        ))
+
+    return per_clip, info
+
+
+# ------------------------------------------------------------
+# RESULTS
+# ------------------------------------------------------------
+def compute_confidence(avg_logprob, no_speech_prob):
+    """
+    Deterministic confidence score ∈ [0,1]
+    """
+    try:
+        return max(
+            0.0,
+            min(1.0, math.exp(avg_logprob) * (1.0 - no_speech_prob))
+        )
+    except Exception:
+        return 0.0
+
+
+def segment_record(seg, start_offset: float) -> dict:
+    """
+    raw_transcript.jsonl record for a clip-relative segment.
+    """
+    conf = compute_confidence(
+        seg.avg_logprob,
+        seg.no_speech_prob
+    )
+
+    return {
+        "start": round(seg.start + start_offset, 3),
+        "end": round(seg.end + start_offset, 3),
+        "text": seg.text.strip(),
+        "confidence": round(conf, 4)
+    }
+
+
+def clip_records(segments, clip: dict) -> list:
+    """
+    Records on the original timeline for one clip's segments; a packed
+    window (clip_packer.py) is remapped through its pieces.
+    """
+    pieces = clip.get("pieces")
+    if not pieces:
+        start_offset = clip["start_ms"] / 1000
+        return [segment_record(seg, start_offset) for seg in segments]
+
+    records = []
+    for seg in segments:
+        record = segment_record(seg, 0.0)
+        record["start"] = remap(seg.start, pieces)
+        record["end"] = max(remap(seg.end, pieces), record["start"])
+        records.append(record)
+    return records
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Warm transcription worker — one model load, many jobs
+
+Loads the model once and pulls jobs from a local SQLite queue
+(jobs/queue.db). Each job runs segmentation → transcription →
+post-processing → search indexing into its own directory:
+
+    jobs/<id>_<name>/clips/
+    jobs/<id>_<name>/pipeline_state.json
+    jobs/<id>_<name>/outputs/raw_transcript.jsonl
+    jobs/<id>_<name>/outputs/refined_transcript.jsonl
+    jobs/<id>_<name>/outputs/refined_changes.jsonl
+    jobs/<id>_<name>/job.json             (stage timings + summary)
+
+Usage:
+    python src/worker.py submit audio/215.wav [lecture.mp3 talk.mp4 ...]
+    python src/worker.py run [--exit-when-empty]
+    python src/worker.py status
+
+SIGTERM / Ctrl-C drains: the current job finishes, then the worker exits
+(a second signal aborts). A job left 'running' by a killed worker is
+re-queued on the next start and resumes from its pipeline_state.json.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import sqlite3
+import argparse
+import logging
+from pathlib import Path
+
+import checkpoint
+import metrics
+from clip_packer import PACK_CLIPS, pack_state
+import whisper_backend
+from cascade import CASCADE, Cascade
+from ingest import INGEST, INGEST_NAME, ingest, state_entry
+from postprocess import postprocess
+from segmenter import MAX_MS, SEGMENTER, iter_clips, write_audio_array
+from vad_segmenter import plan_speech
+from transcriber import TranscriptionJob
+from transcript_index import TranscriptIndex
+from wav_reader import MappedWav
+
+# ------------------------------------------------------------
+# PATH RESOLUTION (ROBUST)
+# src/worker.py → project root
+# ------------------------------------------------------------
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+JOBS_DIR = PROJECT_ROOT / "jobs"
+QUEUE_DB = JOBS_DIR / "queue.db"
+
+# ------------------------------------------------------------
+# CONFIG
+# ------------------------------------------------------------
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", "0"))
+CLIP_MODE = os.environ.get("CLIP_MODE", "wav")
+# add each finished job to cache/transcript_index.db (transcript_index.py)
+INDEX_TRANSCRIPTS = os.environ.get("INDEX_TRANSCRIPTS", "1") == "1"
+POLL_SEC = 2.0
+
+# ------------------------------------------------------------
+# LOGGING
+# ------------------------------------------------------------
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------
+# JOB QUEUE (SQLite)
+# ------------------------------------------------------------
+class JobQueue:
+    """
+    queued → running → done | failed
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                input       TEXT NOT NULL,
+                status      TEXT NOT NULL DEFAULT 'queued',
+                job_dir     TEXT,
+                submitted   REAL NOT NULL,
+                started     REAL,
+                finished    REAL,
+                timings     TEXT,
+                error       TEXT
+            )
+        """)
+
+    def submit(self, input_path: Path) -> int:
+        cur = self.db.execute(
+            "INSERT INTO jobs (input, submitted) VALUES (?, ?)",
+            (str(input_path.resolve()), time.time())
+        )
+        return cur.lastrowid
+
+    def claim(self):
+        """
+        Atomically move the oldest queued job to 'running'.
+        """
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                self.db.execute(
+                    "UPDATE jobs SET status = 'running', started = ? WHERE id = ?",
+                    (time.time(), row["id"])
+                )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return row
+
+    def set_job_dir(self, job_id: int, job_dir: Path):
+        self.db.execute("UPDATE jobs SET job_dir = ? WHERE id = ?", (str(job_dir), job_id))
+
+    def finish(self, job_id: int, status: str, timings: dict, error: str = None):
+        self.db.execute(
+            "UPDATE jobs SET status = ?, finished = ?, timings = ?, error = ? WHERE id = ?",
+            (status, time.time(), json.dumps(timings), error, job_id)
+        )
+
+    def requeue_running(self) -> int:
+        return self.db.execute(
+            "UPDATE jobs SET status = 'queued', started = NULL WHERE status = 'running'"
+        ).rowcount
+
+    def all(self):
+        return self.db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+
+
+# ------------------------------------------------------------
+# JOB EXECUTION
+# ------------------------------------------------------------
+def segment_job(input_path: Path, job_dir: Path, state_file: Path):
+    clips_dir = job_dir / "clips"
+    clips_dir.mkdir(parents=True, exist_ok=True)
+
+    # any input format → one 16 kHz mono decode that everything below reads
+    source = input_path
+    ingested = None
+    if INGEST:
+        ingested = ingest(input_path, clips_dir / INGEST_NAME)
+        source = ingested["path"]
+
+    array_path = clips_dir / "audio_16k.f32"
+    bounds = n_samples = None
+    segmentation = {"mode": "energy"}
+    if SEGMENTER == "vad":
+        bounds, n_samples, segmentation = plan_speech(source, array_path, MAX_MS)
+
+    audio = MappedWav(source)
+    total_ms = len(audio)
+    clips = list(iter_clips(audio, clips_dir, job_dir, CLIP_MODE, bounds=bounds))
+    audio.close()
+
+    state = {
+        "input_audio": str(input_path),
+        "total_duration_ms": total_ms,
+        "total_clips": len(clips),
+        "clips": clips,
+        "clips_processed": [],
+        "segmentation": segmentation
+    }
+    if CLIP_MODE == "array":
+        state["audio_array"] = write_audio_array(
+            source, array_path, job_dir, clips, n_samples=n_samples
+        )
+    elif n_samples is not None:
+        array_path.unlink()
+    if ingested:
+        state["ingest"] = state_entry(ingested, job_dir)
+    if PACK_CLIPS:
+        pack_state(state)
+
+    checkpoint.reset(state_file, state)
+    logger.info(f"✂️ Segmented → {len(clips)} clips ({total_ms/1000:.1f}s audio)")
+
+
+def job_dir_for(job) -> Path:
+    return JOBS_DIR / f"{job['id']:05d}_{Path(job['input']).stem}"
+
+
+def run_job(model, job, cascade: Cascade = None) -> dict:
+    """
+    Segmentation → transcription → post-processing → indexing; returns stage timings.
+    """
+    input_path = Path(job["input"])
+    job_dir = job_dir_for(job)
+    state_file = job_dir / "pipeline_state.json"
+    outputs = job_dir / "outputs"
+    job_dir.mkdir(parents=True, exist_ok=True)
+
+    timings = {}
+    t_job = time.time()
+    # per-job metrics: outputs/metrics/job.json|.prom of the job dir
+    metrics.reset()
+
+    # Segmentation (skipped when resuming a job with a state file)
+    t0 = time.time()
+    if not state_file.exists():
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input audio not found: {input_path}")
+        with metrics.span("segmentation"):
+            segment_job(input_path, job_dir, state_file)
+    timings["segment_sec"] = round(time.time() - t0, 3)
+
+    # Transcription (warm model)
+    t0 = time.time()
+    summary = TranscriptionJob(
+        model,
+        root=job_dir,
+        state_file=state_file,
+        output_dir=outputs,
+        batch_size=BATCH_SIZE,
+        # fresh stats per job, same warm models
+        cascade=Cascade(cascade.draft, cascade.large) if cascade else None
+    ).run()
+    timings["transcribe_sec"] = round(time.time() - t0, 3)
+
+    # Post-processing
+    t0 = time.time()
+    postprocess(
+        outputs / "raw_transcript.jsonl",
+        outputs / "refined_transcript.jsonl",
+        outputs / "refined_changes.jsonl"
+    )
+    timings["postprocess_sec"] = round(time.time() - t0, 3)
+
+    # Search index (only this job's transcript is read)
+    if INDEX_TRANSCRIPTS:
+        t0 = time.time()
+        index = TranscriptIndex()
+        try:
+            with metrics.span("index_update"):
+                index.update([outputs / "refined_transcript.jsonl"])
+        finally:
+            index.close()
+        timings["index_sec"] = round(time.time() - t0, 3)
+
+    timings["total_sec"] = round(time.time() - t_job, 3)
+    timings["audio_sec"] = summary["audio_sec"]
+    timings["rtf"] = round(timings["transcribe_sec"] / max(summary["audio_sec"], 1e-9), 4)
+    metrics.export("job", outputs / "metrics")
+
+    (job_dir / "job.json").write_text(json.dumps({
+        "id": job["id"],
+        "input": str(input_path),
+        "timings": timings,
+        "transcription": summary,
+    }, indent=2), encoding="utf-8")
+
+    return timings
+
+
+# ------------------------------------------------------------
+# WORKER LOOP
+# ------------------------------------------------------------
+class Drain:
+    """
+    First SIGINT/SIGTERM → finish the current job and exit.
+    Second signal → abort immediately.
+    """
+
+    def __init__(self):
+        self.requested = False
+        signal.signal(signal.SIGINT, self._handle)
+        signal.signal(signal.SIGTERM, self._handle)
+
+    def _handle(self, signum, frame):
+        if self.requested:
+            raise KeyboardInterrupt
+        self.requested = True
+        logger.warning("🛑 Drain requested — finishing current job, then exiting")
+
+
+def cmd_run(args):
+    jobs = JobQueue(QUEUE_DB)
+    requeued = jobs.requeue_running()
+    if requeued:
+        logger.warning(f"♻️ Re-queued {requeued} interrupted job(s)")
+
+    drain = Drain()
+
+    logger.info("=" * 80)
+    logger.info("🔥 WARM WORKER STARTED")
+    cascade = None
+    if CASCADE:
+        cascade = Cascade.load()
+        model = cascade.large
+    else:
+        model = whisper_backend.load_model()
+    logger.info("=" * 80)
+
+    done = 0
+    while not drain.requested:
+        job = jobs.claim()
+        if job is None:
+            if args.exit_when_empty:
+                break
+            time.sleep(POLL_SEC)
+            continue
+
+        logger.info("=" * 80)
+        logger.info(f"📥 Job {job['id']} → {job['input']}")
+
+        job_dir = job_dir_for(job)
+        jobs.set_job_dir(job["id"], job_dir)
+
+        try:
+            timings = run_job(model, job, cascade)
+        except Exception as e:
+            logger.error(f"❌ Job {job['id']} failed: {e}")
+            jobs.finish(job["id"], "failed", {}, error=str(e))
+            continue
+
+        jobs.finish(job["id"], "done", timings)
+        done += 1
+
+        logger.info(
+            f"✅ Job {job['id']} done | total={timings['total_sec']:.1f}s | "
+            f"segment={timings['segment_sec']:.1f}s | "
+            f"transcribe={timings['transcribe_sec']:.1f}s | "
+            f"post={timings['postprocess_sec']:.1f}s | "
+            f"RTF={timings['rtf']:.3f}"
+        )
+        logger.info(f"📁 Outputs → {job_dir / 'outputs'}")
+
+    logger.info("=" * 80)
+    logger.info(f"👋 Worker exiting — {done} job(s) completed this session")
+    logger.info("=" * 80)
+
+
+def cmd_submit(args):
+    jobs = JobQueue(QUEUE_DB)
+    for path in args.inputs:
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Input audio not found: {path}")
+        logger.info(f"📥 Queued job {jobs.submit(path)} → {path}")
+
+
+def cmd_status(args):
+    jobs = JobQueue(QUEUE_DB)
+    rows = jobs.all()
+    if not rows:
+        print("No jobs")
+        return
+
+    print(f"{'ID':>5}  {'STATUS':<8}  {'AUDIO':>8}  {'TOTAL':>8}  {'RTF':>6}  INPUT")
+    for r in rows:
+        t = json.loads(r["timings"]) if r["timings"] else {}
+        print(
+            f"{r['id']:>5}  {r['status']:<8}  "
+            f"{t.get('audio_sec', 0):>7.0f}s  {t.get('total_sec', 0):>7.1f}s  "
+            f"{t.get('rtf', 0):>6.3f}  {r['input']}"
+            + (f"  ({r['error']})" if r["error"] else "")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm transcription worker")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("submit", help="queue audio files")
+    p.add_argument("inputs", nargs="+")
+    p.set_defaults(func=cmd_submit)
+
+    p = sub.add_parser("run", help="load the model once and process jobs")
+    p.add_argument("--exit-when-empty", action="store_true",
+                   help="exit instead of polling when the queue is empty")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("status", help="list jobs with timings")
+    p.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# src/ modules import each other by bare name (python src/<script>.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,86 @@
+import sys
+import types
+
+import pytest
+
+import model_store
+import whisper_backend
+
+
+@pytest.fixture
+def model_src(tmp_path):
+    """
+    A dummy CTranslate2 model directory.
+    """
+    src = tmp_path / "src" / "dummy-model"
+    src.mkdir(parents=True)
+    (src / "model.bin").write_bytes(b"\x01" * 4096)
+    (src / "config.json").write_text('{"dummy": true}', encoding="utf-8")
+    (src / "vocabulary.txt").write_text("a\nb\n", encoding="utf-8")
+    return src
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_store, "MODEL_VERIFY", True)
+    monkeypatch.setattr(model_store, "MODEL_OFFLINE", True)
+    return tmp_path / "models"
+
+
+@pytest.fixture
+def whisper_model(monkeypatch):
+    """
+    faster_whisper.WhisperModel replaced by a recorder.
+    """
+    calls = []
+    module = types.ModuleType("faster_whisper")
+    module.WhisperModel = lambda path, **kwargs: calls.append(path) or object()
+    monkeypatch.setitem(sys.modules, "faster_whisper", module)
+    return calls
+
+
+def test_add_verify_resolve(model_src, store):
+    dest = model_store.add(model_src, models_dir=store)
+
+    manifest = model_store.read_manifest(dest)
+    assert manifest["name"] == "dummy-model"
+    assert sorted(manifest["files"]) == ["config.json", "model.bin", "vocabulary.txt"]
+    assert model_store.verify(dest) == sum(f["size"] for f in manifest["files"].values())
+    assert model_store.resolve("dummy-model", models_dir=store) == str(dest)
+
+
+def test_load_model_from_store(model_src, store, monkeypatch, whisper_model):
+    dest = model_store.add(model_src, models_dir=store)
+    monkeypatch.setattr(model_store, "MODELS_DIR", store)
+
+    whisper_backend.load_model("dummy-model", device="cpu", compute_type="int8")
+
+    assert whisper_model == [str(dest)]
+
+
+@pytest.mark.parametrize("corrupt, error", [
+    (lambda p: p.write_bytes(b"\x02" * 4096), "checksum mismatch"),
+    (lambda p: p.write_bytes(b"\x01" * 100), "size mismatch"),
+    (lambda p: p.unlink(), "missing"),
+])
+def test_corrupt_model_rejected(model_src, store, monkeypatch, whisper_model, corrupt, error):
+    dest = model_store.add(model_src, models_dir=store)
+    corrupt(dest / "model.bin")
+    monkeypatch.setattr(model_store, "MODELS_DIR", store)
+
+    with pytest.raises(ValueError, match=error):
+        model_store.verify(dest)
+    with pytest.raises(ValueError, match=error):
+        model_store.resolve("dummy-model", models_dir=store)
+    with pytest.raises(ValueError, match=error):
+        whisper_backend.load_model("dummy-model", device="cpu", compute_type="int8")
+
+    assert whisper_model == []
+
+
+def test_add_rejects_non_model_dir(tmp_path, store):
+    (tmp_path / "empty").mkdir()
+
+    with pytest.raises(ValueError, match="missing model.bin"):
+        model_store.add(tmp_path / "empty", models_dir=store)
+    assert model_store.stored(store) == []
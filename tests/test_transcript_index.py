@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from rule_engine import RuleEngine
+from transcript_index import Normalizer, TranscriptIndex
+from transcript_io import TranscriptWriter
+
+# chained: a text refined once must not be refined again
+RULES = {"क": "ख", "ख": "ग"}
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    # no automaton cache files under the project's cache/
+    monkeypatch.setattr(RuleEngine, "compile", classmethod(lambda cls, rules, cache_dir=None: cls(rules)))
+    index = TranscriptIndex(tmp_path / "index.db", normalizer=Normalizer(RULES))
+    yield index
+    index.close()
+
+
+def stored_texts(index) -> list:
+    return [text for (text,) in index.db.execute("SELECT text FROM segments ORDER BY doc, seq")]
+
+
+def test_refined_jsonl_indexed_as_on_disk(tmp_path, index):
+    records = [
+        {"start": 0.0, "end": 1.5, "text": "नमस्ते ख"},
+        {"start": 1.5, "end": 3.0, "text": "ख दुनिया"},
+    ]
+    writer = TranscriptWriter(tmp_path / "job" / "refined_transcript.jsonl")
+    writer.write(records)
+    writer.close()
+
+    index.update([tmp_path / "job"])
+
+    assert stored_texts(index) == [r["text"] for r in records]
+    # the query is refined like stage 3 input: raw "क" → "ख"
+    hits = index.search("क")
+    assert [(h["start"], h["text"]) for h in hits] == [(0.0, "नमस्ते ख"), (1.5, "ख दुनिया")]
+
+
+def test_legacy_json_refined_once(tmp_path, index):
+    job = tmp_path / "job"
+    job.mkdir()
+    (job / "refined_transcript.json").write_text(json.dumps({
+        "segments": [{"start": 0.0, "end": 2.0, "text": "नमस्ते क"}],
+    }, ensure_ascii=False), encoding="utf-8")
+
+    index.update([job])
+
+    assert stored_texts(index) == ["नमस्ते ख"]
@@ -0,0 +1,117 @@
+import os
+import dataclasses
+
+import numpy as np
+import pytest
+
+import model_store
+import whisper_backend
+from audio_store import SAMPLE_RATE
+
+
+# ------------------------------------------------------------
+# transcribe_batch: segments back to their clips (stubbed pipeline)
+# ------------------------------------------------------------
+@dataclasses.dataclass
+class Seg:
+    start: float
+    end: float
+    text: str = ""
+
+
+class StubPipeline:
+    """
+    Returns the given clip-relative segments on the buffer timeline,
+    rounded to ms like faster-whisper, one clip_timestamps window each.
+    """
+
+    def __init__(self, per_clip):
+        self.per_clip = per_clip
+
+    def transcribe(self, audio, clip_timestamps, **kwargs):
+        assert len(clip_timestamps) == len(self.per_clip)
+        assert clip_timestamps[-1]["end"] == pytest.approx(len(audio) / SAMPLE_RATE)
+        segments = [
+            Seg(round(window["start"] + s.start, 3), round(window["start"] + s.end, 3), s.text)
+            for window, segs in zip(clip_timestamps, self.per_clip)
+            for s in segs
+        ]
+        return iter(segments), None
+
+
+def test_batch_maps_segments_to_clips():
+    # odd sample counts: clip starts fall between ms, so rounded segment
+    # starts can land just before their clip
+    lengths = [51_201, 80_007, 27_203]
+    audios = [np.zeros(n, dtype=np.float32) for n in lengths]
+    expected = [
+        [Seg(0.0, 1.5, "a"), Seg(1.5, 3.2, "b")],
+        [Seg(0.0, 5.0, "c")],
+        [Seg(0.2, 1.0, "d"), Seg(1.0, 1.7, "e")],
+    ]
+
+    per_clip, _ = whisper_backend.transcribe_batch(StubPipeline(expected), audios, batch_size=4)
+
+    assert [[s.text for s in segs] for segs in per_clip] == [[s.text for s in segs] for segs in expected]
+    # rounded twice to ms: by the pipeline and back on the clip timeline
+    for got, want in zip(per_clip, expected):
+        for g, w in zip(got, want):
+            assert g.start == pytest.approx(w.start, abs=2e-3)
+            assert g.end == pytest.approx(w.end, abs=2e-3)
+            assert g.start >= 0.0
+
+
+def test_batch_keeps_empty_clips():
+    audios = [np.zeros(SAMPLE_RATE, dtype=np.float32) for _ in range(3)]
+    expected = [[], [Seg(0.1, 0.9, "x")], []]
+
+    per_clip, _ = whisper_backend.transcribe_batch(StubPipeline(expected), audios, batch_size=2)
+
+    assert [len(segs) for segs in per_clip] == [0, 1, 0]
+
+
+# ------------------------------------------------------------
+# batched vs sequential on a CPU tiny model
+# ------------------------------------------------------------
+def tiny_model():
+    pytest.importorskip("faster_whisper")
+    from faster_whisper.utils import download_model
+
+    path = model_store.model_dir("tiny")
+    if not (path / model_store.MANIFEST).is_file():
+        try:
+            path = download_model("tiny", local_files_only=True)
+        except Exception:
+            pytest.skip("tiny model not in models/ or the Hugging Face cache")
+    return whisper_backend.load_model(str(path), device="cpu", compute_type="int8", cpu_threads=2)
+
+
+def sample_clips() -> list:
+    """
+    A few clips of TEST_AUDIO (any file faster-whisper decodes), else
+    synthetic tones.
+    """
+    path = os.environ.get("TEST_AUDIO")
+    if path:
+        from faster_whisper import decode_audio
+
+        audio = decode_audio(path, sampling_rate=SAMPLE_RATE)
+        return [audio[i * 8 * SAMPLE_RATE:(i + 1) * 8 * SAMPLE_RATE] for i in range(3)]
+
+    t = np.arange(6 * SAMPLE_RATE) / SAMPLE_RATE
+    return [(0.2 * np.sin(2 * np.pi * f * t)).astype(np.float32) for f in (220, 330, 440)]
+
+
+def test_batch_matches_sequential_tiny_cpu():
+    model = tiny_model()
+    audios = sample_clips()
+
+    sequential = [whisper_backend.transcribe_clip(model, a)[0] for a in audios]
+    batched, _ = whisper_backend.transcribe_batch(whisper_backend.batched_pipeline(model), audios, batch_size=4)
+
+    assert [len(segs) for segs in batched] == [len(segs) for segs in sequential]
+    for clip_sec, b_segs, s_segs in zip((len(a) / SAMPLE_RATE for a in audios), batched, sequential):
+        for b, s in zip(b_segs, s_segs):
+            assert 0.0 <= b.start <= b.end <= clip_sec + 1e-3
+            assert b.start == pytest.approx(s.start, abs=1.0)
+            assert b.end == pytest.approx(s.end, abs=1.0)